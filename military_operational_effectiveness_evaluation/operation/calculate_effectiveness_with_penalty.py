@@ -17,47 +17,105 @@
 - 综合惩罚因子 P = min(F_i)（取所有指标中最小的惩罚因子）
 - 最终效能得分 Sfinal = Sstage × P
 
+惩罚/激励规则表（penalty_config）：
+- 每个指标一条规则：阈值 s、系数 m、方向 reverse、下限 floor，可设 kind='incentive' 作为激励规则
+- 全部实验 × 全部规则指标按一次数组运算求出各指标因子矩阵（见 evaluate_penalty_rules）
+- 组合方式 penalty_combination: 'min'（惩罚取最小、激励取最大）或 'product'（全部相乘）
+
 文献来源：王思远, 张目. 基于惩罚与激励的TOPSIS多属性决策方法[J]. 统计与决策, 2018, 34(10): 82-84.
 
 批次: AHP-2026-001
 """
 
+import argparse
 import mysql.connector
 from mysql.connector import Error
-import matplotlib.pyplot as plt
 import numpy as np
 import os
 
-# 设置中文字体
-plt.rcParams['font.sans-serif'] = ['SimHei', 'Microsoft YaHei', 'Arial Unicode MS']
-plt.rcParams['axes.unicode_minus'] = False
+from lazy_pyplot import LazyPyplot
+from pareto_analysis import analyze_tradeoffs
+
+# matplotlib 仅在生成图表时导入，并设置中文字体
+plt = LazyPyplot(['SimHei', 'Microsoft YaHei', 'Arial Unicode MS'])
+
+# 成本分类（cost_<分类>_ 前缀），用于多目标 Pareto 分析
+COST_CATEGORY_NAMES = {
+    'personnel': '人员成本',
+    'equipment': '装备成本',
+    'energy': '能源成本',
+    'logistics': '后勤成本',
+    'training': '训练成本',
+    'infrastructure': '基础设施成本',
+}
+
+# 参数扫描时单次广播的最大元素数（网格点 × 实验数 × 规则指标数），超过时按阈值分块计算
+SWEEP_CHUNK_CELLS = 2_000_000
 
 
 class EffectivenessEvaluationWithPenalty:
     """带惩罚模型的效能评估计算器"""
 
-    def __init__(self):
-        self.connection = mysql.connector.connect(
-            host='localhost',
-            database='military_operational_effectiveness_evaluation',
-            user='root',
-            password='root'
-        )
+    def __init__(self, connect=True):
+        """
+        参数:
+            connect: 是否连接数据库；直接传入得分矩阵做计算时可不连接
+        """
+        self.connection = None
+        if connect:
+            self.connection = mysql.connector.connect(
+                host='localhost',
+                database='military_operational_effectiveness_evaluation',
+                user='root',
+                password='root'
+            )
 
-        # 核心惩罚指标配置（基于文献公式）
-        # 崩溃比例得分：得分越高=崩溃率越低=越好，低于阈值开始惩罚
+        # 惩罚/激励规则表（基于文献公式），每个指标一条规则
         # 文献: 王思远, 张目. 基于惩罚与激励的TOPSIS多属性决策方法
-        # 公式: F_i = 1, x ≥ s; F_i = (x/s) × m, x < s
+        # 惩罚 (kind='penalty'):
+        #   reverse=False 得分越高越好: F_i = 1, x ≥ s; F_i = max((x/s) × m, floor), x < s
+        #   reverse=True  得分越低越好: F_i = 1, x ≤ s; F_i = max((s/x) × m, floor), x > s
+        # 激励 (kind='incentive', m ≥ 1): 方向相反，超过阈值时 F_i = min((x/s) × m, cap)（reverse 同理）
+        # enabled=False 的规则保留在表中但不参与计算
         self.penalty_config = {
+            # 崩溃比例得分：得分越高=崩溃率越低=越好，低于阈值开始惩罚
             'reliability_crash_rate_qt': {
                 'name': '崩溃比例得分',
                 'threshold': 70,       # 惩罚阈值 s (崩溃比例得分低于70分开始惩罚)
                 'm': 0.8,              # 惩罚系数 m (0<m≤1, 越小惩罚越重)
                 'category': 'reliability',
-                'reverse': False       # 标记：得分越高越好，低于阈值惩罚
+                'reverse': False,      # 标记：得分越高越好，低于阈值惩罚
+                'floor': 0.1,          # 最小惩罚因子
+                'kind': 'penalty',
+                'enabled': True
+            },
+            # 密钥泄露率得分：得分越高=泄露率越低=越好
+            'security_key_leakage_qt': {
+                'name': '密钥泄露率得分',
+                'threshold': 60,
+                'm': 0.8,
+                'category': 'security',
+                'reverse': False,
+                'floor': 0.1,
+                'kind': 'penalty',
+                'enabled': False       # 待条令确定阈值后启用
+            },
+            # 通信可用性得分：得分越高越好
+            'reliability_communication_availability_qt': {
+                'name': '通信可用性得分',
+                'threshold': 60,
+                'm': 0.8,
+                'category': 'reliability',
+                'reverse': False,
+                'floor': 0.1,
+                'kind': 'penalty',
+                'enabled': False       # 待条令确定阈值后启用
             }
         }
 
+        # 多指标因子的组合方式: 'min' 或 'product'
+        self.penalty_combination = 'min'
+
         # military_operation_effect_score 表的字段列表（17个指标）
         self.score_fields = [
             # 安全指标 (3个)
@@ -84,6 +142,37 @@ class EffectivenessEvaluationWithPenalty:
             'effect_mission_completion_rate_qt',
         ]
 
+        # cost_evaluation 表的成本字段列表（21个指标，均为正向：费用越高，归一化值越高）
+        self.cost_fields = [
+            # 人员成本 (7个)
+            'cost_personnel_strategic_command_staff_qt',
+            'cost_personnel_campaign_command_staff_qt',
+            'cost_personnel_tactical_staff_qt',
+            'cost_personnel_equipment_operators_qt',
+            'cost_personnel_campaign_maintenance_hours_qt',
+            'cost_personnel_tactical_maintenance_hours_qt',
+            'cost_personnel_unit_maintenance_hours_qt',
+            # 装备成本 (3个)
+            'cost_equipment_procurement_total_qt',
+            'cost_equipment_depreciation_qt',
+            'cost_equipment_campaign_support_maintenance_qt',
+            # 能源成本 (3个)
+            'cost_energy_campaign_fuel_electricity_qt',
+            'cost_energy_tactical_fuel_battery_qt',
+            'cost_energy_unit_direct_qt',
+            # 后勤成本 (3个)
+            'cost_logistics_spare_parts_availability_qt',
+            'cost_logistics_campaign_storage_transport_qt',
+            'cost_logistics_tactical_forward_delivery_qt',
+            # 训练成本 (3个)
+            'cost_training_total_budget_qt',
+            'cost_training_tactical_consumption_qt',
+            'cost_training_per_soldier_qt',
+            # 基础设施成本 (2个)
+            'cost_infrastructure_base_construction_qt',
+            'cost_infrastructure_spectrum_fee_qt'
+        ]
+
         # 字段中文名称
         self.field_names_cn = {
             # 安全指标
@@ -209,34 +298,60 @@ class EffectivenessEvaluationWithPenalty:
         print(f"已加载 {len(scores)} 个实验的操作评分数据")
         return scores
 
+    def get_equipment_score_matrix(self):
+        """
+        以矩阵形式加载 military_operation_effect_score 表（一次查询，不逐条构造字典）
+
+        返回:
+            (operation_ids 列表, 得分矩阵 n_ops × len(score_fields))，NULL 记为 0
+        """
+        cursor = self.connection.cursor()
+
+        query = f"""
+            SELECT operation_id, {', '.join(self.score_fields)}
+            FROM military_operation_effect_score
+            ORDER BY operation_id
+        """
+
+        cursor.execute(query)
+        rows = cursor.fetchall()
+        cursor.close()
+
+        if not rows:
+            print("[警告] military_operation_effect_score表中无数据!")
+            return [], np.zeros((0, len(self.score_fields)))
+
+        operation_ids = [row[0] for row in rows]
+        # dtype=float 时 None 转为 nan，与逐条计算时的 float(x or 0) 一致记为 0
+        scores = np.nan_to_num(np.array([row[1:] for row in rows], dtype=float), nan=0.0)
+
+        print(f"已加载 {len(operation_ids)} 个实验的操作评分数据")
+        return operation_ids, scores
+
+    def build_score_matrix(self, experiment_scores):
+        """
+        将 get_equipment_scores 返回的字典列表转换为得分矩阵
+
+        返回:
+            (operation_ids 列表, 得分矩阵 n_ops × len(score_fields))，缺失/NULL 记为 0
+        """
+        operation_ids = [exp['operation_id'] for exp in experiment_scores]
+        scores = np.array(
+            [[exp.get(field) for field in self.score_fields] for exp in experiment_scores], dtype=float
+        ).reshape(len(experiment_scores), len(self.score_fields))
+        return operation_ids, np.nan_to_num(scores, nan=0.0)
+
+    def build_weight_vector(self, weights):
+        """将权重字典转换为与 score_fields 对齐的权重向量（缺失指标权重为 1.0）"""
+        return np.array([weights.get(field, 1.0) for field in self.score_fields], dtype=float)
+
     def get_cost_evaluation(self):
         """从cost_evaluation表获取各实验的成本数据"""
         cursor = self.connection.cursor(dictionary=True)
 
         # 查询所有成本数据
-        query = """
-            SELECT operation_id, evaluation_time, 
-                   cost_personnel_strategic_command_staff_qt,
-                   cost_personnel_campaign_command_staff_qt,
-                   cost_personnel_tactical_staff_qt,
-                   cost_personnel_equipment_operators_qt,
-                   cost_personnel_campaign_maintenance_hours_qt,
-                   cost_personnel_tactical_maintenance_hours_qt,
-                   cost_personnel_unit_maintenance_hours_qt,
-                   cost_equipment_procurement_total_qt,
-                   cost_equipment_depreciation_qt,
-                   cost_equipment_campaign_support_maintenance_qt,
-                   cost_energy_campaign_fuel_electricity_qt,
-                   cost_energy_tactical_fuel_battery_qt,
-                   cost_energy_unit_direct_qt,
-                   cost_logistics_spare_parts_availability_qt,
-                   cost_logistics_campaign_storage_transport_qt,
-                   cost_logistics_tactical_forward_delivery_qt,
-                   cost_training_total_budget_qt,
-                   cost_training_tactical_consumption_qt,
-                   cost_training_per_soldier_qt,
-                   cost_infrastructure_base_construction_qt,
-                   cost_infrastructure_spectrum_fee_qt
+        query = f"""
+            SELECT operation_id, evaluation_time, {', '.join(self.cost_fields)}
             FROM cost_evaluation
             ORDER BY operation_id
         """
@@ -252,90 +367,126 @@ class EffectivenessEvaluationWithPenalty:
         print(f"已加载 {len(costs)} 个实验的成本数据")
         return costs
 
+    def get_cost_matrix(self):
+        """
+        以矩阵形式加载 cost_evaluation 表（一次查询，不逐条构造字典）
+
+        返回:
+            (operation_ids 列表, 成本矩阵 n_ops × len(cost_fields))，NULL 为 nan
+        """
+        cursor = self.connection.cursor()
+
+        query = f"""
+            SELECT operation_id, {', '.join(self.cost_fields)}
+            FROM cost_evaluation
+            ORDER BY operation_id
+        """
+
+        cursor.execute(query)
+        rows = cursor.fetchall()
+        cursor.close()
+
+        if not rows:
+            print("[警告] cost_evaluation表中无数据!")
+            return [], np.zeros((0, len(self.cost_fields)))
+
+        operation_ids = [row[0] for row in rows]
+        # dtype=float 时 None 转为 nan，作为 NULL 掩码
+        costs = np.array([row[1:] for row in rows], dtype=float)
+
+        print(f"已加载 {len(operation_ids)} 个实验的成本数据")
+        return operation_ids, costs
+
+    def build_cost_matrix(self, cost_data):
+        """
+        将 get_cost_evaluation 返回的字典列表转换为成本矩阵
+
+        返回:
+            (operation_ids 列表, 成本矩阵 n_ops × len(cost_fields))，NULL/缺失为 nan
+        """
+        operation_ids = [cost['operation_id'] for cost in cost_data]
+        costs = np.array(
+            [[cost.get(field) for field in self.cost_fields] for cost in cost_data], dtype=float
+        ).reshape(len(cost_data), len(self.cost_fields))
+        return operation_ids, costs
+
+    def normalize_cost_matrix(self, operation_ids, costs):
+        """
+        对成本矩阵按列进行max-min归一化（正向指标：费用越高，归一化值越高）
+
+        x_normalized = (x - x_min) / (x_max - x_min)
+
+        NULL（nan）不参与该列的 min/max，也不计入平均成本与原始成本总和；
+        某列只有一个取值（x_max = x_min）时归一化值为 1.0
+
+        参数:
+            operation_ids: 实验ID列表
+            costs: 成本矩阵 n_ops × len(cost_fields)，NULL 为 nan
+
+        返回:
+            dict: operation_ids, normalized（n_ops × 字段数，NULL 处为0）, valid（非NULL掩码）,
+                  avg_normalized_cost, original_total_cost（均为 n_ops 数组）
+        """
+        costs = np.asarray(costs, dtype=float)
+        valid = ~np.isnan(costs)
+
+        # 列最小/最大值（忽略 NULL；全为 NULL 的列不参与计算）
+        col_min = np.where(valid, costs, np.inf).min(axis=0, initial=np.inf)
+        col_max = np.where(valid, costs, -np.inf).max(axis=0, initial=-np.inf)
+        spread = col_max - col_min
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            normalized = np.where(spread > 0, (costs - col_min) / spread, 1.0)
+        normalized = np.where(valid, normalized, 0.0)
+
+        # 平均成本（归一化后的平均值）与原始成本总和
+        valid_count = valid.sum(axis=1)
+        avg_normalized_cost = np.divide(
+            normalized.sum(axis=1), valid_count,
+            out=np.zeros(len(costs)), where=valid_count > 0
+        )
+        original_total_cost = np.where(valid, costs, 0.0).sum(axis=1)
+
+        if len(costs):
+            print(f"[OK] 成本数据归一化完成")
+            print(f"  原始成本范围: {original_total_cost.min():.2f} - {original_total_cost.max():.2f}")
+            print(f"  归一化成本范围: {avg_normalized_cost.min():.4f} - {avg_normalized_cost.max():.4f}")
+
+        return {
+            'operation_ids': list(operation_ids),
+            'normalized': normalized,
+            'valid': valid,
+            'avg_normalized_cost': avg_normalized_cost,
+            'original_total_cost': original_total_cost
+        }
+
     def normalize_cost_maxmin(self, cost_data):
         """
         对成本数据进行max-min归一化（正向指标：费用越高，归一化值越高）
         
         x_normalized = (x - x_min) / (x_max - x_min)
         
+        计算在成本矩阵上按列进行（见 normalize_cost_matrix）
+
         返回：归一化后的成本数据列表
         """
         if not cost_data:
             return []
 
-        # 获取所有成本字段
-        cost_fields = [
-            'cost_personnel_strategic_command_staff_qt',
-            'cost_personnel_campaign_command_staff_qt',
-            'cost_personnel_tactical_staff_qt',
-            'cost_personnel_equipment_operators_qt',
-            'cost_personnel_campaign_maintenance_hours_qt',
-            'cost_personnel_tactical_maintenance_hours_qt',
-            'cost_personnel_unit_maintenance_hours_qt',
-            'cost_equipment_procurement_total_qt',
-            'cost_equipment_depreciation_qt',
-            'cost_equipment_campaign_support_maintenance_qt',
-            'cost_energy_campaign_fuel_electricity_qt',
-            'cost_energy_tactical_fuel_battery_qt',
-            'cost_energy_unit_direct_qt',
-            'cost_logistics_spare_parts_availability_qt',
-            'cost_logistics_campaign_storage_transport_qt',
-            'cost_logistics_tactical_forward_delivery_qt',
-            'cost_training_total_budget_qt',
-            'cost_training_tactical_consumption_qt',
-            'cost_training_per_soldier_qt',
-            'cost_infrastructure_base_construction_qt',
-            'cost_infrastructure_spectrum_fee_qt'
-        ]
+        table = self.normalize_cost_matrix(*self.build_cost_matrix(cost_data))
 
-        # 计算每个字段的min和max
-        field_minmax = {}
-        for field in cost_fields:
-            values = [float(c.get(field, 0) or 0) for c in cost_data if c.get(field) is not None]
-            if values:
-                field_minmax[field] = {'min': min(values), 'max': max(values)}
-
-        # 归一化每个实验的成本数据
-        normalized_costs = []
-        for cost in cost_data:
-            normalized = {'operation_id': cost['operation_id']}
-            total_normalized = 0
-            valid_count = 0
-
-            for field in cost_fields:
-                if field in field_minmax and cost.get(field) is not None:
-                    value = float(cost[field])
-                    min_val = field_minmax[field]['min']
-                    max_val = field_minmax[field]['max']
-
-                    # max-min归一化
-                    if max_val > min_val:
-                        normalized[field] = (value - min_val) / (max_val - min_val)
-                    else:
-                        normalized[field] = 1.0
-
-                    total_normalized += normalized[field]
-                    valid_count += 1
-                else:
-                    normalized[field] = 0
-
-            # 计算平均成本（归一化后的平均值）
-            if valid_count > 0:
-                normalized['avg_normalized_cost'] = total_normalized / valid_count
-            else:
-                normalized['avg_normalized_cost'] = 0
-
-            # 保存原始成本总和（用于参考）
-            original_total = sum([float(cost.get(f, 0) or 0) for f in cost_fields if cost.get(f) is not None])
-            normalized['original_total_cost'] = original_total
-
-            normalized_costs.append(normalized)
-
-        print(f"[OK] 成本数据归一化完成")
-        print(f"  原始成本范围: {min([c['original_total_cost'] for c in normalized_costs]):.2f} - {max([c['original_total_cost'] for c in normalized_costs]):.2f}")
-        print(f"  归一化成本范围: {min([c['avg_normalized_cost'] for c in normalized_costs]):.4f} - {max([c['avg_normalized_cost'] for c in normalized_costs]):.4f}")
-
-        return normalized_costs
+        return [
+            {
+                'operation_id': operation_id,
+                **dict(zip(self.cost_fields, row)),
+                'avg_normalized_cost': avg_cost,
+                'original_total_cost': original_total
+            }
+            for operation_id, row, avg_cost, original_total in zip(
+                table['operation_ids'], table['normalized'].tolist(),
+                table['avg_normalized_cost'].tolist(), table['original_total_cost'].tolist()
+            )
+        ]
 
     def calculate_penalty_factor(self, score_field, score_value):
         """
@@ -358,20 +509,177 @@ class EffectivenessEvaluationWithPenalty:
         返回:
             惩罚因子 F_i
         """
-        if score_field not in self.penalty_config:
-            return 1.0
+        return float(self.calculate_penalty_factors(score_field, np.array([score_value], dtype=float))[0])
 
-        config = self.penalty_config[score_field]
-        threshold = config['threshold']  # s: 惩罚阈值
-        m = config['m']                   # m: 惩罚系数 (0<m≤1)
+    def calculate_penalty_factors(self, score_field, score_values):
+        """
+        对一列指标得分批量计算惩罚因子（分段函数的向量化形式，公式同 calculate_penalty_factor）
 
-        # 崩溃比例得分：得分越高越好，低于阈值开始惩罚
-        if score_value >= threshold:
-            return 1.0  # 得分高，无惩罚
-        else:
-            # 惩罚因子 = (x/s) × m
-            penalty = (score_value / threshold) * m
-            return max(penalty, 0.1)  # 最小惩罚因子为0.1
+        参数:
+            score_field: 指标字段名
+            score_values: 各实验的指标得分数组 (x)
+
+        返回:
+            与 score_values 同形状的惩罚因子数组；该指标无规则或规则未启用时全为1
+        """
+        score_values = np.asarray(score_values, dtype=float)
+        if score_field not in self.active_penalty_fields():
+            return np.ones_like(score_values)
+
+        rules = self.get_penalty_rule_arrays([score_field])
+        return self.apply_penalty_rules(
+            score_values[..., np.newaxis], rules['threshold'], rules['m'], rules
+        )[..., 0]
+
+    def active_penalty_fields(self):
+        """参与计算的规则指标（按 penalty_config 顺序，跳过 enabled=False 的规则）"""
+        return [field for field, config in self.penalty_config.items() if config.get('enabled', True)]
+
+    def get_penalty_rule_arrays(self, fields=None):
+        """
+        将规则表转换为按列对齐的参数数组
+
+        参数:
+            fields: 规则指标列表，默认为 active_penalty_fields()
+
+        返回:
+            dict: fields, columns（在 score_fields 中的列号）, threshold, m, floor, cap,
+                  reverse, incentive（均为长度 k 的数组）
+        """
+        if fields is None:
+            fields = self.active_penalty_fields()
+
+        configs = [self.penalty_config[field] for field in fields]
+        for field, config in zip(fields, configs):
+            if config.get('kind', 'penalty') not in ('penalty', 'incentive'):
+                raise ValueError(f"指标 {field} 的规则类型无效: {config.get('kind')}")
+            if config['threshold'] <= 0:
+                raise ValueError(f"指标 {field} 的阈值必须大于0: {config['threshold']}")
+
+        return {
+            'fields': list(fields),
+            'columns': np.array([self.score_fields.index(field) for field in fields], dtype=int),
+            'threshold': np.array([config['threshold'] for config in configs], dtype=float),
+            'm': np.array([config['m'] for config in configs], dtype=float),
+            'floor': np.array([config.get('floor', 0.1) for config in configs], dtype=float),
+            'cap': np.array([config.get('cap', np.inf) for config in configs], dtype=float),
+            'reverse': np.array([config.get('reverse', False) for config in configs], dtype=bool),
+            'incentive': np.array([config.get('kind', 'penalty') == 'incentive' for config in configs], dtype=bool)
+        }
+
+    @staticmethod
+    def apply_penalty_rules(values, threshold, m, rules):
+        """
+        惩罚/激励分段函数（全部按数组广播计算）
+
+        参数:
+            values: 指标得分，最后一维为 k 个规则指标 (..., k)
+            threshold: 阈值 s，可广播到 values (..., k)
+            m: 系数 m，可广播到 values (..., k)
+            rules: get_penalty_rule_arrays 的返回值（使用 floor/cap/reverse/incentive）
+
+        返回:
+            与广播结果同形状的因子数组
+        """
+        values = np.asarray(values, dtype=float)
+        reverse, incentive = rules['reverse'], rules['incentive']
+
+        # reverse 指标取 s/x，其余取 x/s（x=0 时比值为 inf，由 floor/cap 截断）
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratio = np.where(reverse, threshold / values, values / threshold)
+        raw = ratio * m
+        factor = np.where(incentive, np.minimum(raw, rules['cap']), np.maximum(raw, rules['floor']))
+
+        # 惩罚在“差于阈值”时触发，激励在“优于阈值”时触发
+        worse = np.where(reverse, values > threshold, values < threshold)
+        better = np.where(reverse, values < threshold, values > threshold)
+        triggered = np.where(incentive, better, worse)
+        return np.where(triggered, factor, 1.0)
+
+    def combine_penalty_factors(self, factors, rules):
+        """
+        按 penalty_combination 组合各指标因子（最后一维）
+
+        'min': 惩罚因子取最小值 × 激励因子取最大值
+        'product': 全部因子相乘
+        """
+        if self.penalty_combination == 'product':
+            return np.prod(factors, axis=-1)
+        if self.penalty_combination != 'min':
+            raise ValueError(f"无效的组合方式: {self.penalty_combination}")
+
+        incentive = rules['incentive']
+        penalty = np.min(np.where(incentive, np.inf, factors), axis=-1, initial=1.0)
+        bonus = np.max(np.where(incentive, factors, -np.inf), axis=-1, initial=1.0)
+        return penalty * bonus
+
+    def evaluate_penalty_rules(self, scores, rules=None):
+        """
+        对全部实验 × 全部规则指标一次性计算惩罚/激励因子
+
+        参数:
+            scores: 得分矩阵 n_ops × len(score_fields)
+            rules: get_penalty_rule_arrays 的返回值，默认使用当前规则表
+
+        返回:
+            dict: fields, values（n_ops × k 指标得分）, factors（n_ops × k 各指标因子，用于审计）,
+                  penalty_factor（n_ops 综合因子）
+        """
+        if rules is None:
+            rules = self.get_penalty_rule_arrays()
+
+        values = scores[:, rules['columns']]
+        factors = self.apply_penalty_rules(values, rules['threshold'], rules['m'], rules)
+
+        return {
+            'fields': rules['fields'],
+            'values': values,
+            'factors': factors,
+            'penalty_factor': self.combine_penalty_factors(factors, rules)
+        }
+
+    def calculate_stage_scores(self, scores, weight_vector):
+        """
+        加权阶段得分 Sstage：得分矩阵与权重向量一次矩阵-向量乘法
+
+        参数:
+            scores: 得分矩阵 n_ops × len(score_fields)
+            weight_vector: 与 score_fields 对齐的权重向量
+
+        返回:
+            各实验的阶段得分数组
+        """
+        total_weight = weight_vector.sum()
+        if total_weight > 0:
+            return scores @ weight_vector / total_weight
+        return np.zeros(scores.shape[0])
+
+    def score_operations(self, scores, weight_vector):
+        """
+        矩阵化计算全部实验的效能得分（带惩罚）
+
+        参数:
+            scores: 得分矩阵 n_ops × len(score_fields)
+            weight_vector: 与 score_fields 对齐的权重向量
+
+        返回:
+            dict: crash_rates, crash_penalties, penalty_factors, stage_scores, final_scores（均为 n_ops 数组），
+                  penalty_rules（evaluate_penalty_rules 的返回值，含各指标因子矩阵）
+        """
+        crash_rates = scores[:, self.score_fields.index('reliability_crash_rate_qt')]
+        crash_penalties = self.calculate_penalty_factors('reliability_crash_rate_qt', crash_rates)
+        penalty_rules = self.evaluate_penalty_rules(scores)
+        stage_scores = self.calculate_stage_scores(scores, weight_vector)
+
+        return {
+            'crash_rates': crash_rates,
+            'crash_penalties': crash_penalties,
+            'penalty_factors': penalty_rules['penalty_factor'],
+            'penalty_rules': penalty_rules,
+            'stage_scores': stage_scores,
+            # Sfinal = Sstage × P
+            'final_scores': stage_scores * penalty_rules['penalty_factor']
+        }
 
     def calculate_weighted_effectiveness(self, exp, weights):
         """
@@ -384,22 +692,18 @@ class EffectivenessEvaluationWithPenalty:
         返回:
             加权效能得分
         """
-        total_weighted_score = 0
-        total_weight = 0
-
-        for field in self.score_fields:
-            score_value = float(exp.get(field, 0) or 0)
-            weight = weights.get(field, 1.0)
+        _, scores = self.build_score_matrix([exp])
+        return float(self.calculate_stage_scores(scores, self.build_weight_vector(weights))[0])
 
-            total_weighted_score += score_value * weight
-            total_weight += weight
+    def calculate_effectiveness(self, verbose=True):
+        """
+        计算各实验的效能得分（带惩罚）
 
-        if total_weight > 0:
-            return total_weighted_score / total_weight
-        return 0
+        得分表按矩阵一次性加载，阶段得分与惩罚因子均为数组运算（见 score_operations）
 
-    def calculate_effectiveness(self):
-        """计算各实验的效能得分（带惩罚）"""
+        参数:
+            verbose: 是否逐个实验输出计算过程（实验数量很多时建议关闭）
+        """
         print("\n" + "="*80)
         print("开始计算效能得分（带崩溃比例惩罚模型）")
         print("="*80)
@@ -410,59 +714,287 @@ class EffectivenessEvaluationWithPenalty:
             print("[错误] 无法获取权重数据!")
             return []
 
-        # 2. 获取实验评分
-        experiment_scores = self.get_equipment_scores()
-        if not experiment_scores:
+        # 2. 获取实验评分（n_ops × 17 矩阵）
+        operation_ids, scores = self.get_equipment_score_matrix()
+        if not operation_ids:
             return []
 
-        # 3. 计算每个实验的效能得分
-        results = []
+        # 3. 矩阵化计算全部实验的效能得分
+        scored = self.score_operations(scores, self.build_weight_vector(weights))
+
+        penalty_fields = scored['penalty_rules']['fields']
+        results = [
+            {
+                'operation_id': operation_id,
+                'crash_rate': crash_rate,
+                'crash_penalty': crash_penalty,
+                'penalty_factor': penalty_factor,
+                'indicator_factors': dict(zip(penalty_fields, factors)),
+                'stage_score': stage_score,
+                'final_score': final_score,
+                'exp_data': dict(zip(['operation_id'] + self.score_fields, [operation_id] + row))
+            }
+            for operation_id, crash_rate, crash_penalty, penalty_factor, factors, stage_score, final_score, row in zip(
+                operation_ids, scored['crash_rates'].tolist(), scored['crash_penalties'].tolist(),
+                scored['penalty_factors'].tolist(), scored['penalty_rules']['factors'].tolist(),
+                scored['stage_scores'].tolist(), scored['final_scores'].tolist(), scores.tolist()
+            )
+        ]
+
+        if verbose:
+            self.display_calculation(results)
+
+        return results
+
+    def display_calculation(self, results):
+        """逐个实验输出效能得分计算过程"""
+        config = self.penalty_config['reliability_crash_rate_qt']
 
         print("\n" + "-"*80)
         print("效能得分计算过程")
         print("-"*80)
 
-        for exp in experiment_scores:
-            operation_id = exp['operation_id']
+        for r in results:
+            print(f"\n【{r['operation_id']}】")
+            print(f"  崩溃比例得分: {r['crash_rate']:.2f} 分")
+            print(f"  惩罚因子: {r['crash_penalty']:.4f} {'[无惩罚]' if r['crash_penalty'] == 1.0 else '[已惩罚]'}")
+            # 其他规则指标只在触发时输出
+            for field, factor in r['indicator_factors'].items():
+                if field != 'reliability_crash_rate_qt' and factor != 1.0:
+                    print(f"  {self.penalty_config[field]['name']}: {r['exp_data'][field]:.2f} 分 -> 因子 {factor:.4f}")
+            if r['penalty_factor'] != r['crash_penalty']:
+                print(f"  综合因子({self.penalty_combination}): {r['penalty_factor']:.4f}")
+            print(f"  加权阶段得分: {r['stage_score']:.4f}")
+            print(f"  最终得分: {r['final_score']:.4f}")
 
-            # 获取崩溃比例得分（核心惩罚指标）
-            crash_rate = float(exp.get('reliability_crash_rate_qt', 0) or 0)
+            # 如果崩溃比例低于阈值，提示
+            if r['crash_rate'] < config['threshold']:
+                print(f"  [!] 崩溃比例得分 < {config['threshold']}分，"
+                      f"应用惩罚后最终得分上限: {config['m'] * config['threshold']:.2f}%")
 
-            # 计算崩溃比例惩罚因子
-            crash_penalty = self.calculate_penalty_factor(
-                'reliability_crash_rate_qt',
-                crash_rate
+    # ==================== 惩罚参数扫描 ====================
+
+    def sweep_penalty_parameters(self, scores, weight_vector, thresholds, coefficients, fields=None,
+                                 top_k=3, operation_ids=None):
+        """
+        在 (阈值 s, 系数 m) 网格上计算最终得分与排名
+
+        阶段得分与 s、m 无关，只计算一次；只有惩罚层在网格上广播计算
+
+        参数:
+            scores: 得分矩阵 n_ops × len(score_fields)
+            weight_vector: 与 score_fields 对齐的权重向量
+            thresholds: 阈值 s 的取值（长度 a）
+            coefficients: 系数 m 的取值（长度 b）
+            fields: 参与扫描的规则指标，默认全部启用的规则；扫描的指标统一取网格上的 s、m，
+                    其余启用规则保持 penalty_config 中的参数（未启用的指标若被指定则视为启用）
+            top_k: 稳定性分析的前 k 名
+            operation_ids: 实验ID列表（用于输出前 k 名）
+
+        返回:
+            dict: fields, thresholds, coefficients, stage_scores, final_scores (a×b×n), ranks (a×b×n),
+                  base_ranks, base_top_k, mean_rank_change (a×b), max_rank_change (a×b),
+                  top_k_overlap (a×b), top_k_stable (a×b), stable_region
+        """
+        thresholds = np.asarray(thresholds, dtype=float)
+        coefficients = np.asarray(coefficients, dtype=float)
+        if thresholds.size == 0 or coefficients.size == 0:
+            raise ValueError("阈值 s 与系数 m 的网格不能为空")
+        if (thresholds <= 0).any():
+            raise ValueError(f"阈值 s 必须大于0: {thresholds[thresholds <= 0].tolist()}")
+        if top_k < 1:
+            raise ValueError(f"前 k 名的 k 必须至少为1: {top_k}")
+        active = self.active_penalty_fields()
+        fields = list(active if fields is None else fields)
+        if not fields:
+            raise ValueError("没有可扫描的惩罚规则指标")
+        for field in fields:
+            if field not in self.penalty_config:
+                raise ValueError(f"指标 {field} 不在惩罚规则表中")
+
+        rules = self.get_penalty_rule_arrays(active + [field for field in fields if field not in active])
+        swept = np.isin(rules['fields'], fields)
+        n_ops, k = scores.shape[0], len(rules['fields'])
+        top_k = min(top_k, n_ops)
+
+        # 阶段得分与当前参数下的基准排名（只算一次）
+        stage_scores = self.calculate_stage_scores(scores, weight_vector)
+        values = scores[:, rules['columns']]
+        base_factors = self.apply_penalty_rules(values, rules['threshold'], rules['m'], rules)
+        base_final = stage_scores * self.combine_penalty_factors(base_factors, rules)
+        base_order, base_ranks = self._rank_scores(base_final)
+        base_top = base_order[:top_k]
+
+        # 网格参数 (a, b, 1, k)：被扫描的指标取网格值，其余保持原参数
+        a, b = len(thresholds), len(coefficients)
+        grid_s = np.where(swept, thresholds[:, None, None, None], rules['threshold'])
+        grid_m = np.where(swept, coefficients[None, :, None, None], rules['m'])
+        grid_s = np.broadcast_to(grid_s, (a, b, 1, k))
+        grid_m = np.broadcast_to(grid_m, (a, b, 1, k))
+
+        final_scores = np.empty((a, b, n_ops))
+        step = max(1, SWEEP_CHUNK_CELLS // max(b * n_ops * k, 1))
+        for start in range(0, a, step):
+            chunk = slice(start, start + step)
+            factors = self.apply_penalty_rules(values, grid_s[chunk], grid_m[chunk], rules)
+            final_scores[chunk] = stage_scores * self.combine_penalty_factors(factors, rules)
+
+        order, ranks = self._rank_scores(final_scores)
+        rank_change = np.abs(ranks - base_ranks)
+        top_sets = order[..., :top_k]
+        top_k_overlap = np.isin(top_sets, base_top).sum(axis=-1) / max(top_k, 1)
+        top_k_stable = top_k_overlap == 1.0
+
+        ids = list(operation_ids) if operation_ids is not None else list(range(n_ops))
+        return {
+            'fields': fields,
+            'thresholds': thresholds,
+            'coefficients': coefficients,
+            'top_k': top_k,
+            'stage_scores': stage_scores,
+            'final_scores': final_scores,
+            'ranks': ranks,
+            'base_ranks': base_ranks,
+            'base_top_k': [ids[i] for i in base_top],
+            'mean_rank_change': rank_change.mean(axis=-1),
+            'max_rank_change': rank_change.max(axis=-1),
+            'top_k_overlap': top_k_overlap,
+            'top_k_stable': top_k_stable,
+            'stable_region': self._stable_region(thresholds, coefficients, top_k_stable)
+        }
+
+    def sweep_penalty_parameters_per_indicator(self, scores, weight_vector, thresholds, coefficients,
+                                               fields=None, top_k=3, operation_ids=None):
+        """
+        逐个规则指标分别扫描（其余规则保持原参数）
+
+        返回:
+            dict: {指标字段: sweep_penalty_parameters 的返回值}
+        """
+        fields = self.active_penalty_fields() if fields is None else fields
+        return {
+            field: self.sweep_penalty_parameters(
+                scores, weight_vector, thresholds, coefficients, fields=[field],
+                top_k=top_k, operation_ids=operation_ids
             )
+            for field in fields
+        }
 
-            # 计算加权效能得分 Sstage
-            stage_score = self.calculate_weighted_effectiveness(exp, weights)
+    @staticmethod
+    def _rank_scores(final_scores):
+        """按最后一维排序，返回 (由高到低的实验下标, 名次)；名次1为最高分，同分按实验顺序"""
+        order = np.argsort(-final_scores, axis=-1, kind='stable')
+        ranks = np.empty_like(order)
+        np.put_along_axis(ranks, order, np.arange(1, order.shape[-1] + 1), axis=-1)
+        return order, ranks
+
+    @staticmethod
+    def _stable_region(thresholds, coefficients, stable):
+        """前 k 名集合不变的参数区域：网格点列表与 s、m 的取值范围"""
+        s_idx, m_idx = np.nonzero(stable)
+        if len(s_idx) == 0:
+            return {'points': [], 'threshold_range': None, 'm_range': None, 'fraction': 0.0}
+        return {
+            'points': [(float(thresholds[i]), float(coefficients[j])) for i, j in zip(s_idx, m_idx)],
+            'threshold_range': (float(thresholds[s_idx].min()), float(thresholds[s_idx].max())),
+            'm_range': (float(coefficients[m_idx].min()), float(coefficients[m_idx].max())),
+            'fraction': float(stable.mean())
+        }
 
-            # 应用惩罚因子
-            # Sfinal = Sstage × P
-            final_score = stage_score * crash_penalty
+    def display_sweep(self, sweep, title=None):
+        """输出参数扫描汇总"""
+        print("\n" + "="*80)
+        print(title or f"惩罚参数扫描: {', '.join(sweep['fields'])}")
+        print("="*80)
+        print(f"  阈值 s: {sweep['thresholds'].min():g} - {sweep['thresholds'].max():g} ({len(sweep['thresholds'])} 个)")
+        print(f"  系数 m: {sweep['coefficients'].min():g} - {sweep['coefficients'].max():g} ({len(sweep['coefficients'])} 个)")
+        print(f"  当前参数下前{sweep['top_k']}名: {', '.join(str(i) for i in sweep['base_top_k'])}")
+
+        region = sweep['stable_region']
+        if region['points']:
+            print(f"  前{sweep['top_k']}名不变的网格点: {len(region['points'])} 个 ({region['fraction']*100:.1f}%)")
+            print(f"    s 范围: {region['threshold_range'][0]:g} - {region['threshold_range'][1]:g}")
+            print(f"    m 范围: {region['m_range'][0]:g} - {region['m_range'][1]:g}")
+        else:
+            print(f"  [!] 网格内不存在前{sweep['top_k']}名不变的参数组合")
 
-            result = {
-                'operation_id': operation_id,
-                'crash_rate': crash_rate,
-                'crash_penalty': crash_penalty,
-                'stage_score': stage_score,
-                'final_score': final_score,
-                'exp_data': exp
-            }
-            results.append(result)
+        print(f"  平均名次变化范围: {sweep['mean_rank_change'].min():.2f} - {sweep['mean_rank_change'].max():.2f}")
+        print(f"  最大名次变化: {int(sweep['max_rank_change'].max())}")
 
-            # 打印详细信息
-            print(f"\n【{operation_id}】")
-            print(f"  崩溃比例得分: {crash_rate:.2f} 分")
-            print(f"  惩罚因子: {crash_penalty:.4f} {'[无惩罚]' if crash_penalty == 1.0 else '[已惩罚]'}")
-            print(f"  加权阶段得分: {stage_score:.4f}")
-            print(f"  最终得分: {final_score:.4f}")
+    def visualize_sweep(self, sweep, save_path='document/result', filename='penalty_parameter_sweep.png'):
+        """绘制名次变化热力图（左：平均名次变化；右：前k名重合比例，标记稳定区域）"""
+        os.makedirs(save_path, exist_ok=True)
 
-            # 如果崩溃比例低于阈值，提示
-            if crash_rate < 70:
-                print(f"  [!] 崩溃比例得分 < 70分，应用惩罚后最终得分上限: {0.8 * 70:.2f}%")
+        thresholds, coefficients = sweep['thresholds'], sweep['coefficients']
+        extent = [coefficients.min(), coefficients.max(), thresholds.min(), thresholds.max()]
 
-        return results
+        fig, axes = plt.subplots(1, 2, figsize=(16, 7))
+        panels = [
+            (axes[0], sweep['mean_rank_change'], 'YlOrRd', '平均名次变化'),
+            (axes[1], sweep['top_k_overlap'], 'RdYlGn', f"前{sweep['top_k']}名重合比例"),
+        ]
+        for ax, data, cmap, label in panels:
+            image = ax.imshow(data, origin='lower', aspect='auto', cmap=cmap, extent=extent)
+            cbar = plt.colorbar(image, ax=ax)
+            cbar.set_label(label, fontsize=11)
+            ax.set_xlabel('惩罚系数 m', fontsize=12)
+            ax.set_ylabel('惩罚阈值 s', fontsize=12)
+            ax.set_title(label, fontsize=14, fontweight='bold')
+
+        # 标记前k名不变的网格点
+        s_idx, m_idx = np.nonzero(sweep['top_k_stable'])
+        axes[1].scatter(coefficients[m_idx], thresholds[s_idx], marker='s', s=12,
+                        facecolors='none', edgecolors='black', linewidths=0.5, label='前k名不变')
+        if len(s_idx):
+            axes[1].legend(loc='upper right')
+
+        plt.suptitle(f"惩罚参数扫描: {', '.join(sweep['fields'])}", fontsize=16, fontweight='bold')
+        plt.tight_layout()
+
+        output_file = os.path.join(save_path, filename)
+        plt.savefig(output_file, dpi=150, bbox_inches='tight',
+                    facecolor='white', edgecolor='none')
+        plt.close()
+
+        print(f"[OK] 参数扫描热力图已保存至: {output_file}")
+        return output_file
+
+    def run_penalty_sweep(self, thresholds, coefficients, fields=None, per_indicator=False, top_k=3,
+                          visualize=True, save_path='document/result'):
+        """
+        从数据库加载权重与得分矩阵后执行参数扫描
+
+        返回:
+            per_indicator=False 时为 sweep_penalty_parameters 的返回值，
+            否则为 {指标字段: 扫描结果}
+        """
+        weights = self.get_ahp_weights()
+        if not weights:
+            print("[错误] 无法获取权重数据!")
+            return {}
+        operation_ids, scores = self.get_equipment_score_matrix()
+        if not operation_ids:
+            return {}
+
+        weight_vector = self.build_weight_vector(weights)
+        if per_indicator:
+            sweeps = self.sweep_penalty_parameters_per_indicator(
+                scores, weight_vector, thresholds, coefficients, fields=fields,
+                top_k=top_k, operation_ids=operation_ids
+            )
+        else:
+            sweeps = {None: self.sweep_penalty_parameters(
+                scores, weight_vector, thresholds, coefficients, fields=fields,
+                top_k=top_k, operation_ids=operation_ids
+            )}
+
+        for field, sweep in sweeps.items():
+            self.display_sweep(sweep)
+            if visualize:
+                filename = 'penalty_parameter_sweep.png' if field is None else f'penalty_parameter_sweep_{field}.png'
+                self.visualize_sweep(sweep, save_path=save_path, filename=filename)
+
+        return sweeps if per_indicator else sweeps[None]
 
     def display_summary(self, results):
         """显示汇总结果"""
@@ -474,7 +1006,7 @@ class EffectivenessEvaluationWithPenalty:
         print("-"*60)
 
         for r in results:
-            print(f"{r['operation_id']:<15} {r['crash_rate']:>8.2f} {r['crash_penalty']:>10.4f} "
+            print(f"{r['operation_id']:<15} {r['crash_rate']:>8.2f} {r['penalty_factor']:>10.4f} "
                   f"{r['stage_score']:>10.4f} {r['final_score']:>10.4f}")
 
         # 统计信息
@@ -492,11 +1024,11 @@ class EffectivenessEvaluationWithPenalty:
         print(f"  最终得分标准差: {np.std(final_scores):.4f}")
 
         # 显示被惩罚的实验
-        penalized = [r for r in results if r['crash_penalty'] < 1.0]
+        penalized = [r for r in results if r['penalty_factor'] < 1.0]
         if penalized:
             print(f"\n  [!] 有 {len(penalized)} 个实验受到惩罚:")
             for r in penalized:
-                print(f"    {r['operation_id']}: 崩溃比例 {r['crash_rate']:.2f} -> 惩罚因子 {r['crash_penalty']:.4f}")
+                print(f"    {r['operation_id']}: 崩溃比例 {r['crash_rate']:.2f} -> 惩罚因子 {r['penalty_factor']:.4f}")
 
     def visualize_results(self, results, save_path='document/result'):
         """生成柱状图可视化"""
@@ -585,36 +1117,31 @@ class EffectivenessEvaluationWithPenalty:
         
         参数:
             effectiveness_results: 效能评估结果列表
-            normalized_costs: 归一化后的成本数据列表
+            normalized_costs: 归一化后的成本数据列表，或 normalize_cost_matrix 的返回值
         
         返回: 包含效费比的结果列表
         """
-        # 创建operation_id到cost的映射
-        cost_map = {c['operation_id']: c for c in normalized_costs}
-
-        for result in effectiveness_results:
-            operation_id = result['operation_id']
-            final_score = result['final_score']
-            
-            if operation_id in cost_map:
-                cost_data = cost_map[operation_id]
-                avg_cost = cost_data['avg_normalized_cost']
-                original_cost = cost_data['original_total_cost']
-                
-                # 计算效费比（效能/成本）
-                # 如果成本为0，效费比设为最大
-                if avg_cost > 0:
-                    cost_effectiveness_ratio = final_score / (avg_cost * 100)  # 放大100倍
-                else:
-                    cost_effectiveness_ratio = final_score
-                
-                result['avg_normalized_cost'] = avg_cost
-                result['original_cost'] = original_cost
-                result['cost_effectiveness_ratio'] = cost_effectiveness_ratio
-            else:
-                result['avg_normalized_cost'] = 0
-                result['original_cost'] = 0
-                result['cost_effectiveness_ratio'] = 0
+        if isinstance(normalized_costs, dict):
+            cost_table = normalized_costs
+        else:
+            cost_table = {
+                'operation_ids': [c['operation_id'] for c in normalized_costs],
+                'avg_normalized_cost': np.array([c['avg_normalized_cost'] for c in normalized_costs], dtype=float),
+                'original_total_cost': np.array([c['original_total_cost'] for c in normalized_costs], dtype=float)
+            }
+
+        ratios = self.compute_cost_effectiveness(
+            [r['operation_id'] for r in effectiveness_results],
+            np.array([r['final_score'] for r in effectiveness_results], dtype=float),
+            cost_table
+        )
+
+        for result, avg_cost, original_cost, ratio in zip(
+                effectiveness_results, ratios['avg_normalized_cost'].tolist(),
+                ratios['original_cost'].tolist(), ratios['cost_effectiveness_ratio'].tolist()):
+            result['avg_normalized_cost'] = avg_cost
+            result['original_cost'] = original_cost
+            result['cost_effectiveness_ratio'] = ratio
 
         # 打印效费比结果
         print("\n" + "="*80)
@@ -651,6 +1178,160 @@ class EffectivenessEvaluationWithPenalty:
 
         return effectiveness_results
 
+    @staticmethod
+    def match_operation_index(operation_ids, other_ids):
+        """
+        按实验ID对齐两张表：返回 operation_ids 中每个实验在 other_ids 中的行号（不存在为 -1）
+
+        排序 + 二分查找，不构造字典
+        """
+        other_ids = np.asarray(other_ids)
+        index = np.full(len(operation_ids), -1, dtype=int)
+        if len(other_ids) == 0 or len(operation_ids) == 0:
+            return index
+
+        ids = np.asarray(operation_ids)
+        sorter = np.argsort(other_ids, kind='stable')
+        pos = np.clip(np.searchsorted(other_ids, ids, sorter=sorter), 0, len(other_ids) - 1)
+        found = other_ids[sorter[pos]] == ids
+        index[found] = sorter[pos[found]]
+        return index
+
+    def compute_cost_effectiveness(self, operation_ids, final_scores, cost_table):
+        """
+        按实验下标对齐效能与成本，计算效费比（数组运算）
+
+        效费比 = 最终效能得分 / (归一化平均成本 × 100)；成本为0时取最终得分，无成本数据时为0
+
+        参数:
+            operation_ids: 效能结果的实验ID列表
+            final_scores: 最终效能得分数组
+            cost_table: normalize_cost_matrix 的返回值（至少含 operation_ids、avg_normalized_cost、original_total_cost）
+
+        返回:
+            dict: cost_index（成本表行号，-1 表示无成本数据）, avg_normalized_cost, original_cost,
+                  cost_effectiveness_ratio（均为与 final_scores 对齐的数组）
+        """
+        final_scores = np.asarray(final_scores, dtype=float)
+        cost_index = self.match_operation_index(operation_ids, cost_table['operation_ids'])
+        matched = cost_index >= 0
+
+        # 只按已匹配的行号取值：成本表为空时 cost_index 全为 -1，不能直接下标
+        avg_cost = np.zeros(len(final_scores))
+        original_cost = np.zeros(len(final_scores))
+        avg_cost[matched] = np.asarray(cost_table['avg_normalized_cost'], dtype=float)[cost_index[matched]]
+        original_cost[matched] = np.asarray(cost_table['original_total_cost'], dtype=float)[cost_index[matched]]
+
+        # 计算效费比（效能/成本，放大100倍）；如果成本为0，效费比设为最终得分
+        ratio = np.divide(final_scores, avg_cost * 100, out=final_scores.copy(), where=avg_cost > 0)
+        ratio = np.where(matched, ratio, 0.0)
+
+        return {
+            'cost_index': cost_index,
+            'avg_normalized_cost': avg_cost,
+            'original_cost': original_cost,
+            'cost_effectiveness_ratio': ratio
+        }
+
+    def category_cost_matrix(self, cost_table):
+        """
+        各成本分类的归一化平均成本（按 NULL 掩码求行均值）
+
+        参数:
+            cost_table: normalize_cost_matrix 的返回值
+
+        返回:
+            (分类名称列表, n_ops × 分类数 矩阵)；某实验某分类全为 NULL 时为0
+        """
+        columns, names = [], []
+        for category, name in COST_CATEGORY_NAMES.items():
+            indices = [i for i, field in enumerate(self.cost_fields) if field.startswith(f'cost_{category}_')]
+            normalized = cost_table['normalized'][:, indices]
+            valid_count = cost_table['valid'][:, indices].sum(axis=1)
+            columns.append(np.divide(normalized.sum(axis=1), valid_count,
+                                     out=np.zeros(len(normalized)), where=valid_count > 0))
+            names.append(name)
+        return names, np.column_stack(columns)
+
+    def analyze_pareto(self, results, cost_table, by_category=False):
+        """
+        成本-效能 Pareto 分析（见 pareto_analysis）
+
+        - 默认目标: 最终得分（越大越好）、归一化平均成本（越小越好）
+        - by_category=True: 最终得分 + 各成本分类的归一化平均成本（多目标前沿）
+
+        无成本数据的实验不参与分析。结果中的实验同时记录 pareto_front、pareto_depth、epsilon_rank
+
+        参数:
+            results: calculate_effectiveness 的结果列表
+            cost_table: normalize_cost_matrix 的返回值
+
+        返回:
+            analyze_tradeoffs 的返回值
+        """
+        operation_ids = [r['operation_id'] for r in results]
+        final_scores = np.array([r['final_score'] for r in results], dtype=float)
+        cost_index = self.match_operation_index(operation_ids, cost_table['operation_ids'])
+        matched = np.nonzero(cost_index >= 0)[0]
+
+        if by_category:
+            cost_names, cost_values = self.category_cost_matrix(cost_table)
+            cost_values = cost_values[cost_index[matched]]
+        else:
+            cost_names = ['归一化成本']
+            cost_values = np.asarray(cost_table['avg_normalized_cost'], dtype=float)[cost_index[matched], np.newaxis]
+
+        analysis = analyze_tradeoffs(
+            [operation_ids[i] for i in matched],
+            np.column_stack([final_scores[matched], cost_values]),
+            senses=['max'] + ['min'] * len(cost_names),
+            names=['最终得分'] + cost_names
+        )
+
+        for result in results:
+            result['pareto_front'] = False
+            result['pareto_depth'] = None
+            result['epsilon_rank'] = None
+        for row, i in enumerate(matched):
+            results[i]['pareto_front'] = bool(analysis['front_mask'][row])
+            results[i]['pareto_depth'] = int(analysis['depth'][row])
+            results[i]['epsilon_rank'] = int(analysis['epsilon_rank'][row])
+
+        return analysis
+
+    def display_pareto(self, analysis, top_n=10):
+        """输出 Pareto 前沿、支配深度分布与 ε 指标排名"""
+        names = analysis['names']
+        ids = analysis['operation_ids']
+        objectives = analysis['objectives']
+
+        print("\n" + "="*80)
+        print(f"Pareto 前沿分析（目标: {', '.join(f'{n}({s})' for n, s in zip(names, analysis['senses']))}）")
+        print("="*80)
+
+        if not ids:
+            print("  [警告] 无可分析的实验（缺少成本数据）")
+            return
+
+        front = np.nonzero(analysis['front_mask'])[0]
+        print(f"\n  非支配方案: {len(front)}/{len(ids)} 个")
+        print(f"  {'实验ID':<15} " + " ".join(f"{n:<12}" for n in names) + f" {'ε余量':<10}")
+        print("  " + "-"*(16 + 13 * len(names) + 10))
+        for i in front[np.argsort(analysis['epsilon_rank'][front])]:
+            print(f"  {ids[i]:<15} " + " ".join(f"{v:>11.4f} " for v in objectives[i])
+                  + f" {analysis['margin'][i]:>9.4f}")
+
+        levels, counts = np.unique(analysis['depth'], return_counts=True)
+        print("\n  支配深度分布: " + ", ".join(f"第{level}层 {count}个" for level, count in zip(levels, counts)))
+
+        print(f"\n  ε指标排名（前{min(top_n, len(ids))}名；前沿按余量，其余按进入前沿所需改进量ε）:")
+        print(f"  {'名次':<6} {'实验ID':<15} {'支配深度':<10} {'ε':<10} {'ε得分':<10}")
+        print("  " + "-"*56)
+        for rank, operation_id in enumerate(analysis['ranking'][:top_n], 1):
+            i = ids.index(operation_id)
+            print(f"  {rank:<6} {operation_id:<15} {analysis['depth'][i]:<10} {analysis['epsilon'][i]:<10.4f} "
+                  f"{analysis['epsilon_score'][i]:<10.4f}")
+
     def visualize_cost_effectiveness(self, results, save_path='document/result'):
         """
         绘制效费比与最终得分对比图
@@ -819,7 +1500,7 @@ class EffectivenessEvaluationWithPenalty:
                 writer.writerow([
                     r['operation_id'],
                     r['crash_rate'],
-                    r['crash_penalty'],
+                    r['penalty_factor'],
                     r['stage_score'],
                     r['final_score'],
                     r['avg_normalized_cost'],
@@ -948,11 +1629,11 @@ class EffectivenessEvaluationWithPenalty:
                 writer.writerow([
                     r['operation_id'],
                     round(r['crash_rate'], 2),
-                    round(r['crash_penalty'], 4),
+                    round(r['penalty_factor'], 4),
                     round(r['stage_score'], 4),
                     round(r['final_score'], 4),
                     round(r['stage_score'] - r['final_score'], 2),
-                    '是' if r['crash_penalty'] < 1.0 else '否'
+                    '是' if r['penalty_factor'] < 1.0 else '否'
                 ])
 
         print(f"[OK] CSV结果已保存至: {csv_file}")
@@ -965,8 +1646,58 @@ class EffectivenessEvaluationWithPenalty:
             print("\n数据库连接已关闭")
 
 
-def main():
+def parse_grid(text):
+    """解析网格参数：'start:stop:step'（含终点）或逗号分隔的取值列表"""
+    if ':' in text:
+        start, stop, step = (float(v) for v in text.split(':'))
+        if step <= 0:
+            raise argparse.ArgumentTypeError(f"步长必须大于0: {text}")
+        grid = np.round(np.arange(start, stop + step / 2, step), 10)
+    else:
+        grid = np.array([float(v) for v in text.split(',')])
+    if grid.size == 0:
+        raise argparse.ArgumentTypeError(f"网格为空（起点大于终点？）: {text}")
+    return grid
+
+
+def parse_args(argv=None):
+    """命令行参数：不指定 --sweep 时执行默认的效能评估"""
+    parser = argparse.ArgumentParser(description='带惩罚模型的效能评估')
+    parser.add_argument('--sweep', action='store_true', help='惩罚参数扫描模式')
+    parser.add_argument('--thresholds', type=parse_grid, default=parse_grid('50:90:5'),
+                        help="阈值 s 的网格，如 50:90:5 或 60,70,80（默认 50:90:5）")
+    parser.add_argument('--coefficients', type=parse_grid, default=parse_grid('0.5:1.0:0.05'),
+                        help="系数 m 的网格，如 0.5:1.0:0.05（默认）")
+    parser.add_argument('--field', action='append', default=None, help='参与扫描的规则指标（可重复），默认全部启用的规则')
+    parser.add_argument('--per-indicator', action='store_true', help='逐个规则指标分别扫描')
+    parser.add_argument('--top-k', type=int, default=3, help='稳定性分析的前 k 名（默认3）')
+    parser.add_argument('--no-charts', action='store_true', help='不生成热力图')
+    parser.add_argument('--pareto-categories', action='store_true',
+                        help='Pareto 分析按成本分类（人员/装备/能源/后勤/训练/基础设施）做多目标前沿')
+    args = parser.parse_args(argv)
+    if (args.thresholds <= 0).any():
+        parser.error(f"阈值 s 必须大于0: {args.thresholds[args.thresholds <= 0].tolist()}")
+    if args.top_k < 1:
+        parser.error(f"--top-k 必须至少为1: {args.top_k}")
+    return args
+
+
+def main(argv=None):
     """主函数"""
+    args = parse_args(argv)
+    if args.sweep:
+        evaluator = EffectivenessEvaluationWithPenalty()
+        try:
+            return evaluator.run_penalty_sweep(
+                args.thresholds, args.coefficients, fields=args.field, per_indicator=args.per_indicator,
+                top_k=args.top_k, visualize=not args.no_charts
+            )
+        except Error as e:
+            print(f"\n[数据库错误] {e}")
+        finally:
+            evaluator.close()
+        return
+
     print("="*80)
     print("军事通信装备效能评估 - 带崩溃比例惩罚模型")
     print("="*80)
@@ -990,9 +1721,8 @@ def main():
             print("\n[错误] 无法计算效能得分，请检查数据!")
             return
 
-        # 获取成本数据并进行max-min归一化
-        cost_data = evaluator.get_cost_evaluation()
-        normalized_costs = evaluator.normalize_cost_maxmin(cost_data)
+        # 获取成本数据（矩阵）并进行max-min归一化
+        normalized_costs = evaluator.normalize_cost_matrix(*evaluator.get_cost_matrix())
 
         # 计算效费比
         results = evaluator.calculate_cost_effectiveness(results, normalized_costs)
@@ -1000,6 +1730,9 @@ def main():
         # 显示汇总
         evaluator.display_summary(results)
 
+        # 成本-效能 Pareto 前沿（--pareto-categories 时按成本分类做多目标分析）
+        evaluator.display_pareto(evaluator.analyze_pareto(results, normalized_costs, by_category=args.pareto_categories))
+
         # 生成可视化图表
         evaluator.visualize_results(results)
         evaluator.create_detailed_chart(results)
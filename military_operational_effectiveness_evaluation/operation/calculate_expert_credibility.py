@@ -13,20 +13,38 @@
 日期：2026-03-06
 """
 
+import os
+import io
+import json
+import pickle
+import hashlib
+import argparse
+import contextlib
+
+import warnings
+
 import mysql.connector
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib import rcParams
-from matplotlib.gridspec import GridSpec
-import warnings
-warnings.filterwarnings('ignore')
 
-# 设置中文字体
-rcParams['font.sans-serif'] = ['SimHei']  # 用来正常显示中文标签
-rcParams['axes.unicode_minus'] = False  # 用来正常显示负号
+from lazy_pyplot import LazyPyplot
+
+# matplotlib 仅在生成图表时导入，并设置中文字体
+plt = LazyPyplot(['SimHei'])
 
 # ==================== 参数配置 ====================
 
+# 数据库连接配置
+DB_CONFIG = {
+    'host': 'localhost',
+    'database': 'military_operational_effectiveness_evaluation',
+    'user': 'root',
+    'password': 'root'
+}
+
+# 默认读取 / 保存的AHP批次
+DEFAULT_SOURCE_BATCH_ID = 'AHP-2026-002'
+DEFAULT_RESULT_BATCH_ID = 'AHP-2026-001'
+
 # 影响力因素权重（总和=1）
 INFLUENCE_WEIGHTS = {
     'title': 0.20,           # 职称
@@ -122,18 +140,214 @@ INDICATOR_HIERARCHY = {
 }
 
 
+# 二级指标中文名称（按 INDICATOR_HIERARCHY 中的顺序）
+SECONDARY_INDICATOR_NAMES = {
+    'security': ['密钥泄露', '被侦察概率', '抗拦截能力'],
+    'reliability': ['崩溃率', '恢复能力', '通信可用性'],
+    'transmission': ['带宽', '呼叫建立时间', '传输时延', '误码率', '吞吐量', '频谱效率'],
+    'anti_jamming': ['SINR', '抗干扰余量', '通信距离'],
+    'resource': ['功耗', '人力需求'],
+    'effect': ['毁伤率', '任务完成率', '效费比']
+}
+
+# 二级指标英文名称（键为去掉 _weight 后缀的 indicator_key）
+INDICATOR_NAME_EN_MAP = {
+    'security_key_leakage': 'Key Leakage',
+    'security_detected_probability': 'Detected Probability',
+    'security_interception_resistance': 'Interception Resistance',
+    'reliability_crash_rate': 'Crash Rate',
+    'reliability_recovery_capability': 'Recovery Capability',
+    'reliability_communication_availability': 'Communication Availability',
+    'transmission_bandwidth': 'Bandwidth',
+    'transmission_call_setup_time': 'Call Setup Time',
+    'transmission_transmission_delay': 'Transmission Delay',
+    'transmission_bit_error_rate': 'Bit Error Rate',
+    'transmission_throughput': 'Throughput',
+    'transmission_spectral_efficiency': 'Spectral Efficiency',
+    'anti_jamming_sinr': 'SINR',
+    'anti_jamming_anti_jamming_margin': 'Anti-jamming Margin',
+    'anti_jamming_communication_distance': 'Communication Distance',
+    'resource_power_consumption': 'Power Consumption',
+    'resource_manpower_requirement': 'Manpower Requirement',
+    'effect_damage_rate': 'Damage Rate',
+    'effect_mission_completion_rate': 'Mission Completion Rate',
+    'effect_cost_effectiveness': 'Cost Effectiveness'
+}
+
+
+def _build_indicator_save_info():
+    """按 AHP_WEIGHT_FIELDS 顺序生成每个指标的 (indicator_key, 类别, 中文名, 英文名)"""
+    info_list = []
+    for i, weight_field in enumerate(AHP_WEIGHT_FIELDS):
+        indicator_key = weight_field.replace('_weight', '')
+        category, indicator_name = None, None
+        for cat, info in INDICATOR_HIERARCHY.items():
+            if i in info['indices']:
+                category = cat
+                idx_in_category = info['indices'].index(i)
+                names = SECONDARY_INDICATOR_NAMES.get(cat, [])
+                indicator_name = names[idx_in_category] if idx_in_category < len(names) else info['name']
+                break
+        info_list.append((indicator_key, category, indicator_name,
+                          INDICATOR_NAME_EN_MAP.get(indicator_key, indicator_key)))
+    return info_list
+
+
+# 保存AHP权重时使用的指标信息（模块加载时构建一次）
+INDICATOR_SAVE_INFO = _build_indicator_save_info()
+
+# Bootstrap 置信区间默认参数
+BOOTSTRAP_DEFAULTS = {
+    'replicates': 10000,            # 重抽样次数
+    'confidence': 0.95,             # 置信水平（百分位区间）
+    'seed': None,                   # 随机种子（None 表示不固定）
+    'resample_experts': True,       # 对专家（行）有放回重抽样
+    'resample_indicators': True     # 对指标（列）有放回重抽样
+}
+
+# 每个分块内 重抽样数×专家数×指标数 的上限（控制三维数组内存占用）
+BOOTSTRAP_CHUNK_CELLS = 2000000
+
+
+# ==================== 结构化报告 ====================
+
+# 控制台输出级别
+REPORT_QUIET = 0     # 不输出到控制台，只生成结构化报告（批量/服务调用）
+REPORT_SUMMARY = 1   # 输出计算步骤与汇总信息
+REPORT_DETAIL = 2    # 另外输出各指标、指标对、专家明细及作战效能计算过程
+
+
+def _to_native(value):
+    """numpy 类型 → Python 原生类型（nan 转为 None），用于 JSON 序列化"""
+    if isinstance(value, dict):
+        return {str(k): _to_native(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_native(v) for v in value]
+    if isinstance(value, np.ndarray):
+        return _to_native(value.tolist())
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not np.isfinite(value):
+        return None
+    return value
+
+
+class CredibilityReport:
+    """
+    专家可信度评估的结构化报告
+
+    计算过程中的明细以记录（字典）形式按分节保存，不做字符串格式化；
+    需要时可导出为 JSON / Parquet，或调用 render() 输出到控制台。
+
+    分节：
+    - indicator_consistency: 各指标一致性（CV）
+    - outlier_removal: 删除最远值前后的CV变化
+    - judgment_outliers: 判断矩阵各指标对删除的离群比值
+    - category_ahp: 各一级指标的AHP一致性检验
+    - indicator_weights: 各二级指标的最终权重
+    - expert_credibility: 各专家的主观/客观/综合可信度
+    """
+
+    def __init__(self, verbosity=REPORT_DETAIL):
+        self.verbosity = verbosity
+        self.summary = {}
+        self.sections = {}
+
+    def add(self, section, record):
+        """向分节追加一条记录"""
+        self.sections.setdefault(section, []).append(record)
+
+    def extend(self, section, records):
+        """向分节追加多条记录"""
+        self.sections.setdefault(section, []).extend(records)
+
+    def set(self, **values):
+        """记录汇总指标"""
+        self.summary.update(values)
+
+    def to_dict(self):
+        """转换为只含 Python 原生类型的字典"""
+        return {'summary': _to_native(self.summary), 'sections': _to_native(self.sections)}
+
+    def to_json(self, path=None):
+        """序列化为 JSON 字符串；指定 path 时同时写入文件"""
+        text = json.dumps(self.to_dict(), ensure_ascii=False, indent=2)
+        if path:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(text)
+        return text
+
+    def to_parquet(self, directory):
+        """
+        每个分节写为一个 Parquet 文件（<分节>.parquet），汇总写为 summary.parquet
+
+        需要安装 pandas 与 pyarrow（或 fastparquet）
+        """
+        try:
+            import pandas as pd
+        except ImportError as e:
+            raise ImportError('导出 Parquet 需要安装 pandas 和 pyarrow') from e
+
+        os.makedirs(directory, exist_ok=True)
+        data = self.to_dict()
+        pd.DataFrame([{k: json.dumps(v, ensure_ascii=False) if isinstance(v, (dict, list)) else v
+                       for k, v in data['summary'].items()}]).to_parquet(
+            os.path.join(directory, 'summary.parquet'), index=False)
+        for section, records in data['sections'].items():
+            frame = pd.DataFrame(records)
+            for column in frame.columns:
+                if frame[column].map(lambda v: isinstance(v, (dict, list))).any():
+                    frame[column] = frame[column].map(lambda v: json.dumps(v, ensure_ascii=False))
+            frame.to_parquet(os.path.join(directory, f'{section}.parquet'), index=False)
+        return directory
+
+    def save(self, path, fmt='json'):
+        """按格式保存报告：json 写入文件 path，parquet 写入目录 path"""
+        if fmt == 'parquet':
+            return self.to_parquet(path)
+        self.to_json(path)
+        return path
+
+    def render(self):
+        """以表格形式输出到控制台（按需调用）"""
+        data = self.to_dict()
+        print("\n" + "="*100)
+        print("专家可信度评估报告")
+        print("="*100)
+        for key, value in data['summary'].items():
+            print(f"  {key}: {value}")
+        for section, records in data['sections'].items():
+            print(f"\n[{section}] {len(records)} 条")
+            if not records:
+                continue
+            columns = list(records[0].keys())
+            print("  " + " ".join(f"{c:<16}" for c in columns))
+            for record in records:
+                print("  " + " ".join(
+                    f"{record.get(c):<16.4f}" if isinstance(record.get(c), float) else f"{str(record.get(c)):<16}"
+                    for c in columns
+                ))
+
+
 class ExpertCredibilityEvaluator:
     """专家可信度评估器"""
+
+    # 控制台输出级别（REPORT_QUIET / REPORT_SUMMARY / REPORT_DETAIL）与当前结构化报告
+    verbosity = REPORT_DETAIL
+    report = None
     
-    def __init__(self):
-        """初始化数据库连接"""
-        self.connection = mysql.connector.connect(
-            host='localhost',
-            database='military_operational_effectiveness_evaluation',
-            user='root',
-            password='root'
-        )
-        self.cursor = self.connection.cursor(dictionary=True)
+    def __init__(self, connect=True, verbosity=REPORT_DETAIL):
+        """
+        初始化数据库连接
+
+        参数:
+            connect: 是否连接数据库；多批次并行计算的工作进程只做计算，不需要连接
+            verbosity: 控制台输出级别；REPORT_QUIET 时只生成结构化报告（self.report）
+        """
+        self.verbosity = verbosity
+        if connect:
+            self.connection = mysql.connector.connect(**DB_CONFIG)
+            self.cursor = self.connection.cursor(dictionary=True)
         
     def __del__(self):
         """关闭数据库连接"""
@@ -142,6 +356,16 @@ class ExpertCredibilityEvaluator:
         if hasattr(self, 'connection'):
             self.connection.close()
     
+    def _console(self, level=REPORT_SUMMARY):
+        """当前输出级别是否需要输出该级别的控制台信息"""
+        return self.verbosity >= level
+
+    def _get_report(self):
+        """当前结构化报告（不存在时创建）"""
+        if self.report is None:
+            self.report = CredibilityReport(self.verbosity)
+        return self.report
+
     def load_expert_background_data(self):
         """加载专家背景数据"""
         query = """
@@ -163,28 +387,68 @@ class ExpertCredibilityEvaluator:
         self.cursor.execute(query)
         return self.cursor.fetchall()
     
-    def load_expert_ahp_weights(self, batch_id='AHP-2026-002'):
+    def load_expert_ahp_weights(self, batch_id=DEFAULT_SOURCE_BATCH_ID):
         """
         加载专家AHP权重数据（包含权重和把握度）
         
         参数:
             batch_id: 批次ID，默认为 'AHP-2026-002'
         """
-        # 构建查询字段：每个指标都有weight和confidence两个字段
+        query = f"""
+            SELECT {', '.join(self._ahp_weight_select_fields())}
+            FROM ahp_expert_military_operation_effect_weights
+            WHERE batch_id = %s
+            ORDER BY id
+        """
+        self.cursor.execute(query, (batch_id,))
+        return self.cursor.fetchall()
+
+    @staticmethod
+    def _ahp_weight_select_fields():
+        """构建查询字段：每个指标都有weight和confidence两个字段"""
         fields = ['expert_name']
         for field in AHP_WEIGHT_FIELDS:
             fields.append(field)  # xxx_weight
             confidence_field = field.replace('_weight', '_confidence')
             fields.append(confidence_field)  # xxx_confidence
-        
+        return fields
+
+    def list_ahp_batches(self):
+        """列出AHP权重表中的全部批次ID（按批次ID排序）"""
+        self.cursor.execute("""
+            SELECT DISTINCT batch_id
+            FROM ahp_expert_military_operation_effect_weights
+            ORDER BY batch_id
+        """)
+        return [row['batch_id'] for row in self.cursor.fetchall()]
+
+    def load_expert_ahp_weights_bulk(self, batch_ids=None):
+        """
+        一次查询加载多个批次的专家AHP权重数据
+
+        参数:
+            batch_ids: 批次ID列表；为 None 时加载全部批次
+
+        返回:
+            dict: {batch_id: 该批次的专家数据列表}，批次顺序与 batch_ids 一致（全部批次时按批次ID排序）
+        """
         query = f"""
-            SELECT {', '.join(fields)}
+            SELECT batch_id, {', '.join(self._ahp_weight_select_fields())}
             FROM ahp_expert_military_operation_effect_weights
-            WHERE batch_id = %s
-            ORDER BY id
         """
-        self.cursor.execute(query, (batch_id,))
-        return self.cursor.fetchall()
+        params = ()
+        if batch_ids is not None:
+            if not batch_ids:
+                return {}
+            query += f" WHERE batch_id IN ({', '.join(['%s'] * len(batch_ids))})"
+            params = tuple(batch_ids)
+        query += " ORDER BY batch_id, id"
+        self.cursor.execute(query, params)
+
+        grouped = {batch_id: [] for batch_id in (batch_ids or [])}
+        for row in self.cursor.fetchall():
+            grouped.setdefault(row.pop('batch_id'), []).append(row)
+        return grouped
     
     def calculate_influence_score(self, expert):
         """
@@ -302,15 +566,46 @@ class ExpertCredibilityEvaluator:
         - 只使用 confidence >= threshold 的评分
         - 若某指标无任何有效评分，则该指标均值为 np.nan
         """
-        n = weight_matrix.shape[1]
-        means = np.full(n, np.nan, dtype=float)
-        for j in range(n):
-            valid = confidence_matrix[:, j] >= threshold
-            if np.any(valid):
-                means[j] = np.mean(weight_matrix[valid, j])
-        return means
+        valid = confidence_matrix >= threshold
+        counts = valid.sum(axis=0)
+        sums = np.where(valid, weight_matrix, 0.0).sum(axis=0)
+        return np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+
+    @staticmethod
+    def _masked_mean_std(weight_matrix, mask, axis=0):
+        """
+        沿专家轴（默认按列）计算掩码内评分的均值与样本标准差（ddof=1）
+
+        返回：(均值, 标准差, 有效个数)；无有效评分的列均值为 nan，不足2个的列标准差为 0
+        """
+        counts = mask.sum(axis=axis)
+        values = np.where(mask, weight_matrix, 0.0)
+        means = np.where(counts > 0, values.sum(axis=axis) / np.maximum(counts, 1), np.nan)
+        centered = weight_matrix - np.expand_dims(np.nan_to_num(means), axis)
+        sq_dev = np.where(mask, centered ** 2, 0.0).sum(axis=axis)
+        stds = np.where(counts > 1, np.sqrt(sq_dev / np.maximum(counts - 1, 1)), 0.0)
+        return means, stds, counts
+
+    @staticmethod
+    def _cv_percent(means, stds):
+        """CV(%) = 标准差 / 均值 × 100，均值非正时记为 0"""
+        safe_means = np.where(means > 0, means, 1.0)
+        return np.where(means > 0, stds / safe_means * 100, 0.0)
+
+    @staticmethod
+    def _consistency_level(cv):
+        """根据CV(%)判断一致性等级"""
+        if cv < 15:
+            return "高度一致"
+        elif cv < 25:
+            return "较为一致"
+        elif cv < 35:
+            return "轻度分歧"
+        else:
+            return "严重分歧"
     
-    def check_consistency(self, weight_matrix, confidence_matrix, expert_names, confidence_threshold=0.6, remove_farthest=True):
+    def check_consistency(self, weight_matrix, confidence_matrix, expert_names, confidence_threshold=0.6,
+                          remove_farthest=True, verbose=None):
         """
         一致性检验 - 基于变异系数（CV）方法
         
@@ -324,8 +619,14 @@ class ExpertCredibilityEvaluator:
         - 若某指标所有专家均 < 0.6，则该指标不进入后续 CV/AHP 统计（记为“无把握”）
         - 异常值处理：对每个指标（在有效评分>=3时）删除“离均值最远”的一个评分，再计算CV
 
+        实现：在完整的 m×n 权重/把握度矩阵上按列做掩码运算，一次完成全部指标的统计；
+        verbose=False 时不输出各指标一致性表格（专家规模较大或批量运行时使用）；
+        默认按评估器的输出级别（REPORT_DETAIL 时输出）
+
         返回：(一致性指标, 各指标CV, 各指标详情, 各专家向量离散度, 一致性等级, 是否通过, 异常值删除分析, 有效指标掩码)
         """
+        if verbose is None:
+            verbose = self._console(REPORT_DETAIL)
         m = weight_matrix.shape[0]  # 专家数量
         n = weight_matrix.shape[1]  # 指标数量
         
@@ -340,20 +641,34 @@ class ExpertCredibilityEvaluator:
         ]
         
         # 【步骤1】计算每个指标的变异系数（CV）（把握度过滤 + 删除最远异常值）
+        # 仅使用把握度>=阈值的评分；至少存在1条有效评分才算“有效指标”
+        valid_mask = confidence_matrix >= confidence_threshold
+        mean_before, std_before, n_valid = self._masked_mean_std(weight_matrix, valid_mask)
+        active_indicator_mask = n_valid > 0
+        cv_before = np.where(n_valid >= 2, self._cv_percent(mean_before, std_before), np.nan)
+        
+        # 异常值删除：每列删除离均值最远的一条有效评分（需要至少3条有效评分）
+        distances = np.where(valid_mask, np.abs(weight_matrix - np.nan_to_num(mean_before)), -np.inf)
+        farthest_rows = np.argmax(distances, axis=0)
+        remove_cols = (n_valid >= 3) if remove_farthest else np.zeros(n, dtype=bool)
+        filtered_mask = valid_mask.copy()
+        filtered_mask[farthest_rows[remove_cols], np.where(remove_cols)[0]] = False
+        
+        # 重新计算（删除后）均值/标准差/CV
+        means, stds, _ = self._masked_mean_std(weight_matrix, filtered_mask)
+        cvs = self._cv_percent(means, stds)
+        
         indicator_cvs = []
         indicator_details = []
-        active_indicator_mask = np.zeros(n, dtype=bool)  # 至少存在1条把握度>=阈值的评分才算“有效指标”
-        
-        print("\n  [各指标一致性分析]")
-        print(f"  {'指标':<20} {'平均值':<10} {'标准差':<10} {'CV(%)':<10} {'一致性':<15}")
-        print("  " + "-"*80)
-        
         outlier_removed_analysis = []
+        
+        if verbose:
+            print("\n  [各指标一致性分析]")
+            print(f"  {'指标':<20} {'平均值':<10} {'标准差':<10} {'CV(%)':<10} {'一致性':<15}")
+            print("  " + "-"*80)
 
         for j in range(n):
-            # 仅使用把握度>=阈值的评分
-            valid_idx = np.where(confidence_matrix[:, j] >= confidence_threshold)[0]
-            if len(valid_idx) == 0:
+            if not active_indicator_mask[j]:
                 # 全部无把握：不纳入CV统计
                 indicator_cvs.append(np.nan)
                 indicator_details.append({
@@ -364,47 +679,15 @@ class ExpertCredibilityEvaluator:
                     'level': '无把握(全<阈值)',
                     'n_valid': 0
                 })
-                print(f"  {indicator_names[j]:<20} {'-':<10} {'-':<10} {'-':<10} {'无把握(全<阈值)':<15}")
+                if verbose:
+                    print(f"  {indicator_names[j]:<20} {'-':<10} {'-':<10} {'-':<10} {'无把握(全<阈值)':<15}")
                 continue
 
-            active_indicator_mask[j] = True
-            indicator_values = weight_matrix[valid_idx, j]
-
-            # 异常值删除：删除离均值最远的一条评分（需要至少3条有效评分）
-            removed_expert = None
-            removed_value = None
-            cv_before = np.nan
-            if len(indicator_values) >= 2:
-                mean_before = np.mean(indicator_values)
-                std_before = np.std(indicator_values, ddof=1)
-                cv_before = (std_before / mean_before) * 100 if mean_before > 0 else 0.0
-            else:
-                mean_before = np.mean(indicator_values)
-                std_before = 0.0
-
-            filtered_values = indicator_values
-            if remove_farthest and len(indicator_values) >= 3:
-                distances = np.abs(indicator_values - mean_before)
-                farthest_local_idx = int(np.argmax(distances))
-                farthest_global_idx = int(valid_idx[farthest_local_idx])
-                removed_expert = expert_names[farthest_global_idx]
-                removed_value = float(indicator_values[farthest_local_idx])
-                filtered_values = np.delete(indicator_values, farthest_local_idx)
-
-            # 重新计算（删除后）均值/标准差/CV
-            mean_val = float(np.mean(filtered_values))
-            std_val = float(np.std(filtered_values, ddof=1)) if len(filtered_values) > 1 else 0.0
-            cv = (std_val / mean_val) * 100 if mean_val > 0 else 0.0
-            
-            # 判断该指标的一致性
-            if cv < 15:
-                consistency_level = "高度一致"
-            elif cv < 25:
-                consistency_level = "较为一致"
-            elif cv < 35:
-                consistency_level = "轻度分歧"
-            else:
-                consistency_level = "严重分歧"
+            mean_val = float(means[j])
+            std_val = float(stds[j])
+            cv = float(cvs[j])
+            consistency_level = self._consistency_level(cv)
+            removed_expert = expert_names[farthest_rows[j]] if remove_cols[j] else None
             
             indicator_cvs.append(cv)
             indicator_details.append({
@@ -413,74 +696,53 @@ class ExpertCredibilityEvaluator:
                 'std': std_val,
                 'cv': cv,
                 'level': consistency_level,
-                'n_valid': int(len(valid_idx)),
+                'n_valid': int(n_valid[j]),
                 'removed_expert': removed_expert
             })
             
-            print(f"  {indicator_names[j]:<20} {mean_val:<10.2f} {std_val:<10.2f} {cv:<10.1f} {consistency_level:<15}")
+            if verbose:
+                print(f"  {indicator_names[j]:<20} {mean_val:<10.2f} {std_val:<10.2f} {cv:<10.1f} {consistency_level:<15}")
 
-            if removed_expert is not None and len(filtered_values) > 1:
+            if removed_expert is not None and n_valid[j] - 1 > 1:
                 # 记录删除最远值前后CV变化（用于图表/审计）
                 outlier_removed_analysis.append({
                     'indicator': indicator_names[j],
-                    'cv_before': float(cv_before),
-                    'cv_after': float(cv),
-                    'change': float(cv - cv_before),
+                    'cv_before': float(cv_before[j]),
+                    'cv_after': cv,
+                    'change': float(cv - cv_before[j]),
                     'removed_expert': removed_expert,
-                    'removed_value': removed_value,
+                    'removed_value': float(weight_matrix[farthest_rows[j], j]),
                     'note': f'仅使用把握度≥{confidence_threshold}，并删除最远值'
                 })
         
         # 【步骤2】计算整体一致性指标（仅对“有效指标”的CV求平均；无把握指标不计入）
-        valid_cvs = [x for x in indicator_cvs if not np.isnan(x)]
-        avg_cv = float(np.mean(valid_cvs)) if valid_cvs else np.nan
+        avg_cv = float(np.mean(cvs[active_indicator_mask])) if active_indicator_mask.any() else np.nan
         
-        print(f"\n  平均变异系数: {avg_cv:.2f}%")
+        if verbose:
+            print(f"\n  平均变异系数: {avg_cv:.2f}%")
         
         # 【步骤3】判断整体一致性等级
-        if avg_cv < 15:
-            level = "高度一致"
-            passed = True
-        elif avg_cv < 25:
-            level = "较为一致"
-            passed = True
-        elif avg_cv < 35:
-            level = "轻度分歧"
-            passed = False
-        else:
-            level = "严重分歧"
-            passed = False
+        level = self._consistency_level(avg_cv)
+        passed = level in ("高度一致", "较为一致")
         
         # 删除最远值的分析数据已在步骤1中生成，这里仅补充说明
-        print(f"\n  [异常值处理说明]")
-        print(f"  已按“每个指标删除离均值最远的1个有效评分(把握度≥{confidence_threshold})”进行CV统计。")
-        if not outlier_removed_analysis:
-            print(f"  当前有效指标样本不足(或无需删除)，未生成异常值删除记录。")
+        if verbose:
+            print(f"\n  [异常值处理说明]")
+            print(f"  已按“每个指标删除离均值最远的1个有效评分(把握度≥{confidence_threshold})”进行CV统计。")
+            if not outlier_removed_analysis:
+                print(f"  当前有效指标样本不足(或无需删除)，未生成异常值删除记录。")
         
         # 【步骤4】计算每位专家的离散度（用于后续客观可信度计算）
+        # 分子：√(Σ(ωⁱⱼ - ω̄ⱼ)²)；分母：√(Σ(ωⱼⁱ)² + Σ(ω̄ⱼ)²)
         avg_weights = np.mean(weight_matrix, axis=0)
-        dispersions = []
-        
-        for i in range(m):
-            expert_weights = weight_matrix[i]
-            
-            # 分子：√(Σ(ωⁱⱼ - ω̄ⱼ)²)
-            numerator = np.sqrt(np.sum((expert_weights - avg_weights) ** 2))
-            
-            # 分母：√(Σ(ωⱼⁱ)² + Σ(ω̄ⱼ)²)
-            denominator = np.sqrt(np.sum(expert_weights ** 2) + np.sum(avg_weights ** 2))
-            
-            # 计算离散度
-            if denominator == 0:
-                dispersion = 0
-            else:
-                dispersion = numerator / denominator
-            
-            dispersions.append(dispersion)
+        numerators = np.sqrt(np.sum((weight_matrix - avg_weights) ** 2, axis=1))
+        denominators = np.sqrt(np.sum(weight_matrix ** 2, axis=1) + np.sum(avg_weights ** 2))
+        safe_denominators = np.where(denominators == 0, 1.0, denominators)
+        dispersions = np.where(denominators == 0, 0.0, numerators / safe_denominators).tolist()
         
         return avg_cv, indicator_cvs, indicator_details, dispersions, level, passed, outlier_removed_analysis, active_indicator_mask
     
-    def calculate_objective_credibility(self, experts_ahp):
+    def calculate_objective_credibility(self, experts_ahp, bootstrap=None):
         """
         计算所有专家的客观可信度 βi（方案A：绝对得分）
         
@@ -494,33 +756,45 @@ class ExpertCredibilityEvaluator:
         - βi 是绝对得分，范围 0-1
         - 不强制归一化（Σβi ≠ 1）
         - 反映专家评分的绝对一致性水平
+
+        参数:
+            bootstrap: Bootstrap 参数字典（见 BOOTSTRAP_DEFAULTS），为 None 时不计算置信区间；
+                       计算时每位专家结果增加 objective_credibility_ci，
+                       一致性检验结果增加 bootstrap（判定稳定性、平均CV区间等）
         """
         # 提取权重矩阵与把握度矩阵
         weight_matrix, expert_names = self.extract_weight_vectors(experts_ahp)
         confidence_matrix = self.extract_confidence_matrix(experts_ahp)
         
         # 【步骤1】一致性检验
-        print("\n  [一致性检验 - 基于变异系数CV]")
+        if self._console():
+            print("\n  [一致性检验 - 基于变异系数CV]")
         avg_cv, indicator_cvs, indicator_details, old_dispersions, level, passed, outlier_removed_analysis, active_indicator_mask = self.check_consistency(
             weight_matrix, confidence_matrix, expert_names, confidence_threshold=0.6, remove_farthest=True
         )
+
+        report = self._get_report()
+        report.extend('indicator_consistency', indicator_details)
+        report.extend('outlier_removal', outlier_removed_analysis)
+        report.set(avg_cv=avg_cv, consistency_level=level, consistency_passed=passed)
         
-        print(f"\n  整体一致性指标（平均CV）= {avg_cv:.2f}%")
-        print(f"  一致性等级: {level}")
-        
-        if not passed:
-            print(f"  [警告] 一致性检验未通过！")
-            print(f"  建议：组织专家进行二轮评分")
-            
-            # 找出CV最高的指标（分歧最大的指标）
-            indicator_cv_pairs = [(detail['name'], detail['cv']) for detail in indicator_details]
-            indicator_cv_pairs.sort(key=lambda x: x[1], reverse=True)
+        if self._console():
+            print(f"\n  整体一致性指标（平均CV）= {avg_cv:.2f}%")
+            print(f"  一致性等级: {level}")
             
-            print(f"\n  分歧最大的5个指标：")
-            for name, cv in indicator_cv_pairs[:5]:
-                print(f"    - {name}: CV = {cv:.1f}%")
-        else:
-            print(f"  [OK] 一致性检验通过")
+            if not passed:
+                print(f"  [警告] 一致性检验未通过！")
+                print(f"  建议：组织专家进行二轮评分")
+                
+                # 找出CV最高的指标（分歧最大的指标）
+                indicator_cv_pairs = [(detail['name'], detail['cv']) for detail in indicator_details]
+                indicator_cv_pairs.sort(key=lambda x: x[1], reverse=True)
+                
+                print(f"\n  分歧最大的5个指标：")
+                for name, cv in indicator_cv_pairs[:5]:
+                    print(f"    - {name}: CV = {cv:.1f}%")
+            else:
+                print(f"  [OK] 一致性检验通过")
         
         # 【步骤2】计算每个专家的离散度（CV%）
         # 口径：仅使用把握度>=阈值且“有效指标”的评分；专家CV = std(偏差) / overall_mean × 100%
@@ -559,25 +833,7 @@ class ExpertCredibilityEvaluator:
         # - 25% < CV ≤ 35%: 轻度分歧 → β快速衰减 0.7→0.0
         # - CV > 35%: 严重分歧 → β = 0.0 (失去意义)
         
-        consistency_scores = []
-        for cv in expert_dispersions:
-            if np.isnan(cv):
-                consistency_scores.append(0.0)
-                continue
-            if cv <= 15:
-                # 高度一致
-                beta = 1.0
-            elif cv <= 25:
-                # 较为一致：从1.0线性衰减到0.5（增加衰减速度，提升区分度）
-                beta = 1.0 - (cv - 15) / 10 * 0.5
-            elif cv <= 35:
-                # 轻度分歧：从0.5快速衰减到0.0
-                beta = 0.5 - (cv - 25) / 10 * 0.5
-            else:
-                # 严重分歧：完全不可信
-                beta = 0.0
-            
-            consistency_scores.append(beta)
+        consistency_scores = self._beta_from_cv(expert_dispersions).tolist()
         
         # 【步骤4】βi = consistency_score（分段衰减后的得分）
         results = []
@@ -588,6 +844,15 @@ class ExpertCredibilityEvaluator:
                 'consistency_score': consistency_scores[i],
                 'objective_credibility': consistency_scores[i]  # βi保持绝对得分
             })
+
+        # 【步骤5】可选：Bootstrap 置信区间
+        bootstrap_summary = None
+        if bootstrap is not None:
+            bootstrap_summary = self.bootstrap_objective_credibility(
+                weight_matrix, confidence_matrix, passed, bootstrap
+            )
+            for i, result in enumerate(results):
+                result['objective_credibility_ci'] = tuple(float(v) for v in bootstrap_summary['beta_ci'][i])
         
         # 保存一致性检验结果
         consistency_result = {
@@ -602,8 +867,147 @@ class ExpertCredibilityEvaluator:
             'confidence_threshold': 0.6,
             'confidence_matrix': confidence_matrix
         }
+        if bootstrap_summary is not None:
+            consistency_result['bootstrap'] = bootstrap_summary
         
         return results, weight_matrix, np.mean(weight_matrix, axis=0), consistency_result
+
+    @staticmethod
+    def _beta_from_cv(cvs):
+        """
+        专家离散度CV(%) → 客观可信度β（分段衰减，35%阈值）
+
+        - CV ≤ 15%: 高度一致 → β = 1.0
+        - 15% < CV ≤ 25%: 较为一致 → β从1.0线性衰减到0.5（增加衰减速度，提升区分度）
+        - 25% < CV ≤ 35%: 轻度分歧 → β从0.5快速衰减到0.0
+        - CV > 35%: 严重分歧 → β = 0.0（失去意义）；CV为nan（有效指标不足）同样记为0
+        """
+        cvs = np.asarray(cvs, dtype=float)
+        return np.select(
+            [np.isnan(cvs), cvs <= 15, cvs <= 25, cvs <= 35],
+            [0.0, 1.0, 1.0 - (cvs - 15) / 10 * 0.5, 0.5 - (cvs - 25) / 10 * 0.5],
+            default=0.0
+        )
+
+    def _bootstrap_chunk(self, weight_matrix, confidence_matrix, rows, cols, threshold):
+        """
+        计算一组重抽样的β与一致性判定（三维批量运算）
+
+        参数:
+            rows: (B, m) 每次重抽样的专家索引；cols: (B, n) 每次重抽样的指标索引
+
+        返回:
+            (β: B×m（对应原始专家）, 平均CV: B)
+        """
+        m = weight_matrix.shape[0]
+
+        # 重抽样后的专家组：B×m×n
+        panel_w = weight_matrix[rows[:, :, None], cols[:, None, :]]
+        panel_valid = confidence_matrix[rows[:, :, None], cols[:, None, :]] >= threshold
+
+        # 各指标均值（把握度过滤）与整体均值
+        means, stds, counts = self._masked_mean_std(panel_w, panel_valid, axis=1)
+        active = counts > 0
+        n_scores = panel_valid.sum(axis=(1, 2))
+        overall_mean = np.where(
+            n_scores > 0,
+            np.where(panel_valid, panel_w, 0.0).sum(axis=(1, 2)) / np.maximum(n_scores, 1),
+            panel_w.mean(axis=(1, 2))
+        )
+
+        # 原始专家在重抽样指标上的离散度CV与β
+        expert_w = weight_matrix[:, cols].transpose(1, 0, 2)
+        expert_valid = (confidence_matrix[:, cols].transpose(1, 0, 2) >= threshold) & active[:, None, :]
+        deviations = expert_w - np.nan_to_num(means)[:, None, :]
+        _, dev_stds, dev_counts = self._masked_mean_std(deviations, expert_valid, axis=2)
+        safe_overall = np.where(overall_mean > 0, overall_mean, 1.0)[:, None]
+        cvs = np.where(overall_mean[:, None] > 0, dev_stds / safe_overall * 100, 0.0)
+        betas = self._beta_from_cv(np.where(dev_counts < 2, np.nan, cvs))
+
+        # 一致性检验：每个指标删除离均值最远的1个有效评分（有效评分≥3时）后计算CV
+        distances = np.where(panel_valid, np.abs(panel_w - np.nan_to_num(means)[:, None, :]), -np.inf)
+        farthest = np.argmax(distances, axis=1)
+        removed = (np.arange(m)[None, :, None] == farthest[:, None, :]) & (counts >= 3)[:, None, :]
+        means_f, stds_f, _ = self._masked_mean_std(panel_w, panel_valid & ~removed, axis=1)
+        indicator_cvs = np.where(active, self._cv_percent(means_f, stds_f), 0.0)
+        n_active = active.sum(axis=1)
+        avg_cvs = np.where(n_active > 0, indicator_cvs.sum(axis=1) / np.maximum(n_active, 1), np.nan)
+
+        return betas, avg_cvs
+
+    def bootstrap_objective_credibility(self, weight_matrix, confidence_matrix, base_passed, options=None,
+                                        threshold=0.6):
+        """
+        Bootstrap 估计客观可信度β的百分位置信区间及一致性判定的稳定性
+
+        - 对专家（行）和/或指标（列）有放回重抽样，原始专家的β相对每个重抽样专家组重新计算
+        - 重抽样按分块组织为 B×m×n 三维数组批量计算，不逐个专家循环
+        - 使用 seed 初始化随机数生成器，结果可复现
+
+        返回:
+            dict: replicates, confidence, seed, beta_mean, beta_ci, avg_cv_ci,
+                  passed_rate, verdict_stability, level_distribution
+        """
+        opts = dict(BOOTSTRAP_DEFAULTS)
+        opts.update(options or {})
+        replicates = int(opts['replicates'])
+        confidence = float(opts['confidence'])
+        if replicates < 1:
+            raise ValueError('replicates 必须为正整数')
+        if not 0 < confidence < 1:
+            raise ValueError('confidence 必须在 (0, 1) 之间')
+
+        m, n = weight_matrix.shape
+        rng = np.random.default_rng(opts['seed'])
+        chunk = max(1, BOOTSTRAP_CHUNK_CELLS // (m * n))
+
+        betas = np.empty((replicates, m))
+        avg_cvs = np.empty(replicates)
+        for start in range(0, replicates, chunk):
+            size = min(chunk, replicates - start)
+            if opts['resample_experts']:
+                rows = rng.integers(0, m, size=(size, m))
+            else:
+                rows = np.broadcast_to(np.arange(m), (size, m))
+            if opts['resample_indicators']:
+                cols = rng.integers(0, n, size=(size, n))
+            else:
+                cols = np.broadcast_to(np.arange(n), (size, n))
+            betas[start:start + size], avg_cvs[start:start + size] = self._bootstrap_chunk(
+                weight_matrix, confidence_matrix, rows, cols, threshold
+            )
+
+        alpha = (1 - confidence) / 2 * 100
+        beta_ci = np.percentile(betas, [alpha, 100 - alpha], axis=0).T
+        finite_cvs = avg_cvs[np.isfinite(avg_cvs)]
+        avg_cv_ci = (np.percentile(finite_cvs, [alpha, 100 - alpha]).tolist()
+                     if finite_cvs.size > 0 else [np.nan, np.nan])
+
+        # 一致性判定稳定性：与原始判定（通过/未通过）一致的重抽样比例
+        passed = avg_cvs < 25
+        levels = ["高度一致", "较为一致", "轻度分歧", "严重分歧"]
+        level_counts = np.bincount(np.digitize(np.nan_to_num(avg_cvs, nan=np.inf), [15, 25, 35]), minlength=4)
+
+        summary = {
+            'replicates': replicates,
+            'confidence': confidence,
+            'seed': opts['seed'],
+            'beta_mean': betas.mean(axis=0),
+            'beta_ci': beta_ci,
+            'avg_cv_ci': avg_cv_ci,
+            'passed_rate': float(passed.mean()),
+            'verdict_stability': float(np.mean(passed == bool(base_passed))),
+            'level_distribution': {level: float(count / replicates) for level, count in zip(levels, level_counts)}
+        }
+
+        self._get_report().set(bootstrap={
+            k: v for k, v in summary.items() if k not in ('beta_mean', 'beta_ci')
+        })
+        if self._console():
+            print(f"\n  [Bootstrap] 重抽样 {replicates} 次，{confidence:.0%} 百分位区间")
+            print(f"  平均CV区间: [{avg_cv_ci[0]:.2f}%, {avg_cv_ci[1]:.2f}%]")
+            print(f"  一致性判定稳定性: {summary['verdict_stability']:.1%}（通过比例 {summary['passed_rate']:.1%}）")
+        return summary
     
     def calculate_comprehensive_credibility(self, subjective_results, objective_results):
         """
@@ -629,7 +1033,7 @@ class ExpertCredibilityEvaluator:
                 COMPREHENSIVE_WEIGHT['objective'] * obj['objective_credibility']
             )
             
-            comprehensive_results.append({
+            result = {
                 'expert_name': subj['expert_name'],
                 'subjective_credibility': subj['subjective_credibility'],
                 'objective_credibility': obj['objective_credibility'],
@@ -639,7 +1043,18 @@ class ExpertCredibilityEvaluator:
                 'subjective_total_score': subj['subjective_total_score'],
                 'consistency_score': obj['consistency_score'],
                 'dispersion': obj['dispersion']
-            })
+            }
+
+            # β的Bootstrap区间：α为常数，综合可信度区间由β区间线性变换得到
+            if 'objective_credibility_ci' in obj:
+                result['objective_credibility_ci'] = obj['objective_credibility_ci']
+                result['comprehensive_credibility_ci'] = tuple(
+                    COMPREHENSIVE_WEIGHT['subjective'] * subj['subjective_credibility'] +
+                    COMPREHENSIVE_WEIGHT['objective'] * bound
+                    for bound in obj['objective_credibility_ci']
+                )
+
+            comprehensive_results.append(result)
         
         return comprehensive_results
     
@@ -696,13 +1111,73 @@ class ExpertCredibilityEvaluator:
         19: 'maintenance_feedback_equipment_feedback_ql', # 效费比
     }
 
+    # 熵权法实际需要的设备评分字段（去重，多个指标共用同一字段时只计算一次）
+    EQUIPMENT_ENTROPY_FIELDS = sorted(set(INDICATOR_TO_EQUIPMENT_FIELD.values()))
+
     def load_equipment_scores(self):
-        """加载设备操作评分数据（用于熵权法）"""
-        query = """
-            SELECT * FROM equipment_operation_score ORDER BY id
         """
-        self.cursor.execute(query)
-        return self.cursor.fetchall()
+        加载设备操作评分数据（用于熵权法）
+
+        只查询熵权法用到的字段，返回按列存储的 记录数×字段数 数组（列顺序同 EQUIPMENT_ENTROPY_FIELDS，空值为 nan）
+        """
+        query = f"""
+            SELECT {', '.join(self.EQUIPMENT_ENTROPY_FIELDS)} FROM equipment_operation_score ORDER BY id
+        """
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(query)
+            rows = cursor.fetchall()
+        finally:
+            cursor.close()
+        return self._equipment_score_matrix(rows)
+
+    def _equipment_score_matrix(self, equipment_scores, fields=None):
+        """
+        将设备评分数据转换为按列存储的 记录数×字段数 浮点数组（空值为 nan）
+
+        参数:
+            equipment_scores: load_equipment_scores 返回的数组、元组行列表或字典行列表
+            fields: 需要的字段，默认 EQUIPMENT_ENTROPY_FIELDS
+        """
+        fields = self.EQUIPMENT_ENTROPY_FIELDS if fields is None else fields
+        if isinstance(equipment_scores, np.ndarray):
+            if fields is self.EQUIPMENT_ENTROPY_FIELDS:
+                return equipment_scores
+            positions = [self.EQUIPMENT_ENTROPY_FIELDS.index(field) for field in fields]
+            return equipment_scores[:, positions]
+
+        if equipment_scores and isinstance(equipment_scores[0], dict):
+            rows = [[record.get(field) for field in fields] for record in equipment_scores]
+        else:
+            rows = equipment_scores
+        matrix = np.array(
+            [[np.nan if value is None else float(value) for value in row] for row in rows],
+            dtype=float
+        ).reshape(len(rows), len(fields))
+        return np.asfortranarray(matrix)
+
+    @staticmethod
+    def _column_entropies(matrix):
+        """
+        按列计算熵值（效益型min-max归一化，忽略 nan）
+
+        有效值少于2个或全部相等的列熵记为1.0（最大，权重最小）
+        """
+        valid = ~np.isnan(matrix)
+        counts = valid.sum(axis=0)
+        min_vals = np.where(valid, matrix, np.inf).min(axis=0, initial=np.inf)
+        max_vals = np.where(valid, matrix, -np.inf).max(axis=0, initial=-np.inf)
+        usable = (counts >= 2) & (max_vals > min_vals)
+
+        ranges = np.where(usable, max_vals - min_vals, 1.0)
+        normalized = (matrix - np.where(usable, min_vals, 0.0)) / ranges
+        normalized = np.where(normalized == 0, 1e-10, normalized)
+        normalized = np.where(valid & usable, normalized, 0.0)
+
+        p = normalized / np.where(usable, normalized.sum(axis=0), 1.0)
+        plogp = np.where(p > 0, p * np.log(np.where(p > 0, p, 1.0)), 0.0)
+        entropies = -plogp.sum(axis=0) / np.log(np.where(usable, counts, 2))
+        return np.where(usable, entropies, 1.0)
 
     def calculate_entropy_weight(self, equipment_scores, indicator_index):
         """
@@ -721,16 +1196,12 @@ class ExpertCredibilityEvaluator:
             return 0.0
 
         # 提取该字段的所有评分
-        scores = []
-        for record in equipment_scores:
-            if field_name in record and record[field_name] is not None:
-                scores.append(float(record[field_name]))
+        scores = self._equipment_score_matrix(equipment_scores, [field_name])[:, 0]
+        scores = scores[~np.isnan(scores)]
 
         if len(scores) < 2:
             return 0.0
 
-        scores = np.array(scores)
-
         # 归一化处理（效益型指标：越大越好）
         min_val = scores.min()
         max_val = scores.max()
@@ -768,40 +1239,17 @@ class ExpertCredibilityEvaluator:
             entropy_weights: 20个指标的熵权数组
         """
         n_indicators = 20
-        entropy_weights = np.zeros(n_indicators)
-
-        # 计算每个指标的熵
-        entropies = []
-        for idx in range(n_indicators):
-            field_name = self.INDICATOR_TO_EQUIPMENT_FIELD.get(idx)
-            if not field_name:
-                entropies.append(1.0)  # 无映射，熵设为最大（权重最小）
-                continue
-
-            scores = []
-            for record in equipment_scores:
-                if field_name in record and record[field_name] is not None:
-                    scores.append(float(record[field_name]))
-
-            if len(scores) < 2:
-                entropies.append(1.0)
-                continue
-
-            scores = np.array(scores)
-            min_val, max_val = scores.min(), scores.max()
-
-            if max_val == min_val:
-                entropies.append(1.0)
-                continue
-
-            normalized = (scores - min_val) / (max_val - min_val)
-            normalized = np.where(normalized == 0, 1e-10, normalized)
 
-            p = normalized / normalized.sum()
-            entropy = -np.sum(p * np.log(p)) / np.log(len(p))
-            entropies.append(entropy)
+        # 没有任何设备评分记录时不能称为熵权法，交由调用方走等权备用方案并记录原因
+        score_matrix = self._equipment_score_matrix(equipment_scores)
+        if score_matrix.shape[0] == 0:
+            raise ValueError("设备评分数据为空，无法计算熵权")
 
-        entropies = np.array(entropies)
+        # 每个去重后的字段只计算一次熵，再按映射分配给各指标；无映射的指标熵设为最大（权重最小）
+        field_entropies = self._column_entropies(score_matrix)
+        entropies = np.ones(n_indicators)
+        for idx, field_name in self.INDICATOR_TO_EQUIPMENT_FIELD.items():
+            entropies[idx] = field_entropies[self.EQUIPMENT_ENTROPY_FIELDS.index(field_name)]
 
         # 计算权重：w = (1 - E) / sum(1 - E)
         diversities = 1 - entropies
@@ -894,64 +1342,56 @@ class ExpertCredibilityEvaluator:
         # 提取相关指标的权重和把握度
         sub_weights = weight_matrix[:, indicator_indices]
         sub_confidence = confidence_matrix[:, indicator_indices]
+        confident = sub_confidence >= confidence_threshold
 
         # 检查是否传入了可信度参数，用于计算调整因子
         use_adjustment = (subjective_credibility is not None and objective_credibility is not None)
 
         if use_adjustment:
             # 计算调整因子 q_ij = 0.5*(alpha+beta) + 0.5*conf (按README.md方案)
-            # = 0.5 * 专家综合可信度 + 0.5 * 当前指标把握度
-            adjustment_matrix = np.zeros((m, n))
-            for i in range(m):
-                # 专家综合可信度 = 0.6*α + 0.4*β
-                expert_comprehensive = 0.6 * subjective_credibility[i] + 0.4 * objective_credibility[i]
-                for j in range(n):
-                    if sub_confidence[i, j] >= confidence_threshold:
-                        adjustment_matrix[i, j] = (
-                            0.5 * expert_comprehensive +
-                            0.5 * sub_confidence[i, j]
-                        )
+            # = 0.5 * 专家综合可信度 + 0.5 * 当前指标把握度（无把握的评分记为0）
+            # 专家综合可信度 = 0.6*α + 0.4*β
+            expert_comprehensive = (0.6 * np.asarray(subjective_credibility, dtype=float) +
+                                    0.4 * np.asarray(objective_credibility, dtype=float))
+            adjustment_matrix = np.where(
+                confident, 0.5 * expert_comprehensive[:, None] + 0.5 * sub_confidence, 0.0
+            )
             weighted_scores = sub_weights * adjustment_matrix
         else:
             weighted_scores = sub_weights
 
         # 构建判断矩阵：使用几何平均法（逐对过滤把握度）+ 离群值删除
-        judgment_matrix = np.ones((n, n))
-        pair_counts = np.zeros((n, n), dtype=int)
-
-        for i in range(n):
-            for j in range(n):
-                if i != j:
-                    mask = (sub_confidence[:, i] >= confidence_threshold) & (sub_confidence[:, j] >= confidence_threshold)
-                    pair_counts[i, j] = int(np.sum(mask))
-                    if pair_counts[i, j] == 0:
-                        judgment_matrix[i, j] = 1.0
-                        continue
-
-                    # 使用加权评分计算比值
-                    if use_adjustment:
-                        ratios = weighted_scores[mask, i] / weighted_scores[mask, j]
-                    else:
-                        ratios = sub_weights[mask, i] / sub_weights[mask, j]
-                    ratios = ratios[(ratios > 0) & np.isfinite(ratios)]
-
-                    if ratios.size > 0:
-                        # 【新增】离群值删除：删除离平均值最远的1个值（如果有≥3个样本）
-                        if ratios.size >= 3:
-                            mean_ratio = np.mean(ratios)
-                            distances = np.abs(ratios - mean_ratio)
-                            # 删除离均值最远的点
-                            outlier_idx = np.argmax(distances)
-                            outlier_val = ratios[outlier_idx]  # 保存删除前的值
-                            ratios = np.delete(ratios, outlier_idx)
-                            print(f"      [离群值删除] 指标对({i},{j}): 删除离均值最远值 {outlier_val:.4f}", end="")
-
-                        if ratios.size > 0:
-                            judgment_matrix[i, j] = float(np.exp(np.mean(np.log(ratios + 1e-10))))
-                        else:
-                            judgment_matrix[i, j] = 1.0
-                    else:
-                        judgment_matrix[i, j] = 1.0
+        # 在 m×n×n 的比值张量上一次完成所有指标对：ratios[k, i, j] = 专家k的 score_i / score_j
+        # 注：离群值按算术均值距离删除，对 (i,j) 与 (j,i) 不对称，因此两个方向分别统计
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratios = weighted_scores[:, :, None] / weighted_scores[:, None, :]
+        pair_mask = confident[:, :, None] & confident[:, None, :]
+        pair_mask[:, np.arange(n), np.arange(n)] = False
+        valid = pair_mask & (ratios > 0) & np.isfinite(ratios)
+        safe_ratios = np.where(valid, ratios, 1.0)
+
+        # 【新增】离群值删除：每个指标对删除离平均值最远的1个值（如果有≥3个样本）
+        counts = valid.sum(axis=0)
+        mean_ratios = np.where(valid, safe_ratios, 0.0).sum(axis=0) / np.maximum(counts, 1)
+        distances = np.where(valid, np.abs(safe_ratios - mean_ratios), -np.inf)
+        outlier_rows = np.argmax(distances, axis=0)
+        outlier_i, outlier_j = np.nonzero(counts >= 3)
+        valid[outlier_rows[outlier_i, outlier_j], outlier_i, outlier_j] = False
+        outlier_values = safe_ratios[outlier_rows[outlier_i, outlier_j], outlier_i, outlier_j]
+        self._get_report().extend('judgment_outliers', [
+            {'indicator_i': AHP_WEIGHT_FIELDS[indicator_indices[i]].replace('_weight', ''),
+             'indicator_j': AHP_WEIGHT_FIELDS[indicator_indices[j]].replace('_weight', ''),
+             'removed_ratio': value}
+            for i, j, value in zip(outlier_i.tolist(), outlier_j.tolist(), outlier_values.tolist())
+        ])
+        if self._console(REPORT_DETAIL):
+            for i, j, outlier_val in zip(outlier_i, outlier_j, outlier_values):
+                print(f"      [离群值删除] 指标对({i},{j}): 删除离均值最远值 {outlier_val:.4f}", end="")
+
+        # 几何平均（对数均值），无有效比值的指标对记为1
+        kept = valid.sum(axis=0)
+        log_sums = np.where(valid, np.log(safe_ratios + 1e-10), 0.0).sum(axis=0)
+        judgment_matrix = np.where(kept > 0, np.exp(log_sums / np.maximum(kept, 1)), 1.0)
 
         # 限制判断矩阵的元素范围在1-9之间
         judgment_matrix = np.clip(judgment_matrix, 1/9, 9)
@@ -960,7 +1400,7 @@ class ExpertCredibilityEvaluator:
         valid_experts_count = int(np.sum(np.any(sub_confidence >= confidence_threshold, axis=1)))
         return judgment_matrix, valid_experts_count
 
-    def calculate_corrected_weights(self, comprehensive_results, weight_matrix, experts_ahp):
+    def calculate_corrected_weights(self, comprehensive_results, weight_matrix, experts_ahp, equipment_scores=None):
         """
         根据把握度和AHP一致性检验计算权重（新方案）
 
@@ -978,11 +1418,13 @@ class ExpertCredibilityEvaluator:
             comprehensive_results: 综合可信度结果
             weight_matrix: 专家权重矩阵 (m×n)
             experts_ahp: 专家AHP数据
+            equipment_scores: 设备操作评分数据（熵权法）；为 None 时从数据库加载
 
         返回:
             corrected_weights_dict: 包含各级权重的字典
         """
-        print("\n[步骤7] 计算基于把握度和AHP的权重...")
+        if self._console():
+            print("\n[步骤7] 计算基于把握度和AHP的权重...")
 
         expert_names = [r['expert_name'] for r in comprehensive_results]
 
@@ -990,25 +1432,33 @@ class ExpertCredibilityEvaluator:
         subjective_credibility = np.array([r['subjective_credibility'] for r in comprehensive_results])
         objective_credibility = np.array([r['objective_credibility'] for r in comprehensive_results])
 
-        print(f"\n  主观可信度范围: {subjective_credibility.min():.4f} - {subjective_credibility.max():.4f}")
-        print(f"  客观可信度范围: {objective_credibility.min():.4f} - {objective_credibility.max():.4f}")
+        if self._console():
+            print(f"\n  主观可信度范围: {subjective_credibility.min():.4f} - {subjective_credibility.max():.4f}")
+            print(f"  客观可信度范围: {objective_credibility.min():.4f} - {objective_credibility.max():.4f}")
 
         # 步骤1：从数据库提取把握度矩阵
         confidence_threshold = 0.6
         confidence_matrix = self.extract_confidence_matrix(experts_ahp)
-        print(f"  把握度矩阵提取完成 ({confidence_matrix.shape[0]}×{confidence_matrix.shape[1]})")
-        print(f"  把握度范围: {confidence_matrix.min():.3f} - {confidence_matrix.max():.3f}")
+        if self._console():
+            print(f"  把握度矩阵提取完成 ({confidence_matrix.shape[0]}×{confidence_matrix.shape[1]})")
+            print(f"  把握度范围: {confidence_matrix.min():.3f} - {confidence_matrix.max():.3f}")
+
+        n_indicators = weight_matrix.shape[1]
 
         # 加载设备操作评分数据（用于熵权法备用方案）
         try:
-            equipment_scores = self.load_equipment_scores()
+            if equipment_scores is None:
+                equipment_scores = self.load_equipment_scores()
             entropy_weights = self.calculate_all_entropy_weights(equipment_scores)
-            print(f"  熵权法权重加载成功: {len(equipment_scores)} 条记录")
-            print(f"  熵权权重范围: {entropy_weights.min():.4f} - {entropy_weights.max():.4f}")
+            if self._console():
+                print(f"  熵权法权重加载成功: {len(equipment_scores)} 条记录")
+                print(f"  熵权权重范围: {entropy_weights.min():.4f} - {entropy_weights.max():.4f}")
             use_entropy_method = True
         except Exception as e:
-            print(f"  [警告] 无法加载设备评分数据: {e}")
-            print(f"  将使用等权方案作为备用")
+            self._get_report().set(entropy_error=str(e))
+            if self._console():
+                print(f"  [警告] 无法加载设备评分数据: {e}")
+                print(f"  将使用等权方案作为备用")
             entropy_weights = np.ones(n_indicators) / n_indicators
             use_entropy_method = False
 
@@ -1016,45 +1466,192 @@ class ExpertCredibilityEvaluator:
         ahp_consistency_results = {}
 
         # 步骤2：对每个一级指标进行AHP处理
-        n_indicators = weight_matrix.shape[1]
         second_level_weights_raw = np.zeros(n_indicators)  # 二级权重（未乘一级权重）
-        original_avg_weights = np.mean(weight_matrix, axis=0)
 
         first_level_weights = {}
 
-        print("\n  [各一级指标AHP一致性检验]")
+        if self._console():
+            print("\n  [各一级指标AHP一致性检验]")
 
+        report = self._get_report()
         for category, info in INDICATOR_HIERARCHY.items():
-            indices = info['indices']
-            category_name = info['name']
-            first_level_weight = info['weight']
+            ahp_result = self._calculate_category_weights(
+                category, weight_matrix, confidence_matrix, expert_names,
+                subjective_credibility, objective_credibility,
+                entropy_weights, use_entropy_method, second_level_weights_raw,
+                confidence_threshold=confidence_threshold
+            )
+            ahp_consistency_results[category] = ahp_result
+            report.add('category_ahp', {
+                'category': category,
+                'name': ahp_result['name'],
+                'first_level_weight': ahp_result['first_level_weight'],
+                'n_secondary': ahp_result['n_secondary'],
+                'valid_experts': ahp_result['valid_experts'],
+                'lambda_max': ahp_result['lambda_max'],
+                'CI': ahp_result['CI'],
+                'CR': ahp_result['CR'],
+                'is_consistent': ahp_result['is_consistent'],
+                'inactive_indicators': [
+                    AHP_WEIGHT_FIELDS[idx].replace('_weight', '') for idx in info['indices']
+                    if not np.any(confidence_matrix[:, idx] >= confidence_threshold)
+                ]
+            })
 
+            # 2d: 构建一级指标信息
+            first_level_weights[category] = {
+                'name': info['name'],
+                'weight': info['weight'],
+                'indices': info['indices']
+            }
+
+        return self._assemble_corrected_weights(
+            second_level_weights_raw, first_level_weights, ahp_consistency_results,
+            weight_matrix, confidence_matrix, expert_names
+        )
+
+    def _calculate_category_weights(self, category, weight_matrix, confidence_matrix, expert_names,
+                                    subjective_credibility, objective_credibility,
+                                    entropy_weights, use_entropy_method, second_level_weights_raw,
+                                    confidence_threshold=0.6):
+        """
+        计算单个一级指标下二级指标的AHP权重（把握度过滤 + 判断矩阵 + 一致性检验）
+
+        该类别各二级指标的局部权重写入 second_level_weights_raw 的对应位置
+
+        返回:
+            dict: 该类别的AHP一致性检验结果（存入 ahp_consistency_results）
+        """
+        info = INDICATOR_HIERARCHY[category]
+        indices = info['indices']
+        category_name = info['name']
+        first_level_weight = info['weight']
+
+        if self._console():
             print(f"\n  >> {category_name} (一级权重: {first_level_weight}):")
 
-            # 2a: 指标级剔除：若某二级指标全员把握度<阈值，则该指标不进入AHP计算
-            active_indices = [idx for idx in indices if np.any(confidence_matrix[:, idx] >= confidence_threshold)]
-            inactive_indices = [idx for idx in indices if idx not in active_indices]
+        # 2a: 指标级剔除：若某二级指标全员把握度<阈值，则该指标不进入AHP计算
+        active_indices = [idx for idx in indices if np.any(confidence_matrix[:, idx] >= confidence_threshold)]
+        inactive_indices = [idx for idx in indices if idx not in active_indices]
 
-            if inactive_indices:
-                inactive_names = [AHP_WEIGHT_FIELDS[idx].replace('_weight', '') for idx in inactive_indices]
-                print(f"    [无把握剔除] 以下二级指标全员把握度<{confidence_threshold}，不纳入AHP：{', '.join(inactive_names)}")
+        if inactive_indices and self._console():
+            inactive_names = [AHP_WEIGHT_FIELDS[idx].replace('_weight', '') for idx in inactive_indices]
+            print(f"    [无把握剔除] 以下二级指标全员把握度<{confidence_threshold}，不纳入AHP：{', '.join(inactive_names)}")
 
-            if len(active_indices) == 0:
+        if len(active_indices) == 0:
+            if self._console():
                 print(f"    [警告] 本一级指标下所有二级指标均无把握，使用熵权法计算权重")
 
-                # 使用熵权法计算该类别下的权重
-                if use_entropy_method:
-                    local_weights = np.array([entropy_weights[idx] for idx in indices])
-                    local_weights = local_weights / local_weights.sum()  # 归一化
-                    note = '全员无把握，使用熵权法'
-                else:
-                    # 备用：使用等权
-                    local_weights = np.ones(len(indices)) / len(indices)
-                    note = '全员无把握，等权备用'
+            # 使用熵权法计算该类别下的权重
+            if use_entropy_method:
+                local_weights = np.array([entropy_weights[idx] for idx in indices])
+                local_weights = local_weights / local_weights.sum()  # 归一化
+                note = '全员无把握，使用熵权法'
+            else:
+                # 备用：使用等权
+                local_weights = np.ones(len(indices)) / len(indices)
+                note = '全员无把握，等权备用'
+
+            for idx in indices:
+                second_level_weights_raw[idx] = local_weights[indices.index(idx)]
+
+            local_ahp_result = {
+                'lambda_max': 0,
+                'CI': 0,
+                'CR': 0,
+                'RI': 0,
+                'is_consistent': True,
+                'weights': local_weights,
+                'valid_experts': 0,
+                'note': note
+            }
+            # 存储AHP结果
+            return {
+                'name': category_name,
+                'first_level_weight': first_level_weight,
+                'indices': indices,
+                'n_secondary': len(indices),
+                'valid_experts': 0,
+                'lambda_max': 0,
+                'CI': 0,
+                'CR': 0,
+                'RI': 0,
+                'is_consistent': True,
+                'raw_weights': local_weights
+            }
+
+        if len(active_indices) == 1:
+            only_idx = active_indices[0]
+            if self._console():
+                print(f"    [提示] 仅剩1个有把握二级指标，直接给其局部权重=1.0，其余=0")
+            local_weights_active = np.array([1.0])
+            local_ahp_result = {
+                'lambda_max': 0,
+                'CI': 0,
+                'CR': 0,
+                'RI': 0,
+                'is_consistent': True,
+                'weights': local_weights_active,
+                'valid_experts': int(np.sum(confidence_matrix[:, only_idx] >= confidence_threshold)),
+                'note': '仅1个有效指标'
+            }
+            # 写回 raw 权重（active=1，其余=0）
+            for idx in indices:
+                second_level_weights_raw[idx] = 1.0 if idx == only_idx else 0.0
+            valid_count = local_ahp_result['valid_experts']
+            judgment_matrix = np.ones((1, 1))
+        else:
+            # 2b: 构建AHP判断矩阵（逐对过滤把握度阈值）
+            judgment_matrix, valid_count = self.build_ahp_judgment_matrix(
+                weight_matrix, confidence_matrix, active_indices,
+                subjective_credibility, objective_credibility,
+                confidence_threshold=confidence_threshold
+            )
+
+        n_secondary = len(active_indices)
+        if self._console():
+            print(f"    二级指标数量: {n_secondary}")
+            print(f"    有效专家数量(把握度≥{confidence_threshold}): {valid_count}")
+
+        # ==================== 添加详细调试输出 ====================
+        if category == 'effect' and self._console(REPORT_DETAIL):  # 只对作战效能显示详细过程
+            print(f"\n    === 作战效能AHP详细计算过程 ===")
+            indicator_names_effect = ['毁伤率', '任务完成率', '效费比']
+
+            # 显示原始权重数据
+            sub_weights = weight_matrix[:, indices]
+            print(f"\n    【专家原始权重数据】")
+            header = "    专家"
+            for name in indicator_names_effect:
+                header += f"    {name}"
+            print(header)
+            print("    " + "-"*60)
+            for i, name in enumerate(expert_names):
+                row = f"    {name}"
+                for j in range(n_secondary):
+                    row += f" {sub_weights[i, j]:>8.4f}"
+                print(row)
+
+            # 显示判断矩阵
+            print(f"\n    【AHP判断矩阵】(基于几何平均)")
+            print("           ", end="")
+            for name in indicator_names_effect:
+                print(f"    {name[:4]}", end="")
+            print()
+            for i in range(n_secondary):
+                print(f"    {indicator_names_effect[i][:4]}", end="")
+                for j in range(n_secondary):
+                    print(f" {judgment_matrix[i,j]:>8.4f}", end="")
+                print()
 
-                for idx in indices:
-                    second_level_weights_raw[idx] = local_weights[indices.index(idx)]
+        # ==========================================================
 
+        if len(active_indices) >= 2:
+            if valid_count == 0:
+                # 没有任何把握度>=阈值的评分参与到成对判断中：退化为等权
+                if self._console():
+                    print(f"    [警告] 该类别内无有效成对样本(把握度阈值过高)，对有效指标采用等权")
+                local_weights = np.ones(len(active_indices)) / len(active_indices)
                 local_ahp_result = {
                     'lambda_max': 0,
                     'CI': 0,
@@ -1063,191 +1660,92 @@ class ExpertCredibilityEvaluator:
                     'is_consistent': True,
                     'weights': local_weights,
                     'valid_experts': 0,
-                    'note': note
-                }
-                # 存储AHP结果
-                ahp_consistency_results[category] = {
-                    'name': category_name,
-                    'first_level_weight': first_level_weight,
-                    'indices': indices,
-                    'n_secondary': len(indices),
-                    'valid_experts': 0,
-                    'lambda_max': 0,
-                    'CI': 0,
-                    'CR': 0,
-                    'RI': 0,
-                    'is_consistent': True,
-                    'raw_weights': local_weights
-                }
-                first_level_weights[category] = {
-                    'name': category_name,
-                    'weight': first_level_weight,
-                    'indices': indices
-                }
-                continue
-
-            if len(active_indices) == 1:
-                only_idx = active_indices[0]
-                print(f"    [提示] 仅剩1个有把握二级指标，直接给其局部权重=1.0，其余=0")
-                local_weights_active = np.array([1.0])
-                local_ahp_result = {
-                    'lambda_max': 0,
-                    'CI': 0,
-                    'CR': 0,
-                    'RI': 0,
-                    'is_consistent': True,
-                    'weights': local_weights_active,
-                    'valid_experts': int(np.sum(confidence_matrix[:, only_idx] >= confidence_threshold)),
-                    'note': '仅1个有效指标'
+                    'note': '无有效成对样本，采用等权'
                 }
-                # 写回 raw 权重（active=1，其余=0）
-                for idx in indices:
-                    second_level_weights_raw[idx] = 1.0 if idx == only_idx else 0.0
-                valid_count = local_ahp_result['valid_experts']
-                judgment_matrix = np.ones((1, 1))
             else:
-                # 2b: 构建AHP判断矩阵（逐对过滤把握度阈值）
-                judgment_matrix, valid_count = self.build_ahp_judgment_matrix(
-                    weight_matrix, confidence_matrix, active_indices,
-                    subjective_credibility, objective_credibility,
-                    confidence_threshold=confidence_threshold
-                )
-
-            n_secondary = len(active_indices)
-            print(f"    二级指标数量: {n_secondary}")
-            print(f"    有效专家数量(把握度≥{confidence_threshold}): {valid_count}")
+                # 2c: 计算AHP一致性
+                local_ahp_result = self.calculate_ahp_consistency(judgment_matrix)
 
             # ==================== 添加详细调试输出 ====================
-            if category == 'effect':  # 只对作战效能显示详细过程
-                print(f"\n    === 作战效能AHP详细计算过程 ===")
-                indicator_names_effect = ['毁伤率', '任务完成率', '效费比']
-
-                # 显示原始权重数据
-                sub_weights = weight_matrix[:, indices]
-                print(f"\n    【专家原始权重数据】")
-                header = "    专家"
-                for name in indicator_names_effect:
-                    header += f"    {name}"
-                print(header)
-                print("    " + "-"*60)
-                for i, name in enumerate(expert_names):
-                    row = f"    {name}"
-                    for j in range(n_secondary):
-                        row += f" {sub_weights[i, j]:>8.4f}"
-                    print(row)
-
-                # 显示判断矩阵
-                print(f"\n    【AHP判断矩阵】(基于几何平均)")
-                print("           ", end="")
-                for name in indicator_names_effect:
-                    print(f"    {name[:4]}", end="")
-                print()
-                for i in range(n_secondary):
-                    print(f"    {indicator_names_effect[i][:4]}", end="")
-                    for j in range(n_secondary):
-                        print(f" {judgment_matrix[i,j]:>8.4f}", end="")
-                    print()
+            if category == 'effect' and self._console(REPORT_DETAIL):
+                # 显示权重向量计算过程
+                n = judgment_matrix.shape[0]
+                print(f"\n    【权重向量计算】(几何平均法)")
+                print(f"    1. 计算各行几何平均:")
+                for i in range(n):
+                    row_product = np.prod(judgment_matrix[i, :])
+                    geo_mean = row_product ** (1/n)
+                    print(f"       {indicator_names_effect[i]}: (", end="")
+                    for j in range(n):
+                        if j > 0:
+                            print(" × ", end="")
+                        print(f"{judgment_matrix[i,j]:.4f}", end="")
+                    print(f")^(1/{n}) = {geo_mean:.6f}")
+
+                print(f"\n    2. 归一化:")
+                raw_weights = np.prod(judgment_matrix, axis=1) ** (1/n)
+                sum_weights = raw_weights.sum()
+                for i in range(n):
+                    normalized = raw_weights[i] / sum_weights
+                    print(f"       {indicator_names_effect[i]}: {raw_weights[i]:.6f} / {sum_weights:.6f} = {normalized:.6f}")
+
+                print(f"\n    3. 一致性检验:")
+                print(f"       n = {n}")
+                print(f"       λmax = {local_ahp_result['lambda_max']:.6f}")
+                print(f"       CI = (λmax - n) / (n - 1) = ({local_ahp_result['lambda_max']:.4f} - {n}) / {n-1} = {local_ahp_result['CI']:.6f}")
+                print(f"       RI = {local_ahp_result['RI']:.4f}")
+                print(f"       CR = CI / RI = {local_ahp_result['CI']:.6f} / {local_ahp_result['RI']:.4f} = {local_ahp_result['CR']:.6f}")
+
+                # 验证Aw = λw
+                w = local_ahp_result['weights']
+                Aw = judgment_matrix @ w
+                print(f"\n    4. 验证 λmax = Aw/w:")
+                for i in range(n):
+                    if w[i] > 0:
+                        lambda_i = Aw[i] / w[i]
+                        print(f"       λ_{i+1} = {Aw[i]:.6f} / {w[i]:.6f} = {lambda_i:.6f}")
+                print(f"       λmax = mean(λi) = {np.mean(Aw/w):.6f}")
 
             # ==========================================================
 
-            if len(active_indices) >= 2:
-                if valid_count == 0:
-                    # 没有任何把握度>=阈值的评分参与到成对判断中：退化为等权
-                    print(f"    [警告] 该类别内无有效成对样本(把握度阈值过高)，对有效指标采用等权")
-                    local_weights = np.ones(len(active_indices)) / len(active_indices)
-                    local_ahp_result = {
-                        'lambda_max': 0,
-                        'CI': 0,
-                        'CR': 0,
-                        'RI': 0,
-                        'is_consistent': True,
-                        'weights': local_weights,
-                        'valid_experts': 0,
-                        'note': '无有效成对样本，采用等权'
-                    }
-                else:
-                    # 2c: 计算AHP一致性
-                    local_ahp_result = self.calculate_ahp_consistency(judgment_matrix)
-
-                # ==================== 添加详细调试输出 ====================
-                if category == 'effect':
-                    # 显示权重向量计算过程
-                    n = judgment_matrix.shape[0]
-                    print(f"\n    【权重向量计算】(几何平均法)")
-                    print(f"    1. 计算各行几何平均:")
-                    for i in range(n):
-                        row_product = np.prod(judgment_matrix[i, :])
-                        geo_mean = row_product ** (1/n)
-                        print(f"       {indicator_names_effect[i]}: (", end="")
-                        for j in range(n):
-                            if j > 0:
-                                print(" × ", end="")
-                            print(f"{judgment_matrix[i,j]:.4f}", end="")
-                        print(f")^(1/{n}) = {geo_mean:.6f}")
-
-                    print(f"\n    2. 归一化:")
-                    raw_weights = np.prod(judgment_matrix, axis=1) ** (1/n)
-                    sum_weights = raw_weights.sum()
-                    for i in range(n):
-                        normalized = raw_weights[i] / sum_weights
-                        print(f"       {indicator_names_effect[i]}: {raw_weights[i]:.6f} / {sum_weights:.6f} = {normalized:.6f}")
-
-                    print(f"\n    3. 一致性检验:")
-                    print(f"       n = {n}")
-                    print(f"       λmax = {local_ahp_result['lambda_max']:.6f}")
-                    print(f"       CI = (λmax - n) / (n - 1) = ({local_ahp_result['lambda_max']:.4f} - {n}) / {n-1} = {local_ahp_result['CI']:.6f}")
-                    print(f"       RI = {local_ahp_result['RI']:.4f}")
-                    print(f"       CR = CI / RI = {local_ahp_result['CI']:.6f} / {local_ahp_result['RI']:.4f} = {local_ahp_result['CR']:.6f}")
-
-                    # 验证Aw = λw
-                    w = local_ahp_result['weights']
-                    Aw = judgment_matrix @ w
-                    print(f"\n    4. 验证 λmax = Aw/w:")
-                    for i in range(n):
-                        if w[i] > 0:
-                            lambda_i = Aw[i] / w[i]
-                            print(f"       λ_{i+1} = {Aw[i]:.6f} / {w[i]:.6f} = {lambda_i:.6f}")
-                    print(f"       λmax = mean(λi) = {np.mean(Aw/w):.6f}")
-
-                # ==========================================================
-
-                local_weights = local_ahp_result['weights']
-
-                # 判断一致性
-                if local_ahp_result['is_consistent']:
-                    print(f"    [OK] AHP一致性检验通过 (CR={local_ahp_result['CR']:.4f} ≤ 0.1)")
-                else:
-                    print(f"    [警告] AHP一致性检验未通过 (CR={local_ahp_result['CR']:.4f} > 0.1)")
-                    print(f"    建议: 需要组织专家重新讨论调整评分")
+            local_weights = local_ahp_result['weights']
 
-            # 存储AHP结果
-            ahp_consistency_results[category] = {
-                'name': category_name,
-                'first_level_weight': first_level_weight,
-                'indices': indices,
-                'n_secondary': n_secondary,
-                'valid_experts': valid_count,
-                'lambda_max': local_ahp_result['lambda_max'],
-                'CI': local_ahp_result['CI'],
-                'CR': local_ahp_result['CR'],
-                'RI': local_ahp_result.get('RI', 0),
-                'is_consistent': local_ahp_result['is_consistent'],
-                'raw_weights': local_weights.copy() if hasattr(local_ahp_result.get('weights', None), 'copy') else np.array([])
-            }
+            # 判断一致性
+            if not self._console():
+                pass
+            elif local_ahp_result['is_consistent']:
+                print(f"    [OK] AHP一致性检验通过 (CR={local_ahp_result['CR']:.4f} ≤ 0.1)")
+            else:
+                print(f"    [警告] AHP一致性检验未通过 (CR={local_ahp_result['CR']:.4f} > 0.1)")
+                print(f"    建议: 需要组织专家重新讨论调整评分")
 
-            # 2d: 存储二级权重（active指标写入AHP权重；inactive指标=0）
-            if len(active_indices) >= 2:
-                for k, idx in enumerate(active_indices):
-                    second_level_weights_raw[idx] = local_weights[k]
-                for idx in inactive_indices:
-                    second_level_weights_raw[idx] = 0.0
+        # 2d: 存储二级权重（active指标写入AHP权重；inactive指标=0）
+        if len(active_indices) >= 2:
+            for k, idx in enumerate(active_indices):
+                second_level_weights_raw[idx] = local_weights[k]
+            for idx in inactive_indices:
+                second_level_weights_raw[idx] = 0.0
 
-            # 2d: 构建一级指标信息
-            first_level_weights[category] = {
-                'name': category_name,
-                'weight': first_level_weight,
-                'indices': indices
-            }
+        # 存储AHP结果（raw_weights 与 indices 逐一对应，被剔除的指标为0）
+        return {
+            'name': category_name,
+            'first_level_weight': first_level_weight,
+            'indices': indices,
+            'n_secondary': n_secondary,
+            'valid_experts': valid_count,
+            'lambda_max': local_ahp_result['lambda_max'],
+            'CI': local_ahp_result['CI'],
+            'CR': local_ahp_result['CR'],
+            'RI': local_ahp_result.get('RI', 0),
+            'is_consistent': local_ahp_result['is_consistent'],
+            'raw_weights': second_level_weights_raw[indices].copy()
+        }
+
+    def _assemble_corrected_weights(self, second_level_weights_raw, first_level_weights, ahp_consistency_results,
+                                    weight_matrix, confidence_matrix, expert_names):
+        """根据各类别的二级权重计算最终权重，并构建返回结果字典"""
+        n_indicators = weight_matrix.shape[1]
+        original_avg_weights = np.mean(weight_matrix, axis=0)
 
         # 步骤3：计算最终权重（二级权重 × 一级指标权重）
         corrected_weights_final = np.zeros(n_indicators)
@@ -1288,14 +1786,41 @@ class ExpertCredibilityEvaluator:
             'ahp_consistency_results': ahp_consistency_results
         }
 
-        print(f"\n  权重计算完成")
-        print(f"  最终权重总和: {corrected_weights_final.sum():.6f} (已全局归一化到1.000000)")
+        report = self._get_report()
+        for category, info in first_level_weights.items():
+            report.extend('indicator_weights', [{
+                'indicator': AHP_WEIGHT_FIELDS[idx].replace('_weight', ''),
+                'category': category,
+                'second_level_weight': second_level_weights_raw[idx],
+                'original_weight': original_weights_normalized[idx],
+                'final_weight': corrected_weights_final[idx]
+            } for idx in info['indices']])
+        report.set(final_weight_sum=corrected_weights_final.sum())
+
+        if self._console():
+            print(f"\n  权重计算完成")
+            print(f"  最终权重总和: {corrected_weights_final.sum():.6f} (已全局归一化到1.000000)")
 
         return corrected_weights_dict
 
-    def save_credibility_results(self, comprehensive_results, batch_id='AHP-2026-001'):
+    def _replace_batch_rows(self, table, insert_query, rows, batch_id):
+        """
+        在一个事务内替换某批次的结果：DELETE 旧数据 + 一次 executemany 多行插入
+
+        任一步骤失败则回滚，保证该批次不会出现“旧数据已删、新数据未写全”的状态
         """
-        保存专家可信度评估结果到数据库
+        try:
+            self.cursor.execute(f"DELETE FROM {table} WHERE batch_id = %s", (batch_id,))
+            if rows:
+                self.cursor.executemany(insert_query, rows)
+            self.connection.commit()
+        except Exception:
+            self.connection.rollback()
+            raise
+
+    def save_credibility_results(self, comprehensive_results, batch_id=DEFAULT_RESULT_BATCH_ID):
+        """
+        保存专家可信度评估结果到数据库（单事务：删除该批次旧数据 + 批量插入）
 
         参数:
             comprehensive_results: 综合可信度计算结果列表
@@ -1305,13 +1830,6 @@ class ExpertCredibilityEvaluator:
 
         evaluation_date = datetime.now().date()
 
-        # 先删除该批次已存在的数据
-        delete_query = "DELETE FROM expert_credibility_results WHERE batch_id = %s"
-        self.cursor.execute(delete_query, (batch_id,))
-        self.connection.commit()
-        print(f"\n  已清除批次 {batch_id} 的旧可信度结果数据")
-
-        # 插入新数据
         insert_query = """
             INSERT INTO expert_credibility_results (
                 batch_id, evaluation_date, expert_name,
@@ -1323,8 +1841,10 @@ class ExpertCredibilityEvaluator:
             )
         """
 
+        rows = []
         for result in comprehensive_results:
-            values = (
+            dispersion = result.get('dispersion')
+            rows.append((
                 batch_id,
                 evaluation_date,
                 result['expert_name'],
@@ -1332,21 +1852,21 @@ class ExpertCredibilityEvaluator:
                 round(result.get('knowledge_score', 0), 4),
                 round(result.get('subjective_total_score', 0), 4),
                 round(result.get('subjective_credibility', 0), 4),
-                round(result.get('dispersion', 0), 2) if result.get('dispersion') is not None and not np.isnan(result.get('dispersion', 0)) else None,
+                round(dispersion, 2) if dispersion is not None and not np.isnan(dispersion) else None,
                 round(result.get('consistency_score', 0), 4),
                 round(result.get('objective_credibility', 0), 4),
                 round(result['comprehensive_credibility'], 4),
                 COMPREHENSIVE_WEIGHT['subjective'],
                 COMPREHENSIVE_WEIGHT['objective']
-            )
-            self.cursor.execute(insert_query, values)
+            ))
 
-        self.connection.commit()
-        print(f"  已保存 {len(comprehensive_results)} 位专家的可信度结果")
+        self._replace_batch_rows('expert_credibility_results', insert_query, rows, batch_id)
+        print(f"\n  已清除批次 {batch_id} 的旧可信度结果数据")
+        print(f"  已保存 {len(rows)} 位专家的可信度结果")
 
-    def save_ahp_weights(self, corrected_weights_dict, batch_id='AHP-2026-001'):
+    def save_ahp_weights(self, corrected_weights_dict, batch_id=DEFAULT_RESULT_BATCH_ID):
         """
-        保存最终AHP权重结果到数据库
+        保存最终AHP权重结果到数据库（单事务：删除该批次旧数据 + 批量插入）
 
         参数:
             corrected_weights_dict: 修正权重结果字典
@@ -1356,13 +1876,6 @@ class ExpertCredibilityEvaluator:
 
         evaluation_date = datetime.now().date()
 
-        # 先删除该批次已存在的数据
-        delete_query = "DELETE FROM ahp_final_weights WHERE batch_id = %s"
-        self.cursor.execute(delete_query, (batch_id,))
-        self.connection.commit()
-        print(f"  已清除批次 {batch_id} 的旧AHP权重数据")
-
-        # 插入数据
         insert_query = """
             INSERT INTO ahp_final_weights (
                 batch_id, evaluation_date, indicator_key, indicator_name, indicator_name_en,
@@ -1378,30 +1891,8 @@ class ExpertCredibilityEvaluator:
         second_level_original = corrected_weights_dict['second_level_original']
         ahp_results = corrected_weights_dict['ahp_consistency_results']
 
-        for i, indicator_key in enumerate(AHP_WEIGHT_FIELDS):
-            # 获取指标所属类别
-            category = None
-            indicator_name = None
-            indicator_name_en = None
-            for cat, info in INDICATOR_HIERARCHY.items():
-                if i in info['indices']:
-                    category = cat
-                    indicator_name = info['name']
-                    indicator_name_en = info['name_en']
-                    # 获取具体指标名称
-                    idx_in_category = info['indices'].index(i)
-                    indicator_names = {
-                        'security': ['密钥泄露', '被侦察概率', '抗拦截能力'],
-                        'reliability': ['崩溃率', '恢复能力', '通信可用性'],
-                        'transmission': ['带宽', '呼叫建立时间', '传输时延', '误码率', '吞吐量', '频谱效率'],
-                        'anti_jamming': ['SINR', '抗干扰余量', '通信距离'],
-                        'resource': ['功耗', '人力需求'],
-                        'effect': ['毁伤率', '任务完成率', '效费比']
-                    }
-                    if cat in indicator_names and idx_in_category < len(indicator_names[cat]):
-                        indicator_name = indicator_names[cat][idx_in_category]
-                    break
-
+        rows = []
+        for i, (indicator_key, category, indicator_name, indicator_name_en) in enumerate(INDICATOR_SAVE_INFO):
             # 获取AHP一致性结果
             if category in ahp_results:
                 ahp_cat = ahp_results[category]
@@ -1413,105 +1904,173 @@ class ExpertCredibilityEvaluator:
             else:
                 lambda_max, CI, CR, is_consistent, valid_experts = 0, 0, 0, 1, 0
 
-            # 获取指标英文名
-            indicator_name_en_map = {
-                'security_key_leakage': 'Key Leakage',
-                'security_detected_probability': 'Detected Probability',
-                'security_interception_resistance': 'Interception Resistance',
-                'reliability_crash_rate': 'Crash Rate',
-                'reliability_recovery_capability': 'Recovery Capability',
-                'reliability_communication_availability': 'Communication Availability',
-                'transmission_bandwidth': 'Bandwidth',
-                'transmission_call_setup_time': 'Call Setup Time',
-                'transmission_transmission_delay': 'Transmission Delay',
-                'transmission_bit_error_rate': 'Bit Error Rate',
-                'transmission_throughput': 'Throughput',
-                'transmission_spectral_efficiency': 'Spectral Efficiency',
-                'anti_jamming_sinr': 'SINR',
-                'anti_jamming_anti_jamming_margin': 'Anti-jamming Margin',
-                'anti_jamming_communication_distance': 'Communication Distance',
-                'resource_power_consumption': 'Power Consumption',
-                'resource_manpower_requirement': 'Manpower Requirement',
-                'effect_damage_rate': 'Damage Rate',
-                'effect_mission_completion_rate': 'Mission Completion Rate',
-                'effect_cost_effectiveness': 'Cost Effectiveness'
-            }
-            indicator_name_en = indicator_name_en_map.get(indicator_key, indicator_key)
-
-            values = (
+            rows.append((
                 batch_id,
                 evaluation_date,
-                indicator_key.replace('_weight', ''),
+                indicator_key,
                 indicator_name,
                 indicator_name_en,
                 category,
-                round(final_weights[i], 6),
-                round(second_level_raw[i], 6),
-                round(second_level_original[i], 6),
-                round(lambda_max, 4) if lambda_max else 0,
-                round(CI, 6) if CI else 0,
-                round(CR, 6) if CR else 0,
+                round(float(final_weights[i]), 6),
+                round(float(second_level_raw[i]), 6),
+                round(float(second_level_original[i]), 6),
+                round(float(lambda_max), 4) if lambda_max else 0,
+                round(float(CI), 6) if CI else 0,
+                round(float(CR), 6) if CR else 0,
                 is_consistent,
-                valid_experts
-            )
-            self.cursor.execute(insert_query, values)
+                int(valid_experts)
+            ))
 
-        self.connection.commit()
-        print(f"  已保存 {len(AHP_WEIGHT_FIELDS)} 个指标的AHP权重")
+        self._replace_batch_rows('ahp_final_weights', insert_query, rows, batch_id)
+        print(f"  已清除批次 {batch_id} 的旧AHP权重数据")
+        print(f"  已保存 {len(rows)} 个指标的AHP权重")
+
+    def calculate_batch_results(self, experts_background, experts_ahp, equipment_scores=None, bootstrap=None):
+        """
+        计算单个批次的可信度与AHP权重（不访问数据库时需传入 equipment_scores）
+
+        参数:
+            bootstrap: Bootstrap 置信区间参数（见 BOOTSTRAP_DEFAULTS），为 None 时不计算
+
+        返回:
+            dict: comprehensive_results, weight_matrix, avg_weight_vector,
+                  consistency_result, corrected_weights_dict, report
+        """
+        # 每个批次单独生成一份结构化报告
+        self.report = CredibilityReport(self.verbosity)
+        console = self._console()
 
-    def evaluate(self):
-        """执行完整的专家可信度评估"""
-        print("\n" + "="*100)
-        print("专家可信度评估系统")
-        print("="*100)
-        
-        # 1. 加载数据
-        print("\n[步骤1] 加载专家背景数据...")
-        experts_background = self.load_expert_background_data()
-        print(f"  已加载 {len(experts_background)} 位专家的背景数据")
-        
-        print("\n[步骤2] 加载专家AHP权重数据...")
-        experts_ahp = self.load_expert_ahp_weights()
-        print(f"  已加载 {len(experts_ahp)} 位专家的AHP权重数据")
-        
         # 2. 计算主观可信度
-        print("\n[步骤3] 计算主观可信度 (αi)...")
+        if console:
+            print("\n[步骤3] 计算主观可信度 (αi)...")
         subjective_results = self.calculate_subjective_credibility(experts_background)
-        print("  主观可信度计算完成")
+        if console:
+            print("  主观可信度计算完成")
         
         # 3. 计算客观可信度
-        print("\n[步骤4] 计算客观可信度 (βi)...")
-        objective_results, weight_matrix, avg_weight_vector, consistency_result = self.calculate_objective_credibility(experts_ahp)
-        print("  客观可信度计算完成")
+        if console:
+            print("\n[步骤4] 计算客观可信度 (βi)...")
+        objective_results, weight_matrix, avg_weight_vector, consistency_result = self.calculate_objective_credibility(
+            experts_ahp, bootstrap=bootstrap
+        )
+        if console:
+            print("  客观可信度计算完成")
         
         # 4. 计算综合可信度
-        print("\n[步骤5] 计算综合可信度...")
+        if console:
+            print("\n[步骤5] 计算综合可信度...")
         comprehensive_results = self.calculate_comprehensive_credibility(subjective_results, objective_results)
-        print("  综合可信度计算完成")
+        if console:
+            print("  综合可信度计算完成")
+        self.report.extend('expert_credibility', [{
+            'expert_name': result['expert_name'],
+            'subjective_credibility': result['subjective_credibility'],
+            'objective_credibility': result['objective_credibility'],
+            'comprehensive_credibility': result['comprehensive_credibility'],
+            'dispersion': result['dispersion'],
+            'consistency_score': result['consistency_score'],
+            'objective_credibility_ci': result.get('objective_credibility_ci'),
+            'comprehensive_credibility_ci': result.get('comprehensive_credibility_ci')
+        } for result in comprehensive_results])
         
         # 5. 计算可信度修正权重（传入experts_ahp以提取把握度）
-        corrected_weights_dict = self.calculate_corrected_weights(comprehensive_results, weight_matrix, experts_ahp)
-        
-        # 6. 显示结果
-        self.display_results(comprehensive_results, consistency_result)
+        corrected_weights_dict = self.calculate_corrected_weights(
+            comprehensive_results, weight_matrix, experts_ahp, equipment_scores=equipment_scores
+        )
+
+        return {
+            'comprehensive_results': comprehensive_results,
+            'weight_matrix': weight_matrix,
+            'avg_weight_vector': avg_weight_vector,
+            'consistency_result': consistency_result,
+            'corrected_weights_dict': corrected_weights_dict,
+            'report': self.report
+        }
+
+    def create_incremental_state(self, batch_id=DEFAULT_SOURCE_BATCH_ID, verbose=False):
+        """
+        加载指定批次已提交的专家数据，创建增量评估状态
+
+        之后每收到一份专家问卷调用 state.update_expert(row)，需要落库时调用 state.save(batch_id)
+        """
+        return IncrementalCredibilityState(
+            self, self.load_expert_background_data(), self.load_expert_ahp_weights(batch_id), verbose=verbose
+        )
+
+    def evaluate(self, visualize=True, interactive_charts=False, chart_workers=None, bootstrap=None,
+                 report_path=None, report_format='json'):
+        """
+        执行完整的专家可信度评估
+
+        参数:
+            visualize: 是否生成图表（在结果保存到数据库之后进行）
+            interactive_charts: 是否使用交互式窗口逐张显示图表；默认 Agg 后端并行渲染
+            chart_workers: 图表渲染进程数，默认CPU核数
+            bootstrap: Bootstrap 置信区间参数（见 BOOTSTRAP_DEFAULTS），为 None 时不计算
+            report_path: 结构化报告保存路径（json 为文件，parquet 为目录），为 None 时不保存
+            report_format: 报告格式，json 或 parquet
+        """
+        console = self._console()
+        if console:
+            print("\n" + "="*100)
+            print("专家可信度评估系统")
+            print("="*100)
         
-        # 7. 显示权重修正结果
-        self.display_corrected_weights(corrected_weights_dict)
+        # 1. 加载数据
+        if console:
+            print("\n[步骤1] 加载专家背景数据...")
+        experts_background = self.load_expert_background_data()
+        if console:
+            print(f"  已加载 {len(experts_background)} 位专家的背景数据")
         
-        # 8. 可视化
-        print("\n[步骤8] 生成可视化图表...")
-        self.visualize_results(comprehensive_results, experts_background, weight_matrix, avg_weight_vector, consistency_result, corrected_weights_dict)
-        print("  可视化完成")
-
-        # 9. 保存结果到数据库
-        print("\n[步骤9] 保存结果到数据库...")
-        self.save_credibility_results(comprehensive_results, batch_id='AHP-2026-001')
-        self.save_ahp_weights(corrected_weights_dict, batch_id='AHP-2026-001')
-        print("  数据库保存完成")
+        if console:
+            print("\n[步骤2] 加载专家AHP权重数据...")
+        experts_ahp = self.load_expert_ahp_weights()
+        if console:
+            print(f"  已加载 {len(experts_ahp)} 位专家的AHP权重数据")
+        
+        batch_result = self.calculate_batch_results(experts_background, experts_ahp, bootstrap=bootstrap)
+        comprehensive_results = batch_result['comprehensive_results']
+        weight_matrix = batch_result['weight_matrix']
+        avg_weight_vector = batch_result['avg_weight_vector']
+        consistency_result = batch_result['consistency_result']
+        corrected_weights_dict = batch_result['corrected_weights_dict']
+        
+        if console:
+            # 6. 显示结果
+            self.display_results(comprehensive_results, consistency_result)
+
+            # 7. 显示权重修正结果
+            self.display_corrected_weights(corrected_weights_dict)
+        
+        # 8. 保存结果到数据库
+        if console:
+            print("\n[步骤8] 保存结果到数据库...")
+        with contextlib.nullcontext() if console else contextlib.redirect_stdout(io.StringIO()):
+            self.save_credibility_results(comprehensive_results, batch_id=DEFAULT_RESULT_BATCH_ID)
+            self.save_ahp_weights(corrected_weights_dict, batch_id=DEFAULT_RESULT_BATCH_ID)
+        if report_path:
+            batch_result['report'].save(report_path, fmt=report_format)
+        if console:
+            print("  数据库保存完成")
+
+        # 9. 可视化（结果已落库，图表失败不影响评估结果）
+        if visualize:
+            if console:
+                print("\n[步骤9] 生成可视化图表...")
+            with contextlib.nullcontext() if console else contextlib.redirect_stdout(io.StringIO()):
+                self.visualize_results(
+                    comprehensive_results, experts_background, weight_matrix, avg_weight_vector,
+                    consistency_result, corrected_weights_dict,
+                    interactive=interactive_charts, workers=chart_workers
+                )
+            if console:
+                print("  可视化完成")
 
-        print("\n" + "="*100)
-        print("评估完成！")
-        print("="*100 + "\n")
+        if console:
+            print("\n" + "="*100)
+            print("评估完成！")
+            print("="*100 + "\n")
         
         return comprehensive_results
     
@@ -1592,6 +2151,11 @@ class ExpertCredibilityEvaluator:
             print(f"  主观可信度 (αi): {result['subjective_credibility']:.6f}")
             print(f"  客观可信度 (βi): {result['objective_credibility']:.6f}")
             print(f"  综合可信度: {result['comprehensive_credibility']:.6f}")
+            if 'comprehensive_credibility_ci' in result:
+                beta_lo, beta_hi = result['objective_credibility_ci']
+                comp_lo, comp_hi = result['comprehensive_credibility_ci']
+                print(f"  客观可信度区间: [{beta_lo:.4f}, {beta_hi:.4f}]")
+                print(f"  综合可信度区间: [{comp_lo:.4f}, {comp_hi:.4f}]")
     
     def display_corrected_weights(self, corrected_weights_dict):
         """显示权重修正结果（新方案：基于AHP+把握度过滤）"""
@@ -1678,13 +2242,12 @@ class ExpertCredibilityEvaluator:
         print(f"  6. 权重总和: {corrected.sum():.6f} (应为1.000000)")
         print(f"  * 标注: 权重变化率 > 5% 的指标")
     
-    def visualize_results(self, results, experts_background, weight_matrix, avg_weight_vector, consistency_result, corrected_weights_dict):
+    def build_chart_jobs(self, results, weight_matrix, consistency_result, corrected_weights_dict):
         """
-        生成可视化图表（基于README方案）
+        生成图表任务列表（基于README方案）
 
-        输出：
-        - 图1: 专家可信度综合图（3×2布局，单独保存）
-        - 图2-5: 其他图表合并到一张图（2×2布局）
+        返回:
+            list: [(说明, 输出文件名, 绘图方法名, 参数元组), ...]，每个任务对应一张独立的图
         """
         # 获取专家名称
         expert_names = [r['expert_name'] for r in results]
@@ -1702,21 +2265,64 @@ class ExpertCredibilityEvaluator:
         # 计算单指标CV
         indicator_cvs = consistency_result['indicator_cvs']
 
-        # 1. 专家可信度综合图（3×2布局，单独保存）
-        print("    生成图1: 专家可信度综合图（6子图）...")
-        self.plot_comprehensive_credibility_6panels(
-            expert_names, weight_matrix, indicator_cvs, dispersions,
-            subjective_credibility, objective_credibility, avg_confidence
-        )
+        return [
+            # 1. 专家可信度综合图（3×2布局，单独保存）
+            ('图1: 专家可信度综合图（6子图）', '图1_专家可信度综合图.png',
+             'plot_comprehensive_credibility_6panels',
+             (expert_names, weight_matrix, indicator_cvs, dispersions,
+              subjective_credibility, objective_credibility, avg_confidence)),
+            # 2. 向量离散度图（单独保存）
+            ('向量离散度图', '图6_向量离散度分析.png',
+             'plot_vector_dispersion_separate',
+             (weight_matrix, expert_names, consistency_result)),
+            # 3. 其他图表合并到一张图（2×2布局）
+            ('图2-5: 其他图表', '图2-5_综合分析.png',
+             'plot_other_charts_2x2',
+             (expert_names, comprehensive_credibility, corrected_weights_dict)),
+        ]
+
+    def visualize_results(self, results, experts_background, weight_matrix, avg_weight_vector, consistency_result,
+                          corrected_weights_dict, interactive=False, workers=None, use_cache=True):
+        """
+        生成可视化图表（基于README方案）
 
-        # 2. 向量离散度图（单独保存）
-        print("    生成向量离散度图...")
-        self.plot_vector_dispersion_separate(weight_matrix, expert_names, consistency_result)
+        输出：
+        - 图1: 专家可信度综合图（3×2布局，单独保存）
+        - 图2-5: 其他图表合并到一张图（2×2布局）
+
+        渲染方式：
+        - interactive=True：当前进程内逐张绘制并弹出窗口（原有方式）
+        - 默认：Agg 后端无界面渲染，每张图一个进程并行绘制；
+          输入内容哈希与上次一致且图片仍存在的图表直接跳过（缓存记录在 .chart_cache.json）
+        """
+        jobs = self.build_chart_jobs(results, weight_matrix, consistency_result, corrected_weights_dict)
+
+        if interactive:
+            for title, _, method_name, args in jobs:
+                print(f"    生成{title}...")
+                getattr(self, method_name)(*args)
+            print("\n  可视化完成！图表已保存。")
+            return
+
+        cache = _load_chart_cache() if use_cache else {}
+        pending = []
+        for title, filename, method_name, args in jobs:
+            digest = _chart_input_hash(method_name, args)
+            if use_cache and cache.get(filename) == digest and os.path.exists(filename):
+                print(f"    {title} 输入未变化，跳过重绘")
+                continue
+            print(f"    生成{title}...")
+            pending.append((filename, digest, method_name, args))
 
-        # 3. 其他图表合并到一张图（2×2布局）
-        print("    生成图2-5: 其他图表...")
-        self.plot_other_charts_2x2(expert_names, comprehensive_credibility, corrected_weights_dict)
+        for filename, digest, error in render_charts(pending, workers):
+            if error is None:
+                cache[filename] = digest
+            else:
+                cache.pop(filename, None)
+                print(f"    [警告] 图表 {filename} 生成失败: {error}")
 
+        if use_cache:
+            _save_chart_cache(cache)
         print("\n  可视化完成！图表已保存。")
 
     def plot_other_charts_2x2(self, expert_names, comprehensive_credibility, corrected_weights_dict):
@@ -2922,22 +3528,522 @@ class ExpertCredibilityEvaluator:
                bbox=dict(boxstyle='round', facecolor='yellow', alpha=0.3))
 
 
-def main():
+# ==================== 增量评估 ====================
+
+class IncrementalCredibilityState:
+    """
+    专家AHP问卷陆续提交时的增量可信度计算
+
+    维护各指标把握度过滤后评分的充分统计量（个数、和、平方和），
+    新增或修改一位专家时只更新该专家的统计量贡献，然后：
+    - 由统计量得到指标均值与整体均值，向量化重算β，找出β发生变化的专家
+    - 只重算受影响的一级指标AHP权重：该专家在类别内有有把握评分，
+      或有把握评分参与该类别判断矩阵的专家综合可信度发生了变化
+    - 其余类别沿用缓存结果；不重新加载专家背景、不重绘图表
+
+    判断矩阵按“删除离均值最远比值”后取几何平均，且比值带有随可信度变化的调整因子，
+    对数比值和无法在删除离群值后精确增量维护，因此受影响类别通过向量化的
+    build_ahp_judgment_matrix 整体重建（仅涉及该类别的少数指标列）。
+    """
+
+    def __init__(self, evaluator, experts_background, experts_ahp, equipment_scores=None,
+                 confidence_threshold=0.6, verbose=False):
+        """
+        参数:
+            evaluator: ExpertCredibilityEvaluator（只做计算时可用 connect=False 创建）
+            experts_background: 专家背景数据（用于主观可信度α）
+            experts_ahp: 已提交的专家AHP权重数据
+            equipment_scores: 设备操作评分数据（熵权法）；为 None 时从数据库加载
+            confidence_threshold: 把握度阈值
+            verbose: 是否输出各类别AHP计算过程
+        """
+        self.evaluator = evaluator
+        self.threshold = confidence_threshold
+        self.verbose = verbose
+        n = len(AHP_WEIGHT_FIELDS)
+
+        with self._output():
+            subjective_results = evaluator.calculate_subjective_credibility(experts_background)
+        self.subjective = {r['expert_name']: r for r in subjective_results}
+        self.background_order = [r['expert_name'] for r in subjective_results]
+
+        # 熵权法权重只依赖设备评分数据，计算一次
+        try:
+            if equipment_scores is None:
+                equipment_scores = evaluator.load_equipment_scores()
+            self.entropy_weights = evaluator.calculate_all_entropy_weights(equipment_scores)
+            self.use_entropy_method = True
+        except Exception as e:
+            print(f"  [警告] 无法加载设备评分数据: {e}，将使用等权方案作为备用")
+            self.entropy_weights = np.ones(n) / n
+            self.use_entropy_method = False
+
+        self.expert_names = []
+        self.expert_index = {}
+        self.weight_matrix = np.zeros((0, n))
+        self.confidence_matrix = np.zeros((0, n))
+
+        # 充分统计量：把握度≥阈值的评分个数、和、平方和（按指标）
+        self.counts = np.zeros(n, dtype=int)
+        self.sums = np.zeros(n)
+        self.sumsq = np.zeros(n)
+
+        self.dispersions = np.zeros(0)
+        self.betas = np.zeros(0)
+        self.second_level_weights_raw = np.zeros(n)
+        self.ahp_consistency_results = {}
+        self.corrected_weights_dict = None
+
+        for expert in experts_ahp:
+            weights, confidences = self._expert_vectors(expert)
+            self._insert_row(expert['expert_name'], weights, confidences)
+        self._refresh_betas()
+        if self.expert_names:
+            self._recalculate_categories(list(INDICATOR_HIERARCHY))
+
+    def _output(self):
+        """非 verbose 时屏蔽计算过程输出"""
+        return contextlib.nullcontext() if self.verbose else contextlib.redirect_stdout(io.StringIO())
+
+    def _expert_vectors(self, expert):
+        """提取单个专家的权重向量与把握度向量"""
+        weights, _ = self.evaluator.extract_weight_vectors([expert])
+        confidences = self.evaluator.extract_confidence_matrix([expert])
+        return weights[0], confidences[0]
+
+    def _accumulate(self, weights, confidences, sign):
+        """把一位专家的把握度过滤评分加入（sign=1）或移出（sign=-1）充分统计量"""
+        valid = confidences >= self.threshold
+        self.counts += sign * valid.astype(int)
+        self.sums += sign * np.where(valid, weights, 0.0)
+        self.sumsq += sign * np.where(valid, weights ** 2, 0.0)
+
+    def _insert_row(self, expert_name, weights, confidences):
+        """新增或替换一位专家的评分行，返回 (是否为修改, 原评分行或 None)"""
+        if expert_name not in self.subjective:
+            raise ValueError(f'专家 {expert_name} 无背景数据，无法计算主观可信度')
+
+        if expert_name in self.expert_index:
+            i = self.expert_index[expert_name]
+            old_row = (self.weight_matrix[i].copy(), self.confidence_matrix[i].copy())
+            self._accumulate(*old_row, sign=-1)
+            self.weight_matrix[i] = weights
+            self.confidence_matrix[i] = confidences
+        else:
+            old_row = None
+            self.expert_index[expert_name] = len(self.expert_names)
+            self.expert_names.append(expert_name)
+            self.weight_matrix = np.vstack([self.weight_matrix, weights])
+            self.confidence_matrix = np.vstack([self.confidence_matrix, confidences])
+            self.betas = np.append(self.betas, np.nan)
+        self._accumulate(weights, confidences, sign=1)
+        return old_row is not None, old_row
+
+    def indicator_means(self):
+        """把握度过滤后的各指标均值（无有效评分的指标为 nan）"""
+        return np.where(self.counts > 0, self.sums / np.maximum(self.counts, 1), np.nan)
+
+    def indicator_raw_cvs(self):
+        """由充分统计量得到的各指标CV(%)（未删除离群值，ddof=1；有效评分不足2个为 nan）"""
+        means = self.indicator_means()
+        sq_dev = np.maximum(self.sumsq - self.counts * np.nan_to_num(means) ** 2, 0.0)
+        stds = np.sqrt(sq_dev / np.maximum(self.counts - 1, 1))
+        return np.where(self.counts > 1, self.evaluator._cv_percent(means, stds), np.nan)
+
+    def _refresh_betas(self):
+        """由充分统计量重算所有专家的离散度CV与β，返回β发生变化的专家索引"""
+        old_betas = self.betas
+        if not self.expert_names:
+            return np.zeros(0, dtype=int)
+
+        means = self.indicator_means()
+        n_valid = self.counts.sum()
+        overall_mean = self.sums.sum() / n_valid if n_valid > 0 else float(np.mean(self.weight_matrix))
+
+        valid = (self.confidence_matrix >= self.threshold) & (self.counts > 0)
+        deviations = self.weight_matrix - np.nan_to_num(means)
+        _, dev_stds, dev_counts = self.evaluator._masked_mean_std(deviations, valid, axis=1)
+        cvs = dev_stds / overall_mean * 100 if overall_mean > 0 else np.zeros_like(dev_stds)
+        self.dispersions = np.where(dev_counts < 2, np.nan, cvs)
+        self.betas = self.evaluator._beta_from_cv(self.dispersions)
+
+        changed = ~np.isclose(self.betas, old_betas, rtol=0, atol=1e-12)
+        return np.where(changed)[0]
+
+    def _credibility_arrays(self):
+        """与评分矩阵行顺序一致的主观可信度α与客观可信度β"""
+        alphas = np.array([self.subjective[name]['subjective_credibility'] for name in self.expert_names])
+        return alphas, self.betas
+
+    def _recalculate_categories(self, categories):
+        """重算指定一级指标的AHP权重，并汇总得到最终权重"""
+        alphas, betas = self._credibility_arrays()
+        # 结构化报告只保留本次重算的内容，避免长期运行时不断累积
+        self.evaluator.report = CredibilityReport(self.evaluator.verbosity)
+        with self._output():
+            for category in categories:
+                self.ahp_consistency_results[category] = self.evaluator._calculate_category_weights(
+                    category, self.weight_matrix, self.confidence_matrix, self.expert_names,
+                    alphas, betas, self.entropy_weights, self.use_entropy_method,
+                    self.second_level_weights_raw, confidence_threshold=self.threshold
+                )
+            first_level_weights = {
+                category: {'name': info['name'], 'weight': info['weight'], 'indices': info['indices']}
+                for category, info in INDICATOR_HIERARCHY.items()
+            }
+            ahp_results = {category: self.ahp_consistency_results[category] for category in INDICATOR_HIERARCHY}
+            self.corrected_weights_dict = self.evaluator._assemble_corrected_weights(
+                self.second_level_weights_raw, first_level_weights, ahp_results,
+                self.weight_matrix, self.confidence_matrix, self.expert_names
+            )
+
+    def update_expert(self, expert_ahp):
+        """
+        新增或修改一位专家的AHP问卷，增量更新可信度与权重
+
+        参数:
+            expert_ahp: 单个专家的AHP权重数据（与 load_expert_ahp_weights 返回的行格式相同）
+
+        返回:
+            dict: expert_name, action（added/revised）, changed_betas（{专家: (原β, 新β)}）,
+                  recalculated_categories, corrected_weights
+        """
+        expert_name = expert_ahp['expert_name']
+        weights, confidences = self._expert_vectors(expert_ahp)
+        old_betas = dict(zip(self.expert_names, self.betas))
+        revised, old_row = self._insert_row(expert_name, weights, confidences)
+        changed = self._refresh_betas()
+
+        # 受影响的类别：本专家（修改前或修改后）在类别内有有把握评分，或β变化的专家在类别内有有把握评分
+        confident = self.confidence_matrix[changed] >= self.threshold
+        touched = confidences >= self.threshold
+        if old_row is not None:
+            touched = touched | (old_row[1] >= self.threshold)
+        categories = [
+            category for category, info in INDICATOR_HIERARCHY.items()
+            if touched[info['indices']].any() or confident[:, info['indices']].any()
+            or category not in self.ahp_consistency_results
+        ]
+        self._recalculate_categories(categories)
+
+        return {
+            'expert_name': expert_name,
+            'action': 'revised' if revised else 'added',
+            'changed_betas': {
+                self.expert_names[i]: (old_betas.get(self.expert_names[i], np.nan), float(self.betas[i]))
+                for i in changed
+            },
+            'recalculated_categories': categories,
+            'corrected_weights': self.corrected_weights_dict
+        }
+
+    def consistency(self):
+        """当前专家组的一致性检验结果（CV，删除最远值口径）"""
+        avg_cv, indicator_cvs, indicator_details, _, level, passed, outlier_removed_analysis, active_mask = \
+            self.evaluator.check_consistency(
+                self.weight_matrix, self.confidence_matrix, self.expert_names,
+                confidence_threshold=self.threshold, remove_farthest=True, verbose=False
+            )
+        return {
+            'avg_cv': avg_cv,
+            'indicator_cvs': indicator_cvs,
+            'indicator_details': indicator_details,
+            'level': level,
+            'passed': passed,
+            'expert_dispersions': self.dispersions,
+            'outlier_removed_analysis': outlier_removed_analysis,
+            'active_indicator_mask': active_mask,
+            'confidence_threshold': self.threshold,
+            'confidence_matrix': self.confidence_matrix
+        }
+
+    def comprehensive_results(self):
+        """综合可信度结果（格式同 calculate_comprehensive_credibility，按背景数据顺序，仅含已提交的专家）"""
+        results = []
+        for expert_name in self.background_order:
+            if expert_name not in self.expert_index:
+                continue
+            subj = self.subjective[expert_name]
+            i = self.expert_index[expert_name]
+            beta = float(self.betas[i])
+            results.append({
+                'expert_name': expert_name,
+                'subjective_credibility': subj['subjective_credibility'],
+                'objective_credibility': beta,
+                'comprehensive_credibility': (
+                    COMPREHENSIVE_WEIGHT['subjective'] * subj['subjective_credibility'] +
+                    COMPREHENSIVE_WEIGHT['objective'] * beta
+                ),
+                'influence_score': subj['influence_score'],
+                'knowledge_score': subj['knowledge_score'],
+                'subjective_total_score': subj['subjective_total_score'],
+                'consistency_score': beta,
+                'dispersion': self.dispersions[i]
+            })
+        return results
+
+    def save(self, batch_id=DEFAULT_RESULT_BATCH_ID):
+        """将当前结果写回数据库（需要已连接数据库的 evaluator）"""
+        self.evaluator.save_credibility_results(self.comprehensive_results(), batch_id=batch_id)
+        self.evaluator.save_ahp_weights(self.corrected_weights_dict, batch_id=batch_id)
+
+
+# ==================== 图表渲染 ====================
+
+# 图表缓存记录文件（与图片同目录：输出文件名 → 输入内容哈希）
+CHART_CACHE_FILE = '.chart_cache.json'
+# 绘图代码变更导致同样输入需要重绘时，递增此版本号使旧缓存失效
+CHART_CACHE_VERSION = 1
+
+
+def _chart_input_hash(method_name, args):
+    """图表输入内容哈希：绘图方法名 + 参数序列化结果"""
+    digest = hashlib.sha256(f'{CHART_CACHE_VERSION}:{method_name}'.encode('utf-8'))
+    digest.update(pickle.dumps(args, protocol=4))
+    return digest.hexdigest()
+
+
+def _load_chart_cache():
+    """读取图表缓存记录，文件不存在或损坏时返回空字典"""
+    try:
+        with open(CHART_CACHE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_chart_cache(cache):
+    """写入图表缓存记录"""
+    try:
+        with open(CHART_CACHE_FILE, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, ensure_ascii=False, indent=2)
+    except OSError as e:
+        print(f"    [警告] 无法写入图表缓存: {e}")
+
+
+def _use_headless_backend():
+    """切换到无界面的 Agg 后端（plt.show 不再阻塞）"""
+    plt.switch_backend('Agg')
+
+
+def _render_chart_worker(job):
+    """
+    渲染单张图表（进程池工作函数）
+
+    返回:
+        (输出文件名, 输入哈希, 错误信息或 None)
+    """
+    filename, digest, method_name, args = job
+    evaluator = ExpertCredibilityEvaluator(connect=False)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            getattr(evaluator, method_name)(*args)
+        return filename, digest, None
+    except Exception as e:
+        return filename, digest, str(e)
+    finally:
+        plt.close('all')
+
+
+def render_charts(jobs, workers=None):
+    """
+    使用 Agg 后端渲染图表：多张图时每张图一个进程并行绘制
+
+    参数:
+        jobs: [(输出文件名, 输入哈希, 绘图方法名, 参数元组), ...]
+        workers: 进程数，默认CPU核数；1 表示在当前进程内顺序绘制
+
+    返回:
+        list: [(输出文件名, 输入哈希, 错误信息或 None), ...]
+    """
+    if not jobs:
+        return []
+
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    if workers <= 1:
+        _use_headless_backend()
+        return [_render_chart_worker(job) for job in jobs]
+
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers, initializer=_use_headless_backend) as executor:
+        return list(executor.map(_render_chart_worker, jobs))
+
+
+# ==================== 多批次评估 ====================
+
+def _evaluate_batch_worker(task):
+    """
+    工作进程：计算单个批次的可信度与AHP权重（不连接数据库）
+
+    参数:
+        task: (batch_id, experts_background, experts_ahp, equipment_scores, bootstrap, verbose)
+
+    返回:
+        (batch_id, 结果字典)；失败时结果为 {'success': False, 'message': ..., 'error': ...}
+    """
+    batch_id, experts_background, experts_ahp, equipment_scores, bootstrap, verbose = task
+    evaluator = ExpertCredibilityEvaluator(connect=False, verbosity=REPORT_DETAIL if verbose else REPORT_QUIET)
+    try:
+        result = evaluator.calculate_batch_results(experts_background, experts_ahp, equipment_scores, bootstrap)
+        result['success'] = True
+        return batch_id, result
+    except Exception as e:
+        return batch_id, {
+            'success': False,
+            'message': f'批次 {batch_id} 计算失败',
+            'error': str(e)
+        }
+
+
+def run_credibility_batches(batch_ids=None, workers=None, save=True, verbose=False, bootstrap=None,
+                            report_dir=None, report_format='json'):
+    """
+    多批次专家可信度评估
+
+    - 专家背景、设备评分各加载一次，全部批次的AHP权重用一次批量查询加载
+    - 各批次的可信度/AHP计算分发到进程池并行执行
+    - 结果按批次写回数据库（batch_id 与源批次相同）
+
+    参数:
+        batch_ids: 批次ID列表；为 None 时处理全部批次
+        workers: 进程数；默认取 CPU 核数，1 表示在当前进程内顺序计算
+        save: 是否写回数据库
+        verbose: 是否输出各批次的详细计算过程
+        bootstrap: Bootstrap 置信区间参数（见 BOOTSTRAP_DEFAULTS），为 None 时不计算
+        report_dir: 结构化报告输出目录；每个批次保存为 <batch_id>.json（parquet 格式为 <batch_id>/ 目录）
+        report_format: 报告格式，json 或 parquet
+
+    返回:
+        dict: {batch_id: 综合可信度结果列表 或 错误字典}
+    """
+    evaluator = ExpertCredibilityEvaluator()
+
+    print("\n" + "="*100)
+    print("专家可信度评估系统 - 多批次评估")
+    print("="*100)
+
+    experts_background = evaluator.load_expert_background_data()
+    batches = evaluator.load_expert_ahp_weights_bulk(batch_ids)
+    try:
+        equipment_scores = evaluator.load_equipment_scores()
+    except Exception as e:
+        # 空数据会让各批次的熵权计算报错，从而走等权备用方案（use_entropy_method=False）
+        print(f"  [警告] 无法加载设备评分数据: {e}，各批次将使用等权方案作为备用")
+        equipment_scores = []
+    print(f"  已加载 {len(experts_background)} 位专家的背景数据，{len(batches)} 个AHP批次")
+
+    tasks = []
+    results = {}
+    for batch_id, experts_ahp in batches.items():
+        if not experts_ahp:
+            print(f"  [跳过] 批次 {batch_id} 无专家AHP权重数据")
+            results[batch_id] = {'success': False, 'message': f'批次 {batch_id} 无数据', 'error': 'empty batch'}
+            continue
+        tasks.append((batch_id, experts_background, experts_ahp, equipment_scores, bootstrap, verbose))
+
+    workers = min(workers or os.cpu_count() or 1, max(len(tasks), 1))
+    print(f"  待计算批次: {len(tasks)}，并行进程数: {workers}")
+
+    if workers > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        executor = ProcessPoolExecutor(max_workers=workers)
+        outcomes = executor.map(_evaluate_batch_worker, tasks)
+    else:
+        executor = None
+        outcomes = map(_evaluate_batch_worker, tasks)
+
+    try:
+        for batch_id, result in outcomes:
+            if not result['success']:
+                print(f"  [失败] {result['message']}: {result['error']}")
+                results[batch_id] = result
+                continue
+
+            comprehensive_results = result['comprehensive_results']
+            print(f"\n  >> 批次 {batch_id}: {len(comprehensive_results)} 位专家，"
+                  f"一致性 {result['consistency_result']['level']}")
+            if save:
+                evaluator.save_credibility_results(comprehensive_results, batch_id=batch_id)
+                evaluator.save_ahp_weights(result['corrected_weights_dict'], batch_id=batch_id)
+            if report_dir:
+                os.makedirs(report_dir, exist_ok=True)
+                name = batch_id if report_format == 'parquet' else f'{batch_id}.json'
+                result['report'].save(os.path.join(report_dir, name), fmt=report_format)
+            results[batch_id] = comprehensive_results
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    print("\n" + "="*100)
+    print(f"多批次评估完成！成功 {sum(isinstance(r, list) for r in results.values())}/{len(results)} 个批次")
+    print("="*100 + "\n")
+
+    return results
+
+
+def parse_args(argv=None):
+    """命令行参数：不指定批次时执行默认的单批次评估（含可视化）"""
+    parser = argparse.ArgumentParser(description='专家可信度评估')
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument('--batch', nargs='+', metavar='BATCH_ID', help='评估指定批次（结果写回同一批次）')
+    target.add_argument('--all-batches', action='store_true', help='评估全部批次')
+    parser.add_argument('--workers', type=int, default=None, help='并行进程数，默认CPU核数')
+    parser.add_argument('--no-save', action='store_true', help='只计算不写回数据库')
+    parser.add_argument('--verbose', action='store_true', help='输出各批次的详细计算过程')
+    parser.add_argument('--no-charts', action='store_true', help='单批次评估时不生成图表')
+    parser.add_argument('--show-charts', action='store_true', help='单批次评估时以交互窗口逐张显示图表')
+    parser.add_argument('--chart-workers', type=int, default=None, help='图表渲染进程数，默认CPU核数')
+    parser.add_argument('--bootstrap', type=int, default=None, metavar='N',
+                        help='计算β与综合可信度的Bootstrap置信区间（重抽样次数）')
+    parser.add_argument('--bootstrap-seed', type=int, default=None, help='Bootstrap随机种子')
+    parser.add_argument('--verbosity', type=int, choices=(REPORT_QUIET, REPORT_SUMMARY, REPORT_DETAIL),
+                        default=REPORT_DETAIL, help='单批次评估的控制台输出级别：0 不输出，1 汇总，2 明细（默认）')
+    parser.add_argument('--report', default=None, metavar='PATH',
+                        help='保存结构化报告（单批次为文件/目录，多批次为目录）')
+    parser.add_argument('--report-format', choices=('json', 'parquet'), default='json', help='结构化报告格式')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
     """主函数"""
+    args = parse_args(argv)
+    bootstrap = None
+    if args.bootstrap:
+        bootstrap = {'replicates': args.bootstrap, 'seed': args.bootstrap_seed}
+
+    if args.batch or args.all_batches:
+        return run_credibility_batches(
+            batch_ids=args.batch, workers=args.workers, save=not args.no_save, verbose=args.verbose,
+            bootstrap=bootstrap, report_dir=args.report, report_format=args.report_format
+        )
+
     # 创建评估器
-    evaluator = ExpertCredibilityEvaluator()
+    evaluator = ExpertCredibilityEvaluator(verbosity=args.verbosity)
     
     # 执行评估
-    results = evaluator.evaluate()
+    results = evaluator.evaluate(
+        visualize=not args.no_charts,
+        interactive_charts=args.show_charts,
+        chart_workers=args.chart_workers,
+        bootstrap=bootstrap,
+        report_path=args.report,
+        report_format=args.report_format
+    )
     
     # 返回结果（保存为变量）
     return results
 
 
 if __name__ == "__main__":
+    # 作为脚本运行时屏蔽计算/绘图过程中的警告输出（作为模块导入时不修改调用方的警告设置）
+    warnings.filterwarnings('ignore')
+
     # 执行评估
     expert_credibility_results = main()
     
     # 结果已保存在变量 expert_credibility_results 中
     print("\n结果已保存在变量: expert_credibility_results")
-    print(f"共评估 {len(expert_credibility_results)} 位专家")
+    if isinstance(expert_credibility_results, dict):
+        print(f"共评估 {len(expert_credibility_results)} 个批次")
+    else:
+        print(f"共评估 {len(expert_credibility_results)} 位专家")
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+评估脚本冷启动导入耗时检查
+
+Java 后端按请求以子进程方式启动各评估脚本，导入耗时直接计入每次请求的响应时间。
+本脚本在全新的解释器中逐个导入计算模块（python -X importtime），检查：
+1. 累计导入耗时不超过预算
+2. 导入后未加载 matplotlib（绘图模块应按需加载，见 lazy_pyplot.py）
+
+用法：
+    python check_import_time.py                # 使用默认预算
+    python check_import_time.py --budget 250   # 指定预算（毫秒）
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+# 需要检查的计算模块
+COMPUTE_MODULES = [
+    'calculate_expert_credibility',
+    'qualitative_data_analysis',
+    'calculate_effectiveness_with_penalty',
+    'pareto_analysis',
+]
+
+# 默认导入耗时预算（毫秒，含 numpy / 数据库驱动）
+DEFAULT_BUDGET_MS = 300
+
+# 取多次冷启动中的最小值，减少磁盘缓存等偶然因素的影响
+DEFAULT_REPEAT = 3
+
+OPERATION_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def measure_import(module_name):
+    """
+    在新解释器中导入模块
+
+    返回:
+        (累计导入耗时毫秒, 是否加载了matplotlib, 错误信息或 None)
+    """
+    code = f"import sys, {module_name}; print('matplotlib' in sys.modules)"
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=OPERATION_DIR, capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        return None, None, proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else 'import failed'
+
+    cumulative_us = None
+    for line in proc.stderr.splitlines():
+        # 格式: import time: self [us] | cumulative | imported package
+        parts = line.split('|')
+        if len(parts) == 3 and parts[2].strip() == module_name:
+            cumulative_us = int(parts[1].strip())
+    matplotlib_loaded = proc.stdout.strip().splitlines()[-1] == 'True'
+    return cumulative_us / 1000.0, matplotlib_loaded, None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='评估脚本导入耗时检查')
+    parser.add_argument('--budget', type=float, default=DEFAULT_BUDGET_MS, help='导入耗时预算（毫秒）')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help='每个模块测量次数（取最小值）')
+    args = parser.parse_args(argv)
+
+    print(f"导入耗时预算: {args.budget:.0f} ms")
+    print(f"  {'模块':<40} {'耗时(ms)':<12} {'matplotlib':<12} {'结果':<10}")
+    print("  " + "-"*80)
+
+    failed = False
+    for module_name in COMPUTE_MODULES:
+        timings = []
+        matplotlib_loaded, error = False, None
+        for _ in range(max(args.repeat, 1)):
+            elapsed_ms, loaded, error = measure_import(module_name)
+            if error is not None:
+                break
+            timings.append(elapsed_ms)
+            matplotlib_loaded = matplotlib_loaded or loaded
+
+        if error is not None:
+            print(f"  {module_name:<40} {'-':<12} {'-':<12} {'无法导入':<10} {error}")
+            failed = True
+            continue
+
+        elapsed_ms = min(timings)
+        ok = elapsed_ms <= args.budget and not matplotlib_loaded
+        failed = failed or not ok
+        print(f"  {module_name:<40} {elapsed_ms:<12.1f} {('已加载' if matplotlib_loaded else '未加载'):<12} "
+              f"{('通过' if ok else '超出预算'):<10}")
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""
+matplotlib 按需加载
+
+评估脚本被 Java 后端按请求以子进程方式调用时通常只做计算，
+matplotlib 的导入与字体设置只在第一次真正访问 plt 时发生。
+
+用法（与 import matplotlib.pyplot as plt 相同）：
+    plt = LazyPyplot(['SimHei'])
+    fig, ax = plt.subplots()
+"""
+
+import importlib
+
+
+class LazyPyplot:
+    """matplotlib.pyplot 的延迟代理：首次访问属性时导入并设置中文字体"""
+
+    def __init__(self, fonts=('SimHei',)):
+        """
+        参数:
+            fonts: rcParams['font.sans-serif'] 使用的字体列表
+        """
+        self._fonts = list(fonts)
+        self._module = None
+
+    @property
+    def loaded(self):
+        """是否已导入 matplotlib.pyplot"""
+        return self._module is not None
+
+    def _load(self):
+        if self._module is None:
+            module = importlib.import_module('matplotlib.pyplot')
+            # 设置中文字体
+            module.rcParams['font.sans-serif'] = self._fonts  # 用来正常显示中文标签
+            module.rcParams['axes.unicode_minus'] = False  # 用来正常显示负号
+            self._module = module
+        return self._module
+
+    def __getattr__(self, name):
+        if name.startswith('__') or name in ('_fonts', '_module'):
+            raise AttributeError(name)
+        return getattr(self._load(), name)
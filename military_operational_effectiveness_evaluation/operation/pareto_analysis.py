@@ -0,0 +1,436 @@
+# -*- coding: utf-8 -*-
+"""
+Pareto 前沿与支配关系分析
+
+单一的效费比会掩盖“高效能高成本”与“低效能低成本”方案之间的取舍，
+本模块在多个目标上给出非支配方案集合、支配深度与 ε 指标排名：
+
+1. 非支配集合
+   - 2 个目标：排序 + 扫描（skyline），O(n log n)
+   - 3 个及以上目标：去重并按字典序排序后分治（Kung 算法）。合并时前半部分的点在首个目标上
+     不劣于后半部分，问题化为剩余 k−1 个目标上的弱支配过滤，按中位数继续递归降维，
+     降到 2 维时排序 + 前缀最小值扫描，O(n log^(k−1) n)
+2. 支配深度（非支配排序的层号，1 为 Pareto 前沿）
+   - 2 个目标：排序后对各层当前最小值二分查找，O(n log n)
+   - 3 个及以上目标：按字典序依次加入，对层号二分查找（ENS-BS）
+3. ε 指标（加性 ε，目标按极差归一化）
+   - 被支配方案：各目标同时改进多少才能进入前沿
+   - 前沿方案：各目标同时变差多少才会被其他前沿方案支配（余量）
+
+目标方向通过 senses 指定：'max' 越大越好，'min' 越小越好。
+
+用法：
+    analysis = analyze_tradeoffs(operation_ids, np.column_stack([final_scores, costs]),
+                                 senses=['max', 'min'], names=['最终得分', '归一化成本'])
+"""
+
+from bisect import bisect_right
+
+import numpy as np
+
+# Kung 分治的叶子规模：不超过该规模时直接做两两比较
+KUNG_LEAF_SIZE = 64
+
+# 两两支配比较分块计算时单块的最大元素数（点数 × 比较对象数 × 目标数）
+DOMINANCE_CHUNK_CELLS = 4_000_000
+
+# ε 指标分块计算时单块的最大元素数（方案数 × 前沿规模 × 目标数）
+EPSILON_CHUNK_CELLS = 4_000_000
+
+
+def to_minimization(objectives, senses=None):
+    """
+    将目标矩阵统一转换为“越小越好”
+
+    参数:
+        objectives: n × k 目标矩阵
+        senses: 长度 k 的 'max' / 'min' 列表，默认全部为 'min'
+
+    返回:
+        n × k 浮点矩阵（'max' 目标取负）
+    """
+    objectives = np.asarray(objectives, dtype=float)
+    if objectives.ndim != 2:
+        raise ValueError(f"目标矩阵必须为二维 (n × k)，实际维度: {objectives.ndim}")
+    if np.isnan(objectives).any():
+        raise ValueError("目标矩阵中存在缺失值 (nan)")
+    if senses is None:
+        return objectives.copy()
+
+    if len(senses) != objectives.shape[1]:
+        raise ValueError(f"senses 长度 {len(senses)} 与目标数 {objectives.shape[1]} 不一致")
+    for sense in senses:
+        if sense not in ('max', 'min'):
+            raise ValueError(f"无效的目标方向: {sense}")
+    signs = np.array([-1.0 if sense == 'max' else 1.0 for sense in senses])
+    return objectives * signs
+
+
+def _dominated_by_any(points, others, strict=True):
+    """
+    points 中每个点是否被 others 中任一点支配（两两比较，按行分块避免大张量）
+
+    strict=False 时只要求各分量 ≤（弱支配），供 Kung 合并中已去重的点使用
+    """
+    n, k = points.shape
+    result = np.zeros(n, dtype=bool)
+    if n == 0 or len(others) == 0:
+        return result
+
+    step = max(1, DOMINANCE_CHUNK_CELLS // max(len(others) * k, 1))
+    for start in range(0, n, step):
+        block = points[start:start + step, np.newaxis, :]
+        hit = (others[np.newaxis, :, :] <= block).all(axis=2)
+        if strict:
+            hit &= (others[np.newaxis, :, :] < block).any(axis=2)
+        result[start:start + step] = hit.any(axis=1)
+    return result
+
+
+def _front_2d(f1, f2):
+    """
+    2 个目标的非支配掩码（已转为越小越好），排序 + 扫描 O(n log n)
+
+    按 (f1, f2) 升序排列后，点 i 被支配当且仅当之前某点的 f2 更小，
+    或之前 f2 最小的点与其 f2 相同但 f1 更小（完全相同的点互不支配）
+    """
+    n = len(f1)
+    order = np.lexsort((f2, f1))
+    s1, s2 = f1[order], f2[order]
+
+    running_min = np.minimum.accumulate(s2)
+    prior_min = np.concatenate(([np.inf], running_min[:-1]))
+
+    # 每个位置之前首次取得当前最小 f2 的位置（f1 在同 f2 值中最小）
+    new_min = s2 < prior_min
+    first_at = np.maximum.accumulate(np.where(new_min, np.arange(n), 0))
+    prior_first = np.concatenate(([0], first_at[:-1]))
+
+    dominated = (prior_min < s2) | ((prior_min == s2) & (s1[prior_first] < s1))
+
+    mask = np.empty(n, dtype=bool)
+    mask[order] = ~dominated
+    return mask
+
+
+def _covered_2d(points, others):
+    """
+    2 维弱支配过滤：points 中每个点是否存在 others 中的点两个分量都不大于它
+
+    others 按第 1 分量排序后取第 2 分量的前缀最小值，对每个点二分查找，O((n + m) log m)
+    """
+    order = np.argsort(others[:, 0], kind='stable')
+    first = others[order, 0]
+    prefix_min = np.minimum.accumulate(others[order, 1])
+
+    count = np.searchsorted(first, points[:, 0], side='right')
+    covered = np.zeros(len(points), dtype=bool)
+    has = count > 0
+    covered[has] = prefix_min[count[has] - 1] <= points[has, 1]
+    return covered
+
+
+def _kung_filter(points, others):
+    """
+    Kung 合并步骤：points 中每个点是否被 others 中某点弱支配（各分量 ≤）
+
+    按首个分量的中位数把两组点各分为低、高两半：
+    - 低半的点只可能被低半的 others 覆盖（同维度递归）
+    - 高半的点可能被高半的 others 覆盖（同维度递归），
+      也可能被低半的 others 覆盖，此时首个分量必然满足，只需比较剩余分量（降一维递归）
+    """
+    n, d = points.shape
+    if n == 0 or len(others) == 0:
+        return np.zeros(n, dtype=bool)
+    if d == 1:
+        return others[:, 0].min() <= points[:, 0]
+    if d == 2:
+        return _covered_2d(points, others)
+    if n <= KUNG_LEAF_SIZE or len(others) <= KUNG_LEAF_SIZE:
+        return _dominated_by_any(points, others, strict=False)
+
+    first, other_first = points[:, 0], others[:, 0]
+    if other_first.max() <= first.min():
+        # 首个分量对所有点对都满足
+        return _kung_filter(points[:, 1:], others[:, 1:])
+    if other_first.min() > first.max():
+        return np.zeros(n, dtype=bool)
+
+    # 以中位数划分；中位数等于最小值时改用 ≤，保证两半都非空（上面已排除全部相等的情况）
+    values = np.concatenate((first, other_first))
+    median = np.partition(values, len(values) // 2)[len(values) // 2]
+    if median > values.min():
+        low, other_low = first < median, other_first < median
+    else:
+        low, other_low = first <= median, other_first <= median
+
+    covered = np.zeros(n, dtype=bool)
+    covered[low] = _kung_filter(points[low], others[other_low])
+
+    high = np.nonzero(~low)[0]
+    high_covered = _kung_filter(points[high], others[~other_low])
+    rest = np.nonzero(~high_covered)[0]
+    high_covered[rest] = _kung_filter(points[high[rest], 1:], others[other_low, 1:])
+    covered[high] = high_covered
+    return covered
+
+
+def _front_kung(points):
+    """
+    Kung 分治：points 已去重并按字典序排列，返回非支配点的下标（相对 points）
+
+    字典序靠后的点不可能支配靠前的点，因此只需用前半部分的前沿过滤后半部分的前沿；
+    前半部分的点首个分量不大于后半部分且两点不同，支配关系化为剩余分量上的弱支配
+    """
+    n = len(points)
+    if n <= KUNG_LEAF_SIZE:
+        return np.nonzero(~_dominated_by_any(points, points))[0]
+
+    half = n // 2
+    top = _front_kung(points[:half])
+    bottom = _front_kung(points[half:]) + half
+    covered = _kung_filter(points[bottom, 1:], points[top, 1:])
+    return np.concatenate((top, bottom[~covered]))
+
+
+def non_dominated_mask(objectives, senses=None):
+    """
+    非支配（Pareto 前沿）掩码
+
+    参数:
+        objectives: n × k 目标矩阵
+        senses: 各目标方向（'max' / 'min'），默认全部为 'min'
+
+    返回:
+        长度 n 的布尔数组，True 表示该方案不被任何方案支配
+    """
+    points = to_minimization(objectives, senses)
+    n, k = points.shape
+    if n == 0:
+        return np.zeros(0, dtype=bool)
+    if k == 1:
+        return points[:, 0] == points[:, 0].min()
+    if k == 2:
+        return _front_2d(points[:, 0], points[:, 1])
+
+    # 完全相同的点互不支配，去重后结果相同；np.unique 的结果已按字典序排列
+    unique, inverse = np.unique(points, axis=0, return_inverse=True)
+    mask = np.zeros(len(unique), dtype=bool)
+    mask[_front_kung(unique)] = True
+    return mask[inverse.reshape(-1)]
+
+
+def pareto_front(objectives, senses=None):
+    """Pareto 前沿方案的下标（升序）"""
+    return np.nonzero(non_dominated_mask(objectives, senses))[0]
+
+
+def _depth_2d(points):
+    """
+    2 个目标的支配深度，O(n log n)
+
+    去重后按 (f1, f2) 升序加入：之前的点 f1 均不大于当前点，
+    第 j 层被当前点“支配”当且仅当该层已有点的 f2 ≤ 当前 f2；
+    各层的最小 f2 随层号递增，二分查找第一个最小 f2 > 当前 f2 的层
+    """
+    # np.unique 的结果已按字典序 (f1, f2) 排列
+    unique, inverse = np.unique(points, axis=0, return_inverse=True)
+
+    front_mins = []
+    depth_unique = np.empty(len(unique), dtype=int)
+    for idx, f2 in enumerate(unique[:, 1].tolist()):
+        level = bisect_right(front_mins, f2)
+        if level == len(front_mins):
+            front_mins.append(f2)
+        else:
+            front_mins[level] = f2
+        depth_unique[idx] = level + 1
+
+    return depth_unique[inverse.reshape(-1)]
+
+
+class _FrontBuffer:
+    """支配深度计算中单层的点集（容量倍增的数组，避免反复拼接）"""
+
+    def __init__(self, k):
+        self.points = np.empty((16, k))
+        self.size = 0
+
+    def append(self, point):
+        if self.size == len(self.points):
+            self.points = np.concatenate((self.points, np.empty_like(self.points)))
+        self.points[self.size] = point
+        self.size += 1
+
+    def dominates(self, point):
+        # 点已去重，且层内点均在 point 之前加入（字典序更小），因此各分量 ≤ 即为支配
+        return bool((self.points[:self.size] <= point).all(axis=1).any())
+
+
+def _depth_ens(points):
+    """
+    3 个及以上目标的支配深度（ENS-BS）
+
+    去重后按字典序依次加入：已加入的点都不会被当前点支配；
+    若第 j 层中有点支配当前点，则第 j 层之前的各层也有，因此可对层号二分查找
+    """
+    unique, inverse = np.unique(points, axis=0, return_inverse=True)
+    k = unique.shape[1]
+    fronts = []
+    depth = np.empty(len(unique), dtype=int)
+
+    # np.unique 的结果已按字典序排列
+    for idx, point in enumerate(unique):
+        low, high = 0, len(fronts)
+        while low < high:
+            mid = (low + high) // 2
+            if fronts[mid].dominates(point):
+                low = mid + 1
+            else:
+                high = mid
+        if low == len(fronts):
+            fronts.append(_FrontBuffer(k))
+        fronts[low].append(point)
+        depth[idx] = low + 1
+
+    return depth[inverse.reshape(-1)]
+
+
+def dominance_depth(objectives, senses=None):
+    """
+    支配深度（非支配排序层号）
+
+    参数:
+        objectives: n × k 目标矩阵
+        senses: 各目标方向（'max' / 'min'），默认全部为 'min'
+
+    返回:
+        长度 n 的整数数组，1 表示 Pareto 前沿，2 表示去掉前沿后的前沿，依此类推
+    """
+    points = to_minimization(objectives, senses)
+    n, k = points.shape
+    if n == 0:
+        return np.zeros(0, dtype=int)
+    if k == 1:
+        return np.unique(points[:, 0], return_inverse=True)[1].reshape(-1) + 1
+    if k == 2:
+        return _depth_2d(points)
+    return _depth_ens(points)
+
+
+def _normalize_range(points):
+    """按各目标极差归一化到 [0, 1]（极差为0的目标记为0）"""
+    low = points.min(axis=0)
+    spread = points.max(axis=0) - low
+    return np.divide(points - low, spread, out=np.zeros_like(points), where=spread > 0)
+
+
+def _min_max_difference(rows, columns, exclude_self=None):
+    """
+    对 rows 中每个点 a 计算 min_q max_i (q_i − a_i)（q 取自 columns），按行分块避免大张量
+
+    exclude_self: rows 中各点在 columns 中的下标（-1 表示不在其中），自身不参与最小值
+    """
+    n, k = rows.shape
+    result = np.empty(n)
+    step = max(1, EPSILON_CHUNK_CELLS // max(len(columns) * k, 1))
+
+    for start in range(0, n, step):
+        block = rows[start:start + step]
+        diff = (columns[np.newaxis, :, :] - block[:, np.newaxis, :]).max(axis=2)
+        if exclude_self is not None:
+            own = exclude_self[start:start + step]
+            has_own = np.nonzero(own >= 0)[0]
+            diff[has_own, own[has_own]] = np.inf
+        result[start:start + step] = diff.min(axis=1, initial=np.inf)
+    return result
+
+
+def epsilon_indicator(objectives, senses=None, front_mask=None, normalize=True):
+    """
+    加性 ε 指标
+
+    - 被支配方案 a：ε(a) = max_p min_i (a_i − p_i)（p 为前沿方案），
+      即各目标同时改进 ε 后恰好不再被前沿支配；前沿方案 ε = 0
+    - 前沿方案 a：余量 δ(a) = min_q max_i (q_i − a_i)（q 为其他前沿方案），
+      即各目标同时变差 δ 后才会被其他前沿方案支配；前沿只有一个方案时为 inf
+
+    参数:
+        objectives: n × k 目标矩阵
+        senses: 各目标方向（'max' / 'min'），默认全部为 'min'
+        front_mask: 非支配掩码，默认调用 non_dominated_mask 计算
+        normalize: 是否按各目标极差归一化后再计算（不同量纲的目标应归一化）
+
+    返回:
+        dict: epsilon（长度 n，前沿为0）, margin（长度 n，非前沿为 nan）,
+              score（前沿为余量、非前沿为 −ε，越大越好）, rank（按 score 降序的名次，1 为最好）
+    """
+    points = to_minimization(objectives, senses)
+    if normalize and len(points):
+        points = _normalize_range(points)
+    if front_mask is None:
+        front_mask = non_dominated_mask(points)
+
+    n = len(points)
+    front_idx = np.nonzero(front_mask)[0]
+    front = points[front_idx]
+
+    epsilon = np.zeros(n)
+    margin = np.full(n, np.nan)
+
+    dominated_idx = np.nonzero(~front_mask)[0]
+    if len(dominated_idx):
+        # max_p min_i (a_i − p_i) = max_p ( −max_i (p_i − a_i) )
+        epsilon[dominated_idx] = np.maximum(-_min_max_difference(points[dominated_idx], front), 0.0)
+
+    if len(front_idx):
+        margin[front_idx] = _min_max_difference(front, front, exclude_self=np.arange(len(front_idx)))
+
+    score = np.where(front_mask, margin, -epsilon)
+    order = np.argsort(-score, kind='stable')
+    rank = np.empty(n, dtype=int)
+    rank[order] = np.arange(1, n + 1)
+
+    return {'epsilon': epsilon, 'margin': margin, 'score': score, 'rank': rank}
+
+
+def analyze_tradeoffs(operation_ids, objectives, senses=None, names=None, normalize=True):
+    """
+    多目标取舍分析：Pareto 前沿、支配深度与 ε 指标排名
+
+    参数:
+        operation_ids: 方案（实验）ID 列表
+        objectives: n × k 目标矩阵
+        senses: 各目标方向（'max' / 'min'），默认全部为 'min'
+        names: 各目标名称（用于输出）
+        normalize: ε 指标是否按各目标极差归一化
+
+    返回:
+        dict: names, senses, operation_ids, front_mask, front_ids, depth, epsilon, margin,
+              epsilon_score, epsilon_rank, ranking（按 ε 名次排列的方案ID）
+    """
+    objectives = np.asarray(objectives, dtype=float)
+    k = objectives.shape[1]
+    senses = list(senses) if senses is not None else ['min'] * k
+    names = list(names) if names is not None else [f'目标{i + 1}' for i in range(k)]
+    operation_ids = list(operation_ids)
+
+    front_mask = non_dominated_mask(objectives, senses)
+    depth = dominance_depth(objectives, senses)
+    epsilon = epsilon_indicator(objectives, senses, front_mask=front_mask, normalize=normalize)
+
+    ranking = np.argsort(epsilon['rank'], kind='stable')
+    return {
+        'names': names,
+        'senses': senses,
+        'operation_ids': operation_ids,
+        'objectives': objectives,
+        'front_mask': front_mask,
+        'front_ids': [operation_ids[i] for i in np.nonzero(front_mask)[0]],
+        'depth': depth,
+        'epsilon': epsilon['epsilon'],
+        'margin': epsilon['margin'],
+        'epsilon_score': epsilon['score'],
+        'epsilon_rank': epsilon['rank'],
+        'ranking': [operation_ids[i] for i in ranking]
+    }
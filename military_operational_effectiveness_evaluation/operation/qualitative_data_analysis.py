@@ -16,13 +16,12 @@ from datetime import datetime
 from typing import Dict, List, Tuple, Optional, Any
 import pymysql
 from pymysql.cursors import DictCursor
-import matplotlib.pyplot as plt
 import numpy as np
-from matplotlib import rcParams
 
-# 与 calculate_expert_credibility.py 一致：中文字体，避免乱码
-rcParams['font.sans-serif'] = ['SimHei']  # 用来正常显示中文标签
-rcParams['axes.unicode_minus'] = False     # 用来正常显示负号
+from lazy_pyplot import LazyPyplot
+
+# matplotlib 仅在可视化时导入；与 calculate_expert_credibility.py 一致：中文字体，避免乱码
+plt = LazyPyplot(['SimHei'])
 
 
 # =====================================================
@@ -854,8 +853,8 @@ class QualitativeAggregationVisualizer:
         os.makedirs(output_dir, exist_ok=True)
         plt.style.use('seaborn-v0_8-whitegrid')
         # 画图风格可能覆盖字体，此处与 calculate_expert_credibility.py 保持一致，避免中文乱码
-        rcParams['font.sans-serif'] = ['SimHei']
-        rcParams['axes.unicode_minus'] = False
+        plt.rcParams['font.sans-serif'] = ['SimHei']
+        plt.rcParams['axes.unicode_minus'] = False
 
     def load_aggregation_results(
         self,
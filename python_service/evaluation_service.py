@@ -9,11 +9,32 @@
 2. 从数据库读取基础数据
 3. 执行完整的评估计算（AHP + 熵权法 + 综合评分）
 4. 返回评估结果（JSON）
+
+运行方式：
+1. 单次调用：python evaluation_service.py < request.json（stdin 输入，stdout 输出）
+2. 常驻服务：python evaluation_service.py --serve [--host 127.0.0.1] [--port 8765]
+   POST /evaluate 的请求体/响应体与单次调用的 stdin/stdout 完全一致，
+   进程常驻，模块与数据库连接池在多次请求之间复用
+
+数据源（环境变量）：
+    DB_HOST / DB_PORT / DB_NAME / DB_USER / DB_PASS  数据库连接
+    DB_READ_HOST / DB_READ_PORT                      只读副本（优先于 DB_HOST / DB_PORT）
+    DB_POOL_SIZE                                     连接池大小（默认 4）
+    EVAL_DATA_SNAPSHOT                               本地快照文件（.csv / .parquet），配置后不访问数据库
 """
 
 import sys
+import os
 import json
-import mysql.connector
+import argparse
+import contextlib
+import functools
+import itertools
+import math
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from mysql.connector import pooling
 import pandas as pd
 import numpy as np
 from datetime import datetime
@@ -24,13 +45,44 @@ warnings.filterwarnings('ignore')
 # 数据库配置
 # ============================================================================
 
-DB_CONFIG = {
-    'host': 'localhost',
-    'user': 'root',
-    'password': 'root',
-    'database': 'military_communication_effectiveness',
-    'charset': 'utf8mb4'
-}
+def get_db_config():
+    """
+    从环境变量获取数据库配置（变量名与 generate_all_data.get_db_config 一致）
+    
+    配置了 DB_READ_HOST / DB_READ_PORT 时从只读副本读取
+    """
+    return {
+        'host': os.environ.get('DB_READ_HOST') or os.environ.get('DB_HOST', 'localhost'),
+        'port': int(os.environ.get('DB_READ_PORT') or os.environ.get('DB_PORT', '3306')),
+        'database': os.environ.get('DB_NAME', 'military_communication_effectiveness'),
+        'user': os.environ.get('DB_USER', 'root'),
+        'password': os.environ.get('DB_PASS', 'root'),
+        'charset': 'utf8mb4'
+    }
+
+
+DB_CONFIG = get_db_config()
+
+# 连接池大小（常驻服务下并发评估请求共享）
+DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', '4'))
+
+# 本地快照文件（.csv / .parquet），配置后不再访问数据库
+DATA_SNAPSHOT_PATH = os.environ.get('EVAL_DATA_SNAPSHOT', '')
+
+# ============================================================================
+# 调试日志
+# ============================================================================
+
+# 调试日志默认关闭；通过 --verbose 或环境变量 EVAL_SERVICE_VERBOSE=1 开启
+VERBOSE = os.environ.get('EVAL_SERVICE_VERBOSE', '0') == '1'
+
+
+def debug_log(template, *args):
+    """输出 [DEBUG] 日志到 stderr，仅在开启调试时才格式化参数"""
+    if not VERBOSE:
+        return
+    sys.stderr.write(f"[DEBUG] {template.format(*args)}\n")
+    sys.stderr.flush()
 
 # ============================================================================
 # 指标体系定义
@@ -100,6 +152,9 @@ INDICATOR_SYSTEM = {
     }
 }
 
+# 固定维度顺序（与前端一致）
+DIMENSION_CODES = ['RL', 'SC', 'AJ', 'EF', 'PO', 'NC', 'HO', 'RS']
+
 # 需要对数变换的指标
 LOGARITHMIC_INDICATORS = {'EF_avg_ber', 'EF_avg_plr'}
 
@@ -107,23 +162,153 @@ LOGARITHMIC_INDICATORS = {'EF_avg_ber', 'EF_avg_plr'}
 # 数据提取
 # ============================================================================
 
+# 常驻服务模式下复用连接池，避免每次评估都重新握手
+_db_pool = None
+_db_pool_lock = threading.Lock()
+# 连接池耗尽时 get_connection 会直接报错，用信号量让并发请求排队等待
+_db_pool_slots = threading.BoundedSemaphore(DB_POOL_SIZE)
+
+# 评估所需的列
+EVALUATION_COLUMNS = (
+    ['evaluation_id', 'test_id', 'scenario_id']
+    + [ind['code'] for dim_info in INDICATOR_SYSTEM.values() for ind in dim_info['indicators']]
+    + ['total_communications', 'total_lifecycles']
+)
+
+
+def get_db_pool():
+    """获取（首次调用时创建）数据库连接池"""
+    global _db_pool
+    with _db_pool_lock:
+        if _db_pool is None:
+            _db_pool = pooling.MySQLConnectionPool(
+                pool_name='evaluation_service',
+                pool_size=DB_POOL_SIZE,
+                **DB_CONFIG
+            )
+        return _db_pool
+
+
+@contextlib.contextmanager
+def db_connection():
+    """从连接池借出一个经过健康检查的连接，用完自动归还"""
+    with _db_pool_slots:
+        conn = get_db_pool().get_connection()
+        try:
+            # 健康检查：连接已断开时自动重连
+            conn.ping(reconnect=True, attempts=2, delay=0)
+            yield conn
+            # 结束隐式事务，保证下一次查询能读到最新数据
+            conn.commit()
+        finally:
+            conn.close()  # 归还到连接池
+
+
+def close_db_pool():
+    """释放连接池引用（连接随进程退出关闭）"""
+    global _db_pool
+    with _db_pool_lock:
+        _db_pool = None
+
+
+def check_db_health():
+    """数据源健康检查"""
+    if DATA_SNAPSHOT_PATH:
+        ok = os.path.isfile(DATA_SNAPSHOT_PATH)
+        return {'source': 'snapshot', 'path': DATA_SNAPSHOT_PATH, 'status': 'UP' if ok else 'DOWN'}
+    try:
+        with db_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute("SELECT 1")
+                cursor.fetchall()
+            finally:
+                cursor.close()
+        return {'source': 'mysql', 'host': DB_CONFIG['host'], 'poolSize': DB_POOL_SIZE, 'status': 'UP'}
+    except Exception as e:
+        return {'source': 'mysql', 'host': DB_CONFIG['host'], 'status': 'DOWN', 'error': str(e)}
+
+
+def read_snapshot(path):
+    """读取本地快照文件中的评估数据"""
+    if path.endswith('.parquet'):
+        df = pd.read_parquet(path)
+    else:
+        df = pd.read_csv(path)
+    return df[[c for c in EVALUATION_COLUMNS if c in df.columns]]
+
+
 def extract_data_from_database():
-    """从 military_effectiveness_evaluation 表读取数据"""
-    conn = mysql.connector.connect(**DB_CONFIG)
-    
-    # 获取所有列名
-    indicator_cols = []
-    for dim_info in INDICATOR_SYSTEM.values():
-        for ind in dim_info['indicators']:
-            indicator_cols.append(ind['code'])
+    """从 military_effectiveness_evaluation 表（或本地快照）读取数据"""
+    if DATA_SNAPSHOT_PATH:
+        return read_snapshot(DATA_SNAPSHOT_PATH)
     
     # 构建查询
-    cols_str = ', '.join(['evaluation_id', 'test_id', 'scenario_id'] + indicator_cols + 
-                         ['total_communications', 'total_lifecycles'])
+    cols_str = ', '.join(EVALUATION_COLUMNS)
     query = f"SELECT {cols_str} FROM military_effectiveness_evaluation"
     
-    df = pd.read_sql(query, conn)
-    conn.close()
+    with db_connection() as conn:
+        df = pd.read_sql(query, conn)
+    
+    return df
+
+
+def get_data_version():
+    """
+    获取评估数据的版本标识（行数 + 最大 evaluation_id + 最大 updated_at）
+    
+    任意一行新增、删除或更新都会改变该标识，用于判断缓存是否失效；
+    使用快照文件时以文件修改时间和大小作为版本
+    """
+    if DATA_SNAPSHOT_PATH:
+        stat = os.stat(DATA_SNAPSHOT_PATH)
+        return ('snapshot', str(stat.st_mtime_ns), str(stat.st_size))
+    
+    query = ("SELECT COUNT(*), MAX(evaluation_id), MAX(updated_at) "
+             "FROM military_effectiveness_evaluation")
+    with db_connection() as conn:
+        cursor = conn.cursor()
+        try:
+            cursor.execute(query)
+            row = cursor.fetchone()
+        finally:
+            cursor.close()
+    
+    return tuple(str(v) for v in row)
+
+
+def is_append_only(old_version, new_version):
+    """
+    判断数据变化是否只是追加了新行（旧行未被修改或删除）
+    
+    条件：evaluation_id 不超过旧最大值的行数与最大 updated_at 均与旧版本一致，且总行数增加
+    """
+    if DATA_SNAPSHOT_PATH or old_version is None or old_version[1] == 'None':
+        return False
+    if int(new_version[0]) <= int(old_version[0]):
+        return False
+    
+    query = ("SELECT COUNT(*), MAX(updated_at) FROM military_effectiveness_evaluation "
+             "WHERE evaluation_id <= %s")
+    with db_connection() as conn:
+        cursor = conn.cursor()
+        try:
+            cursor.execute(query, (int(old_version[1]),))
+            row = cursor.fetchone()
+        finally:
+            cursor.close()
+    
+    return (str(row[0]), str(row[1])) == (old_version[0], old_version[2])
+
+
+def extract_appended_rows(after_evaluation_id):
+    """读取 evaluation_id 大于给定值的新增行"""
+    cols_str = ', '.join(EVALUATION_COLUMNS)
+    query = (f"SELECT {cols_str} FROM military_effectiveness_evaluation "
+             f"WHERE evaluation_id > %s ORDER BY evaluation_id")
+    
+    with db_connection() as conn:
+        df = pd.read_sql(query, conn, params=(int(after_evaluation_id),))
     
     return df
 
@@ -213,6 +398,204 @@ def calculate_entropy_weights(df_norm, indicator_system):
     
     return indicator_weights
 
+# ============================================================================
+# 增量标准化与熵权
+# ============================================================================
+
+class IncrementalPreparedData:
+    """
+    追加新行时增量维护标准化矩阵与熵权
+    
+    每列保存（对数变换后的）最小值、最大值，以及熵权所需的累计量：
+        S = Σx，T = Σ x·ln x（x = 归一化值 / 100，仅 x > 0 的项）
+    则 Σ p·ln p = T / S - ln S。追加行未改变某列极值时只需归一化新行并累加 S、T，
+    极值变化的列才整体重新归一化。数据含缺失值时不适用，由调用方回退为全量计算。
+    """
+
+    def __init__(self, df_raw):
+        self.codes = [ind['code'] for dim_info in INDICATOR_SYSTEM.values()
+                      for ind in dim_info['indicators']]
+        self.directions = np.array([
+            ind['direction'] == 'max' for dim_info in INDICATOR_SYSTEM.values()
+            for ind in dim_info['indicators']
+        ])
+        self.df_raw = df_raw.reset_index(drop=True)
+        self.values = self._transform(self.df_raw)
+        self.min = self.values.min(axis=0)
+        self.max = self.values.max(axis=0)
+        self.normalized = self._normalize(self.values, np.arange(len(self.codes)))
+        self.sum_x, self.sum_xlogx = self._entropy_sums(self.normalized)
+
+    @staticmethod
+    def supports(df):
+        """增量模式要求指标列完整且无缺失值"""
+        return all(code in df.columns for code in EVALUATION_COLUMNS[3:-2]) and \
+            not df[EVALUATION_COLUMNS[3:-2]].isna().any().any()
+
+    @property
+    def max_evaluation_id(self):
+        return int(self.df_raw['evaluation_id'].max())
+
+    def _transform(self, df):
+        """取出指标列，并对误码率、丢包率做与 normalize_indicator 相同的对数变换"""
+        # copy=True：pandas 写时复制下 to_numpy 可能返回只读视图，后续要原地做对数变换
+        values = df[self.codes].to_numpy(dtype=float, copy=True)
+        for j, code in enumerate(self.codes):
+            if code in LOGARITHMIC_INDICATORS:
+                values[:, j] = -np.log10(values[:, j] + 1e-10)
+        return values
+
+    def _normalize(self, values, cols):
+        """按当前极值把 values 的 cols 列归一化到 0-100，极值相等的列取 50"""
+        mn = self.min[cols]
+        span = self.max[cols] - mn
+        flat = span == 0
+        safe_span = np.where(flat, 1.0, span)
+        scaled = (values[:, cols] - mn) / safe_span * 100
+        normalized = np.where(self.directions[cols], scaled, 100 - scaled)
+        normalized[:, flat] = 50.0
+        return normalized
+
+    @staticmethod
+    def _entropy_sums(normalized):
+        x = normalized / 100.0
+        positive = x > 0
+        xlogx = np.where(positive, x * np.log(np.where(positive, x, 1.0)), 0.0)
+        return x.sum(axis=0), xlogx.sum(axis=0)
+
+    def append(self, df_new):
+        """追加新行，返回整体重新归一化的列代码"""
+        if len(df_new) == 0:
+            return []
+        new_values = self._transform(df_new)
+        new_min = np.minimum(self.min, new_values.min(axis=0))
+        new_max = np.maximum(self.max, new_values.max(axis=0))
+        moved = (new_min != self.min) | (new_max != self.max)
+        self.min, self.max = new_min, new_max
+        
+        self.df_raw = pd.concat([self.df_raw, df_new], ignore_index=True)
+        self.values = np.vstack([self.values, new_values])
+        
+        # 极值未变化的列：只归一化新行并累加
+        all_cols = np.arange(len(self.codes))
+        new_normalized = self._normalize(new_values, all_cols)
+        new_sum_x, new_sum_xlogx = self._entropy_sums(new_normalized)
+        self.normalized = np.vstack([self.normalized, new_normalized])
+        self.sum_x = self.sum_x + new_sum_x
+        self.sum_xlogx = self.sum_xlogx + new_sum_xlogx
+        
+        # 极值变化的列：整列重新归一化并重算累计量
+        moved_cols = all_cols[moved]
+        if len(moved_cols):
+            self.normalized[:, moved_cols] = self._normalize(self.values, moved_cols)
+            self.sum_x[moved_cols], self.sum_xlogx[moved_cols] = \
+                self._entropy_sums(self.normalized[:, moved_cols])
+        
+        return [self.codes[j] for j in moved_cols]
+
+    def entropy_weights(self):
+        """由累计量计算各维度内部的熵权，结果与 calculate_entropy_weights 一致"""
+        n_samples = len(self.normalized)
+        k = 1 / np.log(n_samples)
+        safe_sum = np.where(self.sum_x == 0, 1.0, self.sum_x)
+        entropy = np.where(
+            self.sum_x == 0, 0.0,
+            -k * (self.sum_xlogx / safe_sum - np.log(safe_sum))
+        )
+        
+        indicator_weights = {}
+        j = 0
+        for dim_info in INDICATOR_SYSTEM.values():
+            m = len(dim_info['indicators'])
+            dim_codes = self.codes[j:j + m]
+            if m == 1:
+                indicator_weights[dim_codes[0]] = 1.0
+            else:
+                d = 1 - entropy[j:j + m]
+                weights = np.ones(m) / m if d.sum() == 0 else d / d.sum()
+                for code, w in zip(dim_codes, weights):
+                    indicator_weights[code] = float(w)
+            j += m
+        return indicator_weights
+
+    def prepared(self):
+        """返回与 load_prepared_data 相同结构的 (df_raw, df_normalized, 熵权)"""
+        df_normalized = self.df_raw[['evaluation_id', 'test_id', 'scenario_id']].copy()
+        df_normalized[self.codes] = self.normalized
+        return self.df_raw, df_normalized, self.entropy_weights()
+
+# ============================================================================
+# 与优先级无关的中间结果缓存
+# ============================================================================
+
+# 原始数据、标准化数据、熵权都与 AHP 优先级无关，按数据版本缓存；
+# 优先级变化时只需重新计算 AHP 权重和加权求和
+_prepared_cache = {'version': None, 'data': None, 'state': None}
+_prepared_lock = threading.Lock()
+
+# 增量模式：数据只追加新行时增量更新标准化矩阵与熵权（--incremental 或 EVAL_INCREMENTAL=1）
+INCREMENTAL_MODE = os.environ.get('EVAL_INCREMENTAL', '0') == '1'
+
+
+def _prepare_full(df_raw):
+    """全量计算标准化数据与熵权"""
+    if len(df_raw) == 0:
+        return (df_raw, None, None)
+    df_normalized = normalize_data(df_raw)
+    indicator_entropy_weights = calculate_entropy_weights(df_normalized, INDICATOR_SYSTEM)
+    return (df_raw, df_normalized, indicator_entropy_weights)
+
+
+def _prepare_incremental(old_version, version):
+    """增量模式下更新缓存状态，无法增量时回退为全量计算"""
+    state = _prepared_cache['state']
+    if state is not None and is_append_only(old_version, version):
+        df_new = extract_appended_rows(state.max_evaluation_id)
+        if IncrementalPreparedData.supports(df_new):
+            moved = state.append(df_new)
+            debug_log("增量追加 {} 行，重新归一化的列: {}", len(df_new), moved)
+            return state.prepared()
+    
+    df_raw = extract_data_from_database()
+    if len(df_raw) > 0 and IncrementalPreparedData.supports(df_raw):
+        state = IncrementalPreparedData(df_raw)
+        _prepared_cache['state'] = state
+        return state.prepared()
+    
+    _prepared_cache['state'] = None
+    return _prepare_full(df_raw)
+
+
+def load_prepared_data():
+    """
+    获取 (原始数据, 标准化数据, 熵权)，数据版本未变化时直接复用缓存
+    
+    返回:
+        (df_raw, df_normalized, indicator_entropy_weights)；无数据时 df_raw 为空表
+    """
+    version = get_data_version()
+    
+    with _prepared_lock:
+        if _prepared_cache['version'] == version:
+            return _prepared_cache['data']
+        
+        if INCREMENTAL_MODE:
+            data = _prepare_incremental(_prepared_cache['version'], version)
+        else:
+            data = _prepare_full(extract_data_from_database())
+        
+        _prepared_cache['version'] = version
+        _prepared_cache['data'] = data
+        return data
+
+
+def clear_prepared_cache():
+    """清空中间结果缓存"""
+    with _prepared_lock:
+        _prepared_cache['version'] = None
+        _prepared_cache['data'] = None
+        _prepared_cache['state'] = None
+
 # ============================================================================
 # AHP 计算一级权重
 # ============================================================================
@@ -228,16 +611,14 @@ def build_ahp_matrix(priorities):
         numpy 数组形式的判断矩阵和维度代码列表
     """
     # 调试日志
-    sys.stderr.write(f"[DEBUG] build_ahp_matrix 接收到的 priorities: {priorities}\n")
-    sys.stderr.flush()
+    debug_log("build_ahp_matrix 接收到的 priorities: {}", priorities)
     
     # 固定维度顺序（与前端一致）
-    dim_codes = ['RL', 'SC', 'AJ', 'EF', 'PO', 'NC', 'HO', 'RS']
+    dim_codes = list(DIMENSION_CODES)
     n = len(dim_codes)
     
     # 调试日志
-    sys.stderr.write(f"[DEBUG] 维度顺序（固定）: {[(code, priorities[code]) for code in dim_codes]}\n")
-    sys.stderr.flush()
+    debug_log("维度顺序（固定）: {}", [(code, priorities[code]) for code in dim_codes])
     
     # 构建判断矩阵
     matrix = np.zeros((n, n))
@@ -264,25 +645,50 @@ def build_ahp_matrix(priorities):
                     matrix[i][j] = 1
     
     # 调试日志
-    sys.stderr.write(f"[DEBUG] 构建的 AHP 矩阵:\n{matrix}\n")
-    sys.stderr.flush()
+    debug_log("构建的 AHP 矩阵:\n{}", matrix)
     
     return matrix, dim_codes
 
+def power_iteration_eigen(matrix, tol=1e-12, max_iter=1000):
+    """
+    幂迭代求正矩阵的最大特征值与对应（Perron）特征向量
+    
+    返回:
+        (max_eigenvalue, weights)，weights 已归一化为和为 1；未收敛时返回 None
+    """
+    n = len(matrix)
+    w = np.full(n, 1.0 / n)
+    for _ in range(max_iter):
+        aw = matrix @ w
+        lam = aw.sum()  # w 的和为 1，因此 Σ(Aw) 即为特征值估计
+        w_next = aw / lam
+        if np.abs(w_next - w).max() < tol:
+            return lam, w_next
+        w = w_next
+    return None
+
+
 def ahp_calculate_weights(judgment_matrix):
     """AHP 计算权重和一致性比率"""
     n = len(judgment_matrix)
     
-    eigenvalues, eigenvectors = np.linalg.eig(judgment_matrix)
-    max_eigenvalue_index = np.argmax(eigenvalues.real)
-    max_eigenvalue = eigenvalues[max_eigenvalue_index].real
-    max_eigenvector = eigenvectors[:, max_eigenvalue_index].real
+    # 正互反矩阵走幂迭代快速路径，其余情况（或未收敛）回退到完整特征分解
+    solved = None
+    if np.all(judgment_matrix > 0) and np.allclose(judgment_matrix * judgment_matrix.T, 1):
+        solved = power_iteration_eigen(judgment_matrix)
     
-    weights = max_eigenvector / max_eigenvector.sum()
+    if solved is not None:
+        max_eigenvalue, weights = solved
+    else:
+        eigenvalues, eigenvectors = np.linalg.eig(judgment_matrix)
+        max_eigenvalue_index = np.argmax(eigenvalues.real)
+        max_eigenvalue = eigenvalues[max_eigenvalue_index].real
+        max_eigenvector = eigenvectors[:, max_eigenvalue_index].real
+        
+        weights = max_eigenvector / max_eigenvector.sum()
     
     # 调试日志
-    sys.stderr.write(f"[DEBUG] AHP 计算的权重向量: {weights}\n")
-    sys.stderr.flush()
+    debug_log("AHP 计算的权重向量: {}", weights)
     
     CI = (max_eigenvalue - n) / (n - 1)
     RI_dict = {1: 0, 2: 0, 3: 0.58, 4: 0.90, 5: 1.12, 6: 1.24, 7: 1.32, 
@@ -290,11 +696,36 @@ def ahp_calculate_weights(judgment_matrix):
     RI = RI_dict.get(n, 1.41)
     CR = CI / RI if RI != 0 else 0
     
-    sys.stderr.write(f"[DEBUG] 一致性比率 CR: {CR}\n")
-    sys.stderr.flush()
+    debug_log("一致性比率 CR: {}", CR)
     
     return weights, CR
 
+
+@functools.lru_cache(maxsize=40320)
+def _solve_ahp_for_ranks(rank_tuple):
+    """按 DIMENSION_CODES 顺序的优先级元组求解 AHP，结果只读以便安全复用"""
+    matrix, dim_codes = build_ahp_matrix(dict(zip(DIMENSION_CODES, rank_tuple)))
+    weights, CR = ahp_calculate_weights(matrix)
+    matrix.flags.writeable = False
+    weights.flags.writeable = False
+    return matrix, tuple(dim_codes), weights, float(CR)
+
+
+def solve_ahp(priorities):
+    """
+    根据优先级求解 AHP 判断矩阵、维度权重与一致性比率（带缓存）
+    
+    判断矩阵只由 8 个维度的整数优先级决定（最多 8! 种排列），
+    相同优先级的重复请求直接命中缓存
+    
+    返回:
+        (ahp_matrix, dim_codes, criteria_weights, CR)
+    """
+    matrix, dim_codes, weights, CR = _solve_ahp_for_ranks(
+        tuple(priorities[code] for code in DIMENSION_CODES)
+    )
+    return matrix, list(dim_codes), weights, CR
+
 # ============================================================================
 # 综合评分计算
 # ============================================================================
@@ -351,23 +782,289 @@ def calculate_scores(df_normalized, dim_codes_ordered, criteria_weights, indicat
     
     return df_scores, final_weights
 
+# ============================================================================
+# 结果组装
+# ============================================================================
+
+def build_dimension_groups(dim_codes_ordered):
+    """
+    按维度顺序展开指标代码，并构建维度分组矩阵
+    
+    返回:
+        (codes, group_sizes, group)，group[j, d] = 1 表示第 j 个指标属于第 d 个维度
+    """
+    codes = []
+    group_sizes = []
+    for dim_code in dim_codes_ordered:
+        indicators = INDICATOR_SYSTEM[dim_code]['indicators']
+        codes.extend(ind['code'] for ind in indicators)
+        group_sizes.append(len(indicators))
+    
+    group = np.zeros((len(codes), len(dim_codes_ordered)))
+    group[np.arange(len(codes)), np.repeat(np.arange(len(dim_codes_ordered)), group_sizes)] = 1
+    
+    return codes, group_sizes, group
+
+
+def calculate_dimension_score_matrix(df_normalized, indicator_entropy_weights, dim_codes_ordered):
+    """
+    计算维度得分矩阵 (n×8)：维度得分 = Σ(归一化值 × 熵权) / Σ熵权
+    
+    维度得分与 AHP 权重无关，不同优先级下的综合得分只是该矩阵与权重向量的乘积
+    """
+    codes, _, group = build_dimension_groups(dim_codes_ordered)
+    entropy_vec = np.array([indicator_entropy_weights[c] for c in codes], dtype=float)
+    normalized = df_normalized[codes].to_numpy(dtype=float)
+    return (normalized * entropy_vec) @ group / (entropy_vec @ group)
+
+def build_result_arrays(df_raw, df_normalized, df_scores, dim_codes_ordered,
+                        criteria_weights, indicator_entropy_weights, final_weights,
+                        to_lists=True):
+    """
+    将结果组装所需的数据一次性转换为按排名排序的连续数组
+    
+    指标贡献 = 归一化值矩阵 (n×21) × 熵权向量，
+    维度得分 = 贡献矩阵 @ 维度分组矩阵 (21×8) / 每个维度的熵权和
+    
+    参数:
+        to_lists: 是否把逐行数组整体转换为 Python 列表；流式输出时保留 NumPy 数组，
+                  由 build_evaluation_record 逐行转换
+    
+    返回:
+        dict, 便于直接生成 JSON 记录
+    """
+    codes, group_sizes, group = build_dimension_groups(dim_codes_ordered)
+    
+    entropy_vec = np.array([indicator_entropy_weights[c] for c in codes], dtype=float)
+    
+    # 按排名排序后的行位置
+    order = df_scores.index.get_indexer(df_scores.sort_values('rank').index)
+    
+    normalized = df_normalized[codes].to_numpy(dtype=float)[order]
+    raw = df_raw[codes].to_numpy(dtype=float)[order]
+    contributions = normalized * entropy_vec
+    dim_calc_scores = (contributions @ group) / (entropy_vec @ group)
+    
+    dim_scores = df_scores[[f'{d}_score' for d in dim_codes_ordered]].to_numpy(dtype=float)[order]
+    dim_weights = np.asarray(criteria_weights, dtype=float)
+    
+    rows = {
+        'evaluation_ids': df_scores['evaluation_id'].to_numpy()[order].astype(int),
+        'test_ids': df_scores['test_id'].to_numpy()[order],
+        'scenario_ids': df_scores['scenario_id'].to_numpy()[order].astype(int),
+        'total_scores': df_scores['total_score'].to_numpy(dtype=float)[order],
+        'grades': df_scores['grade'].to_numpy()[order],
+        'ranks': df_scores['rank'].to_numpy()[order].astype(int),
+        'normalized': normalized,
+        'raw': raw,
+        'contributions': contributions,
+        'dim_calc_scores': dim_calc_scores,
+        'dim_scores': dim_scores,
+        'dim_weighted': dim_scores * dim_weights,
+    }
+    if to_lists:
+        rows = {key: value.tolist() for key, value in rows.items()}
+    
+    return {
+        'n_rows': len(order),
+        'dim_codes': list(dim_codes_ordered),
+        'group_sizes': group_sizes,
+        'codes': codes,
+        'entropy_weights': entropy_vec.tolist(),
+        'final_weights': [float(final_weights[c]) for c in codes],
+        'dim_weights': dim_weights.tolist(),
+        **rows
+    }
+
+
+def _row(arrays, key, k):
+    """取第 k 行，NumPy 数组/标量转换为 Python 原生类型"""
+    value = arrays[key][k]
+    if isinstance(value, (np.ndarray, np.generic)):
+        return value.tolist()
+    return value
+
+
+def build_evaluation_record(arrays, k):
+    """根据 build_result_arrays 的输出生成第 k 名测试批次的完整评估记录"""
+    normalized = _row(arrays, 'normalized', k)
+    raw = _row(arrays, 'raw', k)
+    contributions = _row(arrays, 'contributions', k)
+    dim_calc_scores = _row(arrays, 'dim_calc_scores', k)
+    dim_scores = _row(arrays, 'dim_scores', k)
+    dim_weighted = _row(arrays, 'dim_weighted', k)
+    codes = arrays['codes']
+    
+    dimension_calculations = {}
+    total_score_calculation = []
+    indicator_scores = {}
+    indicator_raw_values = {}
+    
+    j = 0
+    for d, dim_code in enumerate(arrays['dim_codes']):
+        dim_info = INDICATOR_SYSTEM[dim_code]
+        dim_weight = arrays['dim_weights'][d]
+        
+        indicator_contributions = []
+        for indicator in dim_info['indicators']:
+            indicator_contributions.append({
+                'code': codes[j],
+                'name': indicator['name'],
+                'rawValue': raw[j],
+                'normalizedValue': normalized[j],
+                'entropyWeight': arrays['entropy_weights'][j],
+                'finalWeight': arrays['final_weights'][j],
+                'contribution': contributions[j]
+            })
+            j += 1
+        
+        start = j - arrays['group_sizes'][d]
+        indicator_scores[dim_code] = dict(zip(codes[start:j], normalized[start:j]))
+        indicator_raw_values[dim_code] = dict(zip(codes[start:j], raw[start:j]))
+        
+        dim_score = dim_calc_scores[d]
+        dimension_calculations[dim_code] = {
+            'dimensionName': dim_info['name'],
+            'ahpWeight': dim_weight,
+            'dimensionScore': dim_score,
+            'indicators': indicator_contributions,
+            'calculation': f"维度得分 = Σ(归一化值 × 熵权) / Σ熵权 = {dim_score:.2f}"
+        }
+        
+        total_score_calculation.append({
+            'dimensionCode': dim_code,
+            'dimensionName': dim_info['name'],
+            'ahpWeight': dim_weight,
+            'dimensionScore': dim_scores[d],
+            'contribution': dim_weighted[d]
+        })
+    
+    return {
+        'evaluationId': _row(arrays, 'evaluation_ids', k),
+        'testId': _row(arrays, 'test_ids', k),
+        'scenarioId': _row(arrays, 'scenario_ids', k),
+        'totalScore': _row(arrays, 'total_scores', k),
+        'grade': _row(arrays, 'grades', k),
+        'rank': _row(arrays, 'ranks', k),
+        'dimensionScores': dict(zip(arrays['dim_codes'], dim_scores)),
+        'indicatorScores': indicator_scores,
+        'indicatorRawValues': indicator_raw_values,
+        'dimensionCalculations': dimension_calculations,  # 维度计算过程
+        'totalScoreCalculation': total_score_calculation  # 综合得分计算过程
+    }
+
+def build_columnar_results(arrays, explain_ids=None):
+    """
+    生成列式（紧凑）结果：每个字段一个按排名排序的并行数组，
+    只为 explain_ids 中的评估 ID 生成完整的计算过程说明
+    """
+    codes = arrays['codes']
+    dim_codes = arrays['dim_codes']
+    normalized_cols = list(zip(*arrays['normalized'])) if arrays['n_rows'] else [()] * len(codes)
+    raw_cols = list(zip(*arrays['raw'])) if arrays['n_rows'] else [()] * len(codes)
+    dim_cols = list(zip(*arrays['dim_scores'])) if arrays['n_rows'] else [()] * len(dim_codes)
+    
+    columns = {
+        'count': arrays['n_rows'],
+        'evaluationIds': arrays['evaluation_ids'],
+        'testIds': arrays['test_ids'],
+        'scenarioIds': arrays['scenario_ids'],
+        'totalScores': arrays['total_scores'],
+        'grades': arrays['grades'],
+        'ranks': arrays['ranks'],
+        'dimensionScores': {d: list(col) for d, col in zip(dim_codes, dim_cols)},
+        'indicatorCodes': codes,
+        'indicatorScores': {c: list(col) for c, col in zip(codes, normalized_cols)},
+        'indicatorRawValues': {c: list(col) for c, col in zip(codes, raw_cols)}
+    }
+    
+    explanations = []
+    if explain_ids:
+        wanted = {int(i) for i in explain_ids}
+        explanations = [
+            build_evaluation_record(arrays, k)
+            for k, eval_id in enumerate(arrays['evaluation_ids'])
+            if eval_id in wanted
+        ]
+    
+    return columns, explanations
+
 # ============================================================================
 # 主函数
 # ============================================================================
 
-def evaluate(priorities):
+RESPONSE_FORMATS = ('full', 'columnar')
+
+# 单次批量评估允许的最大优先级组合数：恰好容纳默认的 8 维全排列（8! = 40320）
+MAX_PRIORITY_SETS = math.factorial(len(DIMENSION_CODES))
+
+
+def count_priority_permutations(base_priorities, dimensions=None):
     """
-    执行完整的评估流程
+    不生成排列，直接计算 generate_priority_permutations 将返回的组合数
+    
+    取值有重复时相同排列只保留一次，组合数为多重集排列数 n! / (c1! c2! ...)
+    """
+    dimensions = list(dimensions or DIMENSION_CODES)
+    count = math.factorial(len(dimensions))
+    for repeats in Counter(base_priorities[d] for d in dimensions).values():
+        count //= math.factorial(repeats)
+    return count
+
+
+def generate_priority_permutations(base_priorities, dimensions=None):
+    """
+    生成优先级排列组合：保持其余维度不变，对 dimensions 中各维度的优先级取值做全排列
     
     参数:
-        priorities: dict, 例如 {'RL': 1, 'SC': 2, 'AJ': 3, 'EF': 4, 'PO': 5, 'NC': 6, 'HO': 7, 'RS': 8}
+        base_priorities: dict, 基准优先级
+        dimensions: list, 参与排列的维度代码，默认全部 8 个维度
     
     返回:
-        dict, 包含评估结果的 JSON 对象
+        list[dict], 每个元素是一组完整的优先级
+    """
+    dimensions = list(dimensions or DIMENSION_CODES)
+    values = [base_priorities[d] for d in dimensions]
+    
+    priority_sets = []
+    seen = set()
+    for perm in itertools.permutations(values):
+        if perm in seen:
+            continue
+        seen.add(perm)
+        priorities = dict(base_priorities)
+        priorities.update(zip(dimensions, perm))
+        priority_sets.append(priorities)
+    
+    return priority_sets
+
+
+def evaluate_batch(priority_sets):
+    """
+    对多组优先级一次性完成评估
+    
+    每组优先级各自计算 AHP 权重，得到 (k×8) 的权重矩阵 W；
+    维度得分矩阵 D (n×8) 与优先级无关，只计算一次，所有综合得分 = W @ D.T
+    
+    参数:
+        priority_sets: list[dict], 多组优先级
+    
+    返回:
+        dict, 包含每组优先级的权重、一致性比率、综合得分与排名
     """
+    if not priority_sets:
+        return {
+            'success': False,
+            'message': '优先级组合列表为空'
+        }
+    if len(priority_sets) > MAX_PRIORITY_SETS:
+        return {
+            'success': False,
+            'message': f'优先级组合数 {len(priority_sets)} 超过上限 {MAX_PRIORITY_SETS}'
+        }
+    
     try:
-        # 1. 读取数据
-        df_raw = extract_data_from_database()
+        df_raw, df_normalized, indicator_entropy_weights = load_prepared_data()
         
         if len(df_raw) == 0:
             return {
@@ -375,162 +1072,426 @@ def evaluate(priorities):
                 'message': '数据库中没有评估数据'
             }
         
-        # 2. 数据标准化
-        df_normalized = normalize_data(df_raw)
+        # 每组优先级的 AHP 权重：判断矩阵只取决于各维度的优先级数值，
+        # 对维度重新排列只会同步置换权重、CR 不变，因此同一组优先级取值（排序后相同）只求解一次
+        rank_matrix = np.array([[priorities[code] for code in DIMENSION_CODES] for priorities in priority_sets])
+        order = np.argsort(rank_matrix, axis=1, kind='stable')
+        sorted_ranks = np.take_along_axis(rank_matrix, order, axis=1)
+        unique_ranks, group = np.unique(sorted_ranks, axis=0, return_inverse=True)
+        group = group.reshape(-1)
+
+        group_weights = np.empty(unique_ranks.shape, dtype=float)
+        group_ratios = np.empty(len(unique_ranks), dtype=float)
+        for g, ranks_sorted in enumerate(unique_ranks):
+            _, _, criteria_weights, CR = solve_ahp(dict(zip(DIMENSION_CODES, ranks_sorted.tolist())))
+            group_weights[g] = criteria_weights
+            group_ratios[g] = CR
+
+        weight_matrix = np.empty(rank_matrix.shape, dtype=float)
+        np.put_along_axis(weight_matrix, order, group_weights[group], axis=1)
+        consistency_ratios = group_ratios[group].tolist()
         
-        # 3. 计算熵权（二级权重）
-        indicator_entropy_weights = calculate_entropy_weights(df_normalized, INDICATOR_SYSTEM)
+        # 一次矩阵乘法得到全部综合得分 (k×n)
+        dim_score_matrix = calculate_dimension_score_matrix(
+            df_normalized, indicator_entropy_weights, DIMENSION_CODES
+        )
+        total_scores = weight_matrix @ dim_score_matrix.T
+        ranks = pd.DataFrame(total_scores).rank(
+            axis=1, ascending=False, method='min'
+        ).to_numpy(dtype=int)
         
-        # 4. 构建 AHP 判断矩阵并计算权重（一级权重）
-        ahp_matrix, dim_codes_ordered = build_ahp_matrix(priorities)
-        criteria_weights, CR = ahp_calculate_weights(ahp_matrix)
+        return {
+            'success': True,
+            'mode': 'batch',
+            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'dimensionCodes': list(DIMENSION_CODES),
+            'evaluationIds': df_normalized['evaluation_id'].astype(int).tolist(),
+            'testIds': df_normalized['test_id'].tolist(),
+            'scenarioIds': df_normalized['scenario_id'].astype(int).tolist(),
+            'dimensionScores': {
+                dim_code: dim_score_matrix[:, d].tolist()
+                for d, dim_code in enumerate(DIMENSION_CODES)
+            },
+            'prioritySets': [
+                {
+                    'priorities': priorities,
+                    'weights': dict(zip(DIMENSION_CODES, weight_matrix[s].tolist())),
+                    'consistencyRatio': consistency_ratios[s],
+                    'consistencyPassed': bool(consistency_ratios[s] < 0.1),
+                    'totalScores': total_scores[s].tolist(),
+                    'ranks': ranks[s].tolist()
+                }
+                for s, priorities in enumerate(priority_sets)
+            ]
+        }
         
-        # 5. 计算综合得分
-        df_scores, final_weights = calculate_scores(
-            df_normalized, dim_codes_ordered, criteria_weights, indicator_entropy_weights
+    except Exception as e:
+        return {
+            'success': False,
+            'message': f'批量评估计算失败: {str(e)}',
+            'error': str(e)
+        }
+
+# ============================================================================
+# 权重敏感性分析
+# ============================================================================
+
+SENSITIVITY_METHODS = ('dirichlet', 'grid')
+
+# 敏感性分析默认参数
+SENSITIVITY_DEFAULTS = {
+    'method': 'dirichlet',   # dirichlet：以 AHP 权重为中心的 Dirichlet 采样；grid：逐维度网格扰动
+    'samples': 2000,         # Dirichlet 采样数
+    'concentration': 100.0,  # Dirichlet 集中度 c，α = c × AHP 权重，越大扰动越小
+    'gridPoints': 101,       # 每个维度在 [0, 1] 上的网格点数
+    'topK': 5,
+    'seed': None
+}
+
+# 排名矩阵（采样数或维度数 × 网格点数，再乘以测试批次数）的元素上限，避免一次请求占用过多内存
+MAX_SENSITIVITY_CELLS = 50_000_000
+
+# 分块计算时每块的采样数
+SENSITIVITY_CHUNK = 1000
+
+
+def rank_rows(score_matrix):
+    """
+    对得分矩阵的每一行计算排名（得分越高排名越靠前，从 1 开始；
+    并列时取最小名次，与主流程 rank(method='min') 一致）
+    
+    参数:
+        score_matrix: (m×n) 数组
+    
+    返回:
+        (m×n) int32 排名矩阵
+    """
+    m, n = score_matrix.shape
+    order = np.argsort(-score_matrix, axis=1, kind='stable')
+    sorted_scores = np.take_along_axis(score_matrix, order, axis=1)
+    
+    # 排序后每段相同得分的名次取该段首个位置
+    group_start = np.ones((m, n), dtype=bool)
+    group_start[:, 1:] = sorted_scores[:, 1:] != sorted_scores[:, :-1]
+    first_position = np.maximum.accumulate(
+        np.where(group_start, np.arange(n, dtype=np.int32), 0), axis=1
+    )
+    
+    ranks = np.empty((m, n), dtype=np.int32)
+    ranks[np.arange(m)[:, None], order] = first_position + 1
+    return ranks
+
+
+def build_weight_grid(base_weights, grid_points):
+    """
+    逐维度扰动的权重网格：第 d 个维度取网格值 v，其余维度按原比例缩放到 1 - v
+    
+    返回:
+        (grid_values, weight_grid)，weight_grid 形状为 (8, grid_points, 8)
+    """
+    n_dims = len(base_weights)
+    grid_values = np.linspace(0.0, 1.0, grid_points)
+    weight_grid = np.empty((n_dims, grid_points, n_dims))
+    for d in range(n_dims):
+        others = base_weights.copy()
+        others[d] = 0.0
+        others = others / others.sum()
+        weight_grid[d] = (1 - grid_values)[:, None] * others
+        weight_grid[d, :, d] = grid_values
+    return grid_values, weight_grid
+
+
+def calculate_critical_weights(base_weights, base_ranks, grid_values, grid_ranks):
+    """
+    计算各测试批次在每个维度上的临界权重：单独调整该维度权重时，
+    排名发生变化的最近网格值（低于 / 高于当前权重各一个，不存在为 None）
+    
+    参数:
+        grid_ranks: (8, grid_points, n) 网格上的排名
+    
+    返回:
+        (lower, upper)，形状均为 (8, n)，不存在处为 NaN
+    """
+    changed = grid_ranks != base_ranks[None, None, :]
+    below = grid_values[None, :] < base_weights[:, None]
+    above = grid_values[None, :] > base_weights[:, None]
+    values = grid_values[None, :, None]
+    
+    lower = np.where(changed & below[:, :, None], values, -np.inf).max(axis=1)
+    upper = np.where(changed & above[:, :, None], values, np.inf).min(axis=1)
+    lower[np.isinf(lower)] = np.nan
+    upper[np.isinf(upper)] = np.nan
+    return lower, upper
+
+
+def evaluate_sensitivity(priorities, options=None):
+    """
+    AHP 维度权重敏感性分析
+    
+    标准化矩阵固定不变，维度得分矩阵 D (n×8) 只计算一次；
+    所有扰动权重 W (m×8) 的综合得分为 W @ D.T，按块批量计算并统计每个测试批次的排名分布：
+    排名区间、进入前 k 名的概率，以及逐维度扰动时排名发生变化的临界权重
+    
+    参数:
+        priorities: dict, 基准优先级
+        options: dict, 见 SENSITIVITY_DEFAULTS
+    
+    返回:
+        dict, 敏感性分析结果
+    """
+    config = dict(SENSITIVITY_DEFAULTS)
+    config.update({k: v for k, v in (options or {}).items() if v is not None})
+    
+    method = config['method']
+    if method not in SENSITIVITY_METHODS:
+        return {
+            'success': False,
+            'message': f'不支持的敏感性分析方法: {method}，可选值: {list(SENSITIVITY_METHODS)}'
+        }
+    
+    try:
+        samples = int(config['samples'])
+        grid_points = int(config['gridPoints'])
+        top_k = int(config['topK'])
+        concentration = float(config['concentration'])
+
+        # 参数范围校验（在加载数据之前）
+        invalid = [
+            message for ok, message in (
+                (samples >= 1, f'samples 必须至少为1: {samples}'),
+                (grid_points >= 2, f'gridPoints 必须至少为2: {grid_points}'),
+                (top_k >= 1, f'topK 必须至少为1: {top_k}'),
+                (concentration > 0, f'concentration 必须大于0: {concentration}'),
+            ) if not ok
+        ]
+        if invalid:
+            return {
+                'success': False,
+                'message': f'敏感性分析参数无效: {"; ".join(invalid)}'
+            }
+
+        df_raw, df_normalized, indicator_entropy_weights = load_prepared_data()
+        if len(df_raw) == 0:
+            return {
+                'success': False,
+                'message': '数据库中没有评估数据'
+            }
+        
+        _, dim_codes_ordered, criteria_weights, CR = solve_ahp(priorities)
+        base_weights = np.asarray(criteria_weights, dtype=float)
+        dim_score_matrix = calculate_dimension_score_matrix(
+            df_normalized, indicator_entropy_weights, dim_codes_ordered
         )
+        n_tests = dim_score_matrix.shape[0]
         
-        # 6. 构建返回结果
-        result = {
+        base_scores = dim_score_matrix @ base_weights
+        base_ranks = rank_rows(base_scores[None, :])[0]
+
+        # 网格扰动两种方法都要计算（临界权重），同样受单元数上限约束
+        if len(base_weights) * grid_points * n_tests > MAX_SENSITIVITY_CELLS:
+            return {
+                'success': False,
+                'message': f'维度数 × 网格点数 × 测试批次数超过上限 {MAX_SENSITIVITY_CELLS}，请减少网格点数'
+            }
+
+        # 逐维度网格扰动：(8 × grid_points) 组权重一次矩阵乘法
+        grid_values, weight_grid = build_weight_grid(base_weights, grid_points)
+        grid_scores = weight_grid.reshape(-1, len(base_weights)) @ dim_score_matrix.T
+        grid_ranks = rank_rows(grid_scores).reshape(len(base_weights), grid_points, n_tests)
+        lower, upper = calculate_critical_weights(base_weights, base_ranks, grid_values, grid_ranks)
+        
+        # 排名分布：Dirichlet 采样或网格上的全部权重
+        if method == 'dirichlet':
+            if samples * n_tests > MAX_SENSITIVITY_CELLS:
+                return {
+                    'success': False,
+                    'message': f'采样数 × 测试批次数超过上限 {MAX_SENSITIVITY_CELLS}，请减少采样数'
+                }
+            rng = np.random.default_rng(config['seed'])
+            alpha = np.maximum(concentration * base_weights, 1e-6)
+            sample_ranks = np.empty((samples, n_tests), dtype=np.int32)
+            for start in range(0, samples, SENSITIVITY_CHUNK):
+                stop = min(start + SENSITIVITY_CHUNK, samples)
+                weights = rng.dirichlet(alpha, size=stop - start)
+                sample_ranks[start:stop] = rank_rows(weights @ dim_score_matrix.T)
+        else:
+            sample_ranks = grid_ranks.reshape(-1, n_tests)
+        
+        rank_min = sample_ranks.min(axis=0)
+        rank_max = sample_ranks.max(axis=0)
+        rank_mean = sample_ranks.mean(axis=0)
+        rank_std = sample_ranks.std(axis=0)
+        rank_p5, rank_p95 = np.percentile(sample_ranks, [5, 95], axis=0)
+        top_k_prob = (sample_ranks <= top_k).mean(axis=0)
+        
+        evaluation_ids = df_normalized['evaluation_id'].astype(int).tolist()
+        test_ids = df_normalized['test_id'].tolist()
+        scenario_ids = df_normalized['scenario_id'].astype(int).tolist()
+        
+        def _threshold(value):
+            return None if np.isnan(value) else float(value)
+        
+        results = [
+            {
+                'evaluationId': evaluation_ids[i],
+                'testId': test_ids[i],
+                'scenarioId': scenario_ids[i],
+                'baseScore': float(base_scores[i]),
+                'baseRank': int(base_ranks[i]),
+                'rankMin': int(rank_min[i]),
+                'rankMax': int(rank_max[i]),
+                'rankMean': float(rank_mean[i]),
+                'rankStd': float(rank_std[i]),
+                'rankP5': float(rank_p5[i]),
+                'rankP95': float(rank_p95[i]),
+                'topKProbability': float(top_k_prob[i]),
+                'criticalWeights': {
+                    dim_code: {'lower': _threshold(lower[d, i]), 'upper': _threshold(upper[d, i])}
+                    for d, dim_code in enumerate(dim_codes_ordered)
+                }
+            }
+            for i in np.argsort(base_ranks, kind='stable')
+        ]
+        
+        return {
             'success': True,
+            'mode': 'sensitivity',
             'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'method': method,
+            'samples': int(sample_ranks.shape[0]),
+            'concentration': concentration,
+            'gridPoints': grid_points,
+            'topK': top_k,
+            'seed': config['seed'],
             'consistencyRatio': float(CR),
-            'consistencyPassed': bool(CR < 0.1),
-            
-            # AHP 判断矩阵（添加）
-            'ahpMatrix': ahp_matrix.tolist(),
-            
-            # 维度代码顺序（添加）
             'dimensionCodes': dim_codes_ordered,
-            
-            # 一级权重（维度权重）
-            'dimensionWeights': {
-                dim_code: {
-                    'name': INDICATOR_SYSTEM[dim_code]['name'],
-                    'weight': float(criteria_weights[i]),
-                    'priority': priorities[dim_code]
-                }
-                for i, dim_code in enumerate(dim_codes_ordered)
-            },
-            
-            # 权重字典（便于前端使用）
-            'weights': {
-                dim_code: float(criteria_weights[i])
-                for i, dim_code in enumerate(dim_codes_ordered)
-            },
-            
-            # 二级权重（指标权重）
-            'indicatorWeights': {
-                dim_code: {
-                    'name': INDICATOR_SYSTEM[dim_code]['name'],
-                    'indicators': [
-                        {
-                            'code': ind['code'],
-                            'name': ind['name'],
-                            'entropyWeight': float(indicator_entropy_weights[ind['code']]),
-                            'finalWeight': float(final_weights[ind['code']])
-                        }
-                        for ind in INDICATOR_SYSTEM[dim_code]['indicators']
-                    ]
-                }
-                for dim_code in dim_codes_ordered
-            },
-            
-            # 评估结果
-            'evaluationResults': []
+            'baseWeights': dict(zip(dim_codes_ordered, base_weights.tolist())),
+            'results': results
         }
         
-        # 添加每个测试批次的评估结果
-        df_scores_sorted = df_scores.sort_values('rank')
-        for idx, row in df_scores_sorted.iterrows():
-            # 计算每个维度的详细计算过程
-            dimension_calculations = {}
-            for i, dim_code in enumerate(dim_codes_ordered):
-                dim_info = INDICATOR_SYSTEM[dim_code]
-                dim_weight = criteria_weights[i]
-                
-                # 计算该维度下每个指标的贡献
-                indicator_contributions = []
-                dim_score_sum = 0
-                
-                for indicator in dim_info['indicators']:
-                    code = indicator['code']
-                    normalized_value = float(df_normalized.loc[idx, code])
-                    entropy_weight = indicator_entropy_weights[code]
-                    final_weight = final_weights[code]
-                    contribution = normalized_value * entropy_weight
-                    
-                    indicator_contributions.append({
-                        'code': code,
-                        'name': indicator['name'],
-                        'rawValue': float(df_raw.loc[idx, code]),
-                        'normalizedValue': normalized_value,
-                        'entropyWeight': float(entropy_weight),
-                        'finalWeight': float(final_weight),
-                        'contribution': float(contribution)
-                    })
-                    
-                    dim_score_sum += contribution
-                
-                # 维度得分 = 各指标贡献之和 / 该维度指标权重之和
-                dim_total_weight = sum(indicator_entropy_weights[ind['code']] for ind in dim_info['indicators'])
-                dim_score = dim_score_sum / dim_total_weight
-                
-                dimension_calculations[dim_code] = {
-                    'dimensionName': dim_info['name'],
-                    'ahpWeight': float(dim_weight),
-                    'dimensionScore': float(dim_score),
-                    'indicators': indicator_contributions,
-                    'calculation': f"维度得分 = Σ(归一化值 × 熵权) / Σ熵权 = {dim_score:.2f}"
-                }
-            
-            # 计算综合得分的详细过程
-            total_score_calculation = []
-            for i, dim_code in enumerate(dim_codes_ordered):
-                dim_weight = criteria_weights[i]
-                dim_score = float(row[f'{dim_code}_score'])
-                contribution = dim_weight * dim_score
-                
-                total_score_calculation.append({
-                    'dimensionCode': dim_code,
-                    'dimensionName': INDICATOR_SYSTEM[dim_code]['name'],
-                    'ahpWeight': float(dim_weight),
-                    'dimensionScore': dim_score,
-                    'contribution': float(contribution)
-                })
-            
-            test_result = {
-                'evaluationId': int(row['evaluation_id']),
-                'testId': row['test_id'],
-                'scenarioId': int(row['scenario_id']),
-                'totalScore': float(row['total_score']),
-                'grade': row['grade'],
-                'rank': int(row['rank']),
-                'dimensionScores': {
-                    dim_code: float(row[f'{dim_code}_score'])
-                    for dim_code in dim_codes_ordered
-                },
-                'indicatorScores': {},
-                'indicatorRawValues': {},
-                'dimensionCalculations': dimension_calculations,  # 添加维度计算过程
-                'totalScoreCalculation': total_score_calculation  # 添加综合得分计算过程
+    except Exception as e:
+        return {
+            'success': False,
+            'message': f'敏感性分析失败: {str(e)}',
+            'error': str(e)
+        }
+
+
+def _run_evaluation(priorities, to_lists=True):
+    """
+    执行评估计算，返回 (结果表头, 结果数组)
+    
+    结果表头包含权重、一致性比率、判断矩阵等共享信息；无数据时结果数组为 None，
+    表头即为错误信息
+    """
+    # 1-3. 读取数据、标准化、计算熵权（二级权重），数据未变化时命中缓存
+    df_raw, df_normalized, indicator_entropy_weights = load_prepared_data()
+    
+    if len(df_raw) == 0:
+        return {
+            'success': False,
+            'message': '数据库中没有评估数据'
+        }, None
+    
+    # 4. 构建 AHP 判断矩阵并计算权重（一级权重）
+    ahp_matrix, dim_codes_ordered, criteria_weights, CR = solve_ahp(priorities)
+    
+    # 5. 计算综合得分
+    df_scores, final_weights = calculate_scores(
+        df_normalized, dim_codes_ordered, criteria_weights, indicator_entropy_weights
+    )
+    
+    # 6. 构建返回结果
+    result = {
+        'success': True,
+        'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'consistencyRatio': float(CR),
+        'consistencyPassed': bool(CR < 0.1),
+        
+        # AHP 判断矩阵（添加）
+        'ahpMatrix': ahp_matrix.tolist(),
+        
+        # 维度代码顺序（添加）
+        'dimensionCodes': dim_codes_ordered,
+        
+        # 一级权重（维度权重）
+        'dimensionWeights': {
+            dim_code: {
+                'name': INDICATOR_SYSTEM[dim_code]['name'],
+                'weight': float(criteria_weights[i]),
+                'priority': priorities[dim_code]
             }
-            
-            # 添加指标得分（归一化后）
-            for dim_code in dim_codes_ordered:
-                test_result['indicatorScores'][dim_code] = {
-                    ind['code']: float(df_normalized.loc[idx, ind['code']])
-                    for ind in INDICATOR_SYSTEM[dim_code]['indicators']
-                }
-            
-            # 添加指标原始值（归一化前）
-            for dim_code in dim_codes_ordered:
-                test_result['indicatorRawValues'][dim_code] = {
-                    ind['code']: float(df_raw.loc[idx, ind['code']])
+            for i, dim_code in enumerate(dim_codes_ordered)
+        },
+        
+        # 权重字典（便于前端使用）
+        'weights': {
+            dim_code: float(criteria_weights[i])
+            for i, dim_code in enumerate(dim_codes_ordered)
+        },
+        
+        # 二级权重（指标权重）
+        'indicatorWeights': {
+            dim_code: {
+                'name': INDICATOR_SYSTEM[dim_code]['name'],
+                'indicators': [
+                    {
+                        'code': ind['code'],
+                        'name': ind['name'],
+                        'entropyWeight': float(indicator_entropy_weights[ind['code']]),
+                        'finalWeight': float(final_weights[ind['code']])
+                    }
                     for ind in INDICATOR_SYSTEM[dim_code]['indicators']
-                }
-            
-            result['evaluationResults'].append(test_result)
+                ]
+            }
+            for dim_code in dim_codes_ordered
+        }
+    }
+    
+    # 每个测试批次的评估结果所需的数组
+    arrays = build_result_arrays(
+        df_raw, df_normalized, df_scores, dim_codes_ordered,
+        criteria_weights, indicator_entropy_weights, final_weights,
+        to_lists=to_lists
+    )
+    
+    return result, arrays
+
+
+def evaluate(priorities, response_format='full', explain_ids=None):
+    """
+    执行完整的评估流程
+    
+    参数:
+        priorities: dict, 例如 {'RL': 1, 'SC': 2, 'AJ': 3, 'EF': 4, 'PO': 5, 'NC': 6, 'HO': 7, 'RS': 8}
+        response_format: 'full'（默认，每条记录包含完整计算过程）
+                         或 'columnar'（并行数组 + 共享权重，体积小）
+        explain_ids: columnar 格式下需要完整计算过程的 evaluation_id 列表
+    
+    返回:
+        dict, 包含评估结果的 JSON 对象
+    """
+    if response_format not in RESPONSE_FORMATS:
+        return {
+            'success': False,
+            'message': f'不支持的返回格式: {response_format}，可选值: {list(RESPONSE_FORMATS)}'
+        }
+    
+    try:
+        result, arrays = _run_evaluation(priorities)
+        if arrays is None:
+            return result
+        
+        # 添加每个测试批次的评估结果
+        if response_format == 'columnar':
+            columns, explanations = build_columnar_results(arrays, explain_ids)
+            result['format'] = 'columnar'
+            result['results'] = columns
+            result['explanations'] = explanations
+        else:
+            result['evaluationResults'] = [
+                build_evaluation_record(arrays, k) for k in range(arrays['n_rows'])
+            ]
         
         return result
         
@@ -541,54 +1502,273 @@ def evaluate(priorities):
             'error': str(e)
         }
 
+def evaluate_stream(priorities, write):
+    """
+    流式评估（NDJSON）：第一行写出表头（权重、CR、判断矩阵及记录数 count），
+    之后按排名每行写出一条评估记录，记录边生成边输出，不在内存中累积
+    
+    参数:
+        priorities: dict, 同 evaluate
+        write: 接收字符串的写出函数，例如 sys.stdout.write
+    """
+    try:
+        header, arrays = _run_evaluation(priorities, to_lists=False)
+    except Exception as e:
+        header, arrays = {
+            'success': False,
+            'message': f'评估计算失败: {str(e)}',
+            'error': str(e)
+        }, None
+    
+    if arrays is None:
+        write(json.dumps(header, ensure_ascii=False) + '\n')
+        return
+    
+    header['format'] = 'ndjson'
+    header['count'] = arrays['n_rows']
+    write(json.dumps(header, ensure_ascii=False) + '\n')
+    
+    try:
+        for k in range(arrays['n_rows']):
+            write(json.dumps(build_evaluation_record(arrays, k), ensure_ascii=False) + '\n')
+    except Exception as e:
+        write(json.dumps({
+            'success': False,
+            'message': f'评估结果输出失败: {str(e)}',
+            'error': str(e)
+        }, ensure_ascii=False) + '\n')
+
+
+# ============================================================================
+# 请求处理（命令行与常驻服务共用）
+# ============================================================================
+
+DEFAULT_PRIORITIES = {
+    'RL': 1,  # 可靠性
+    'SC': 2,  # 安全性
+    'AJ': 3,  # 抗干扰性
+    'EF': 4,  # 有效性
+    'PO': 5,  # 处理能力
+    'NC': 6,  # 组网能力
+    'HO': 7,  # 人为操作
+    'RS': 8   # 响应能力
+}
+
+
+def handle_request(input_data):
+    """
+    处理一次评估请求
+    
+    参数:
+        input_data: dict, 与 stdin 输入相同的 JSON 对象，例如 {'priorities': {...}}；
+                    为 None 时使用默认优先级
+    
+    返回:
+        dict, 与 stdout 输出相同的 JSON 对象
+    """
+    if input_data is None:
+        input_data = {}
+        priorities = dict(DEFAULT_PRIORITIES)
+        
+        # 调试日志：使用默认优先级
+        debug_log("使用默认优先级: {}", priorities)
+    else:
+        priorities = input_data.get('priorities', {})
+        
+        # 调试日志：记录解析后的优先级
+        debug_log("解析后的优先级: {}", priorities)
+    
+    # 敏感性分析
+    if input_data.get('mode') == 'sensitivity':
+        return evaluate_sensitivity(priorities, input_data.get('sensitivity'))
+    
+    # 批量评估：显式给出多组优先级，或对基准优先级做排列组合
+    if 'prioritySets' in input_data or 'permutations' in input_data:
+        if 'prioritySets' in input_data:
+            priority_sets = input_data['prioritySets']
+        else:
+            perm_config = input_data['permutations'] or {}
+            base_priorities = perm_config.get('base') or priorities or DEFAULT_PRIORITIES
+            # 先算组合数再生成，超过上限时不做任何排列
+            n_sets = count_priority_permutations(base_priorities, perm_config.get('dimensions'))
+            if n_sets > MAX_PRIORITY_SETS:
+                return {
+                    'success': False,
+                    'message': f'优先级组合数 {n_sets} 超过上限 {MAX_PRIORITY_SETS}，请减少参与排列的维度'
+                }
+            priority_sets = generate_priority_permutations(base_priorities, perm_config.get('dimensions'))
+        debug_log("批量评估，优先级组合数: {}", len(priority_sets))
+        return evaluate_batch(priority_sets)
+    
+    # 执行评估
+    result = evaluate(
+        priorities,
+        response_format=input_data.get('format', 'full'),
+        explain_ids=input_data.get('explainIds')
+    )
+    
+    # 调试日志：记录计算结果中的权重
+    if result.get('success'):
+        debug_log("计算成功，维度权重: {}", result.get('dimensionWeights', {}))
+    
+    return result
+
+
+def is_stream_request(input_data):
+    """是否请求 NDJSON 流式输出（format = 'ndjson'）"""
+    return bool(input_data) and input_data.get('format') == 'ndjson'
+
+
+def handle_stream_request(input_data, write):
+    """处理一次 NDJSON 流式评估请求，结果逐行交给 write 输出"""
+    priorities = input_data.get('priorities', {})
+    debug_log("流式评估，解析后的优先级: {}", priorities)
+    evaluate_stream(priorities, write)
+
+
+def dump_result(result):
+    """序列化结果：完整格式保持缩进输出，列式格式、批量评估与敏感性分析使用紧凑输出"""
+    if result.get('format') == 'columnar' or result.get('mode') in ('batch', 'sensitivity'):
+        return json.dumps(result, ensure_ascii=False, separators=(',', ':'))
+    return json.dumps(result, ensure_ascii=False, indent=2)
+
+# ============================================================================
+# 常驻服务（HTTP JSON 接口）
+# ============================================================================
+
+class EvaluationRequestHandler(BaseHTTPRequestHandler):
+    """
+    POST /evaluate  请求体与 stdin 输入相同，响应体与 stdout 输出相同
+    GET  /health    健康检查
+    
+    请求体可选字段：
+        format: 'full' | 'columnar' | 'ndjson'（流式：首行表头，之后每行一条记录）
+        explainIds: columnar 格式下需要完整计算过程的 evaluation_id 列表
+        prioritySets: 多组优先级，一次返回全部组合的得分（批量评估）
+        permutations: {'base': {...}, 'dimensions': [...]}，对基准优先级做全排列后批量评估
+        mode: 'sensitivity' 时执行权重敏感性分析，参数放在 sensitivity 字段（见 SENSITIVITY_DEFAULTS）
+    """
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_stream(self, input_data):
+        """NDJSON 流式响应：不设置 Content-Length，写完后关闭连接"""
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson; charset=utf-8')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+        handle_stream_request(input_data, lambda line: self.wfile.write(line.encode('utf-8')))
+
+    def do_GET(self):
+        if self.path.rstrip('/') == '/health':
+            database = check_db_health()
+            self._send_json(200, {
+                'success': database['status'] == 'UP',
+                'status': 'UP',
+                'database': database
+            })
+        else:
+            self._send_json(404, {'success': False, 'message': f'未知路径: {self.path}'})
+
+    def do_POST(self):
+        if self.path.rstrip('/') != '/evaluate':
+            self._send_json(404, {'success': False, 'message': f'未知路径: {self.path}'})
+            return
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+            raw = self.rfile.read(length).decode('utf-8').strip() if length else ''
+            
+            debug_log("接收到的输入: {}", raw)
+            
+            input_data = json.loads(raw) if raw else None
+            if is_stream_request(input_data):
+                self._send_stream(input_data)
+                return
+            result = handle_request(input_data)
+            self._send_json(200, result)
+        except Exception as e:
+            sys.stderr.write(f"[ERROR] 请求处理失败: {str(e)}\n")
+            sys.stderr.flush()
+            self._send_json(500, {
+                'success': False,
+                'message': f'请求处理失败: {str(e)}',
+                'error': str(e)
+            })
+
+    def log_message(self, format, *args):
+        sys.stderr.write(f"[INFO] {self.address_string()} {format % args}\n")
+
+
+def serve(host, port):
+    """以常驻进程方式提供评估服务，直到收到中断信号"""
+    server = ThreadingHTTPServer((host, port), EvaluationRequestHandler)
+    server.daemon_threads = True
+    sys.stderr.write(f"[INFO] 评估服务已启动: http://{host}:{port}/evaluate\n")
+    sys.stderr.flush()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        close_db_pool()
+        sys.stderr.write("[INFO] 评估服务已停止\n")
+        sys.stderr.flush()
+
 # ============================================================================
 # 命令行接口
 # ============================================================================
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='军事通信效能评估服务')
+    parser.add_argument('--serve', action='store_true',
+                        help='以常驻 HTTP 服务方式运行（默认：从 stdin 读取一次请求）')
+    parser.add_argument('--host', default=os.environ.get('EVAL_SERVICE_HOST', '127.0.0.1'),
+                        help='服务监听地址（默认 127.0.0.1，可用环境变量 EVAL_SERVICE_HOST）')
+    parser.add_argument('--port', type=int, default=int(os.environ.get('EVAL_SERVICE_PORT', '8765')),
+                        help='服务监听端口（默认 8765，可用环境变量 EVAL_SERVICE_PORT）')
+    parser.add_argument('--incremental', action='store_true',
+                        help='数据只追加新行时增量更新标准化与熵权（也可用环境变量 EVAL_INCREMENTAL=1）')
+    parser.add_argument('--verbose', action='store_true',
+                        help='输出 [DEBUG] 调试日志到 stderr（也可用环境变量 EVAL_SERVICE_VERBOSE=1）')
+    return parser.parse_args(argv)
+
+
 if __name__ == '__main__':
+    args = parse_args()
+    if args.verbose:
+        VERBOSE = True
+    if args.incremental:
+        INCREMENTAL_MODE = True
+    if args.serve:
+        serve(args.host, args.port)
+        sys.exit(0)
+    
     try:
         # 从标准输入读取 JSON
         input_json = sys.stdin.read().strip()
         
         # 调试日志：记录接收到的输入
-        sys.stderr.write(f"[DEBUG] 接收到的输入: {input_json}\n")
-        sys.stderr.flush()
+        debug_log("接收到的输入: {}", input_json)
         
-        if input_json:
-            # 解析 JSON 输入
-            input_data = json.loads(input_json)
-            priorities = input_data.get('priorities', {})
-            
-            # 调试日志：记录解析后的优先级
-            sys.stderr.write(f"[DEBUG] 解析后的优先级: {priorities}\n")
-            sys.stderr.flush()
+        input_data = json.loads(input_json) if input_json else None
+        
+        if is_stream_request(input_data):
+            # 流式输出 NDJSON 结果
+            handle_stream_request(input_data, sys.stdout.write)
+            sys.stdout.flush()
         else:
-            # 默认优先级（用于测试）
-            priorities = {
-                'RL': 1,  # 可靠性
-                'SC': 2,  # 安全性
-                'AJ': 3,  # 抗干扰性
-                'EF': 4,  # 有效性
-                'PO': 5,  # 处理能力
-                'NC': 6,  # 组网能力
-                'HO': 7,  # 人为操作
-                'RS': 8   # 响应能力
-            }
+            result = handle_request(input_data)
             
-            # 调试日志：使用默认优先级
-            sys.stderr.write(f"[DEBUG] 使用默认优先级: {priorities}\n")
-            sys.stderr.flush()
-        
-        # 执行评估
-        result = evaluate(priorities)
-        
-        # 调试日志：记录计算结果中的权重
-        if result.get('success'):
-            sys.stderr.write(f"[DEBUG] 计算成功，维度权重: {result.get('dimensionWeights', {})}\n")
-            sys.stderr.flush()
-        
-        # 输出 JSON 结果
-        print(json.dumps(result, ensure_ascii=False, indent=2))
+            # 输出 JSON 结果
+            print(dump_result(result))
         
     except Exception as e:
         # 输出错误信息
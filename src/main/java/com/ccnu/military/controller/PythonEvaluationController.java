@@ -8,6 +8,7 @@ import lombok.RequiredArgsConstructor;
 import lombok.extern.slf4j.Slf4j;
 import org.springframework.web.bind.annotation.*;
 
+import java.util.HashMap;
 import java.util.Map;
 
 /**
@@ -37,7 +38,9 @@ public class PythonEvaluationController {
      *                    "NC": 6,
      *                    "HO": 7,
      *                    "RS": 8
-     *                  }
+     *                  },
+     *                  "format": "columnar",      // 可选：full（默认）/ columnar（列式紧凑格式）
+     *                  "explainIds": [1, 2]       // 可选：columnar 格式下需要完整计算过程的评估 ID
      *                }
      */
     @PostMapping("/calculate")
@@ -62,8 +65,17 @@ public class PythonEvaluationController {
                 }
             }
 
+            // 可选的返回格式参数
+            Map<String, Object> options = new HashMap<>();
+            if (request.get("format") != null) {
+                options.put("format", request.get("format"));
+            }
+            if (request.get("explainIds") != null) {
+                options.put("explainIds", request.get("explainIds"));
+            }
+
             // 调用 Python 服务
-            Map<String, Object> result = pythonEvaluationService.evaluate(priorities);
+            Map<String, Object> result = pythonEvaluationService.evaluate(priorities, options);
 
             // 检查结果
             Boolean success = (Boolean) result.get("success");
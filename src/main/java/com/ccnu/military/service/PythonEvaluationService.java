@@ -7,6 +7,9 @@ import org.springframework.stereotype.Service;
 
 import java.io.BufferedReader;
 import java.io.InputStreamReader;
+import java.io.OutputStream;
+import java.net.HttpURLConnection;
+import java.net.URL;
 import java.nio.charset.StandardCharsets;
 import java.util.HashMap;
 import java.util.Map;
@@ -15,6 +18,9 @@ import java.util.concurrent.TimeUnit;
 /**
  * Python 评估服务调用器
  * 负责调用 Python 脚本执行评估计算
+ *
+ * 配置了 python.service.url 时优先调用常驻服务（evaluation_service.py --serve），
+ * 常驻服务不可用时回退为每次启动一个 Python 进程
  */
 @Slf4j
 @Service
@@ -29,6 +35,9 @@ public class PythonEvaluationService {
     @Value("${python.timeout:300}")
     private long pythonTimeout;
 
+    @Value("${python.service.url:}")
+    private String pythonServiceUrl;
+
     private final ObjectMapper objectMapper = new ObjectMapper();
 
     /**
@@ -38,15 +47,45 @@ public class PythonEvaluationService {
      * @return 评估结果 JSON
      */
     public Map<String, Object> evaluate(Map<String, Integer> priorities) {
+        return evaluate(priorities, null);
+    }
+
+    /**
+     * 调用 Python 脚本执行评估
+     *
+     * @param priorities 维度优先级，例如 {"RL": 1, "SC": 2, ...}
+     * @param options    附加请求参数（可为 null），例如 {"format": "columnar", "explainIds": [1, 2]}
+     * @return 评估结果 JSON
+     */
+    public Map<String, Object> evaluate(Map<String, Integer> priorities, Map<String, Object> options) {
         try {
-            log.info("开始调用 Python 评估服务，优先级配置: {}", priorities);
+            log.info("开始调用 Python 评估服务，优先级配置: {}, 附加参数: {}", priorities, options);
 
             // 构建输入 JSON
             Map<String, Object> input = new HashMap<>();
+            if (options != null) {
+                input.putAll(options);
+            }
             input.put("priorities", priorities);
             String inputJson = objectMapper.writeValueAsString(input);
             log.info("发送给 Python 的 JSON: {}", inputJson);
 
+            // 优先调用常驻服务
+            if (pythonServiceUrl != null && !pythonServiceUrl.trim().isEmpty()) {
+                try {
+                    return evaluateViaService(inputJson);
+                } catch (ServiceUnavailableException e) {
+                    // 只有连接失败（请求尚未送达）才回退，否则常驻服务仍在计算，进程调用会重复执行
+                    log.warn("Python 常驻服务不可用，回退为进程调用: {}", e.getMessage());
+                } catch (java.net.SocketTimeoutException e) {
+                    log.error("Python 常驻服务响应超时", e);
+                    return createErrorResponse("Python 常驻服务响应超时");
+                } catch (java.io.IOException e) {
+                    log.error("Python 常驻服务调用失败", e);
+                    return createErrorResponse("Python 常驻服务调用失败: " + e.getMessage());
+                }
+            }
+
             // 构建命令（不传递 JSON 参数）
             ProcessBuilder processBuilder = new ProcessBuilder(
                     pythonExecutable,
@@ -132,6 +171,59 @@ public class PythonEvaluationService {
         }
     }
 
+    /**
+     * 常驻服务连接失败（请求体尚未发送完成），此时可以安全地回退为进程调用
+     */
+    private static class ServiceUnavailableException extends java.io.IOException {
+        ServiceUnavailableException(java.io.IOException cause) {
+            super(cause.getMessage(), cause);
+        }
+    }
+
+    /**
+     * 通过 HTTP 调用常驻的 Python 评估服务，请求/响应格式与 stdin/stdout 调用一致
+     *
+     * @throws ServiceUnavailableException 连接或发送请求体失败
+     * @throws java.io.IOException         请求已送达后读取超时或响应无法解析
+     */
+    @SuppressWarnings("unchecked")
+    private Map<String, Object> evaluateViaService(String inputJson) throws java.io.IOException {
+        String base = pythonServiceUrl.trim();
+        URL url = new URL(base.endsWith("/") ? base + "evaluate" : base + "/evaluate");
+        HttpURLConnection connection = (HttpURLConnection) url.openConnection();
+        try {
+            connection.setRequestMethod("POST");
+            connection.setDoOutput(true);
+            connection.setConnectTimeout(3000);
+            connection.setReadTimeout((int) TimeUnit.SECONDS.toMillis(pythonTimeout));
+            connection.setRequestProperty("Content-Type", "application/json; charset=utf-8");
+
+            try (OutputStream writer = connection.getOutputStream()) {
+                writer.write(inputJson.getBytes(StandardCharsets.UTF_8));
+                writer.flush();
+            } catch (java.io.IOException e) {
+                throw new ServiceUnavailableException(e);
+            }
+
+            int status = connection.getResponseCode();
+            StringBuilder output = new StringBuilder();
+            try (BufferedReader reader = new BufferedReader(new InputStreamReader(
+                    status < 400 ? connection.getInputStream() : connection.getErrorStream(),
+                    StandardCharsets.UTF_8))) {
+                String line;
+                while ((line = reader.readLine()) != null) {
+                    output.append(line).append("\n");
+                }
+            }
+
+            String jsonOutput = output.toString().trim();
+            log.info("Python 常驻服务返回，状态码: {}, 输出长度: {} 字符", status, jsonOutput.length());
+            return objectMapper.readValue(jsonOutput, Map.class);
+        } finally {
+            connection.disconnect();
+        }
+    }
+
     /**
      * 测试 Python 环境
      */